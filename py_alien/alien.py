@@ -1,59 +1,38 @@
-import pygame
-import os
 from pygame.sprite import Sprite
 
 class Alien(Sprite):
     """
     Класс, представляющий одного пришельца.
 
+    Координаты пришельцев хранятся во флоте (Fleet) в массивах NumPy;
+    спрайт нужен для совместимости с API групп pygame (отрисовка и коллизии),
+    а его rect синхронизируется с массивами флота по требованию.
+
     Args:
         screen (Surface): Экран, на котором отображается пришелец.
         settings (Settings): Настройки игры, включая скорость пришельца.
         image (Surface): Изображение пришельца.
         rect (Rect): Прямоугольник, представляющий размеры и положение пришельца.
-        x (float): Вещественная координата центра пришельца по оси X.
+        index (int): Номер пришельца в массивах флота.
     """
 
-    def __init__(self, ai_game):
+    def __init__(self, ai_game, index=0):
         """
         Инициализирует пришельца и задает его начальную позицию.
 
         :param:
             ai_game (object): Ссылка на основной игровой класс, содержащий экран и настройки.
+            index (int): Номер пришельца в массивах флота.
         """
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.index = index
 
-        # Загрузка изображения пришельца и назначение атрибута rect.
-        self.image = pygame.image.load(os.path.join('resources/alien.bmp'))
+        # Изображение пришельца берется из общего кэша ресурсов.
+        self.image = ai_game.assets.image('alien.bmp')
         self.rect = self.image.get_rect()
 
         # Каждый новый пришелец появляется в левом верхнем углу экрана.
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
-
-        # Сохранение точной горизонтальной позиции пришельца.
-        self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """
-        Возвращает True, если пришелец находится у края экрана.
-
-        Проверяет, достиг ли пришелец правого или левого края экрана.
-
-        :return:
-            bool: True, если пришелец находится у края экрана, иначе False.
-        """
-        screen_rect = self.screen.get_rect()
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True
-
-    def update(self):
-        """
-        Перемещает пришельца влево или вправо.
-
-        Обновляет позицию пришельца в зависимости от заданной скорости и направления.
-        """
-        self.x += (self.settings.alien_speed * self.settings.fleet_diraction)
-        self.rect.x = self.x
\ No newline at end of file
@@ -1,18 +1,32 @@
 import os
 import sys
 import random
-from time import sleep
+import time
 import pygame
-import pickle
 
+from assets import assets
+from audio import AudioManager
+from capture import FrameCapture
 from settings import Settings
 from game_stats import GameStats
 from scoreboard import Scoreboard
 from button import Button
+from controls import Controls, HELD_ACTIONS
+from renderer import Renderer
 from ship import Ship
 from bullet import Bullet
-from alien import Alien
+from fleet import Fleet
 from bonus import Bonus
+from collisions import groupcollide_fleet
+from pool import SpritePool
+from savegame import SaveManager
+from scheduler import Scheduler
+from governor import QualityGovernor
+from leaderboard import Leaderboard
+from profiler import (FrameProfiler, PHASE_EVENTS, PHASE_SHIP, PHASE_BULLETS,
+                      PHASE_COLLISIONS, PHASE_ALIENS, PHASE_BONUSES, PHASE_DRAW,
+                      PHASE_HUD, PHASE_OVERLAY, PHASE_PRESENT)
+from replay import INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE, input_mask
 
 
 class AlienInvasion:
@@ -21,120 +35,474 @@ class AlienInvasion:
 
     Args:
         settings (Settings): Настройки игры.
+        assets (AssetCache): Общий кэш изображений.
         screen (Surface): Отображение игрового окна.
         stats (GameStats): Статистика игры.
         sb (Scoreboard): Панель результатов.
         ship (Ship): Игрокский корабль.
         bullets (Group): Группа снарядов.
-        aliens (Group): Группа пришельцев.
+        aliens (Fleet): Флот пришельцев (группа с координатами в массивах NumPy).
         bonuses (Group): Группа бонусов.
-        shot_sound (Sound): Звук выстрела.
-        gameover_sound (Sound): Звук окончания игры.
-        kill_sound (Sound): Звук уничтожения пришельца.
-        lostlife_sound (Sound): Звук потери жизни.
+        bullet_pool (SpritePool): Пул переиспользуемых снарядов.
+        bonus_pool (SpritePool): Пул переиспользуемых бонусов.
+        audio (AudioManager): Воспроизведение звуков с ограничением голосов.
+        controls (Controls): Опрос клавиш и переназначаемые действия.
         play_button (Button): Кнопка для начала игры.
+        renderer (Renderer): Вывод кадров на экран.
+        governor (QualityGovernor): Регулятор качества по бюджету кадра.
         bg_color (tuple): Цвет фона.
+        headless (bool): Режим без окна и звука для ускоренной симуляции.
+        ticks (int): Количество выполненных логических тиков.
+        rng (Random): Генератор случайных чисел игровой логики.
+        seed (int): Зерно генератора текущей игры.
+        recorder (SessionRecorder): Запись сессии или None.
+        boot_times (list): Длительность шагов запуска парами (шаг, секунды).
+        startup_profile (bool): Вывести разбивку времени до первого кадра.
+        profiler (FrameProfiler): Профилировщик фаз кадра (F3 - вкл/выкл,
+            F4 - сохранить буфер в profile_path).
+        profile_path (str): Файл для выгрузки профиля (.json или .csv).
+        saves (SaveManager): Фоновое сохранение и загрузка полного состояния.
+        scheduler (Scheduler): Таймеры игрового времени (в тиках).
+        respawn_pause (bool): Идет ли пауза после потери корабля.
+        netplay (NetSession): Сеанс сетевой игры вдвоем или None.
+        capture (FrameCapture): Запись кадров в каталог (F5 - вкл/выкл).
+        leaderboard (Leaderboard): Таблица рекордов в базе SQLite.
     """
-    def __init__(self):
+    def __init__(self, headless=False, leaderboard=True):
         """
         Инициализирует игру и создает игровые ресурсы.
-        """
-        pygame.init()
+
+        :param:
+            headless (bool): Если True, окно не создается, звук не загружается,
+                а игра управляется через step().
+            leaderboard (bool): Вести ли таблицу рекордов (в режиме headless
+                она не ведется в любом случае).
+        """
+        self.headless = headless
+        self.boot_times = []
+        self.startup_profile = False
+        self._boot_last = time.perf_counter()
+
+        if headless:
+            # Фиктивные драйверы: pygame не обращается к дисплею и звуковой карте.
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
         self.settings = Settings()
+        # Микшер с малым буфером настраивается до его инициализации.
+        AudioManager.pre_init(self.settings)
+
+        # Инициализируются только нужные модули pygame (без общего pygame.init()):
+        # дисплей - для окна, шрифты - для панели; микшер - в AudioManager.
+        if not headless:
+            pygame.display.init()
+        pygame.font.init()
+        self._boot_step("pygame_init")
+        self.ticks = 0
+
+        # Собственный генератор случайных чисел делает игру воспроизводимой.
+        self.rng = random.Random()
+        self.seed = None
+        self.recorder = None
+        self.netplay = None
+        self._fire_pending = False
+        self.clock = pygame.time.Clock()
+
+        # Таймеры игрового времени: паузы и эффекты не блокируют цикл.
+        self.scheduler = Scheduler(self)
+        self.respawn_pause = False
+        self._respawn_timer = None
+
+        # Профилировщик кадров; пока он выключен, замеры ничего не стоят.
+        self.profiler = FrameProfiler()
+        self.profile_path = "profile.json"
+
+        # Сохранение полного состояния пишется в фоновом потоке.
+        self.saves = SaveManager(self)
+
+        if headless:
+            # Вместо окна используется обычная поверхность, на которую ничего не рисуется.
+            self.screen = pygame.Surface(
+                (self.settings.screen_width, self.settings.screen_height))
+        else:
+            # Отдельное окно
+            self.screen = pygame.display.set_mode(
+                (self.settings.screen_width, self.settings.screen_height))
 
-        # Отдельное окно
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+            pygame.display.set_caption("Alien Invasion")
+        self._boot_step("window")
 
-        pygame.display.set_caption("Alien Invasion")
+        # Запись кадров; поверхности и поток создаются только при ее включении.
+        self.capture = FrameCapture(self)
+
+        # Ввод: ненужные события отбрасываются, клавиши опрашиваются каждый тик.
+        self.controls = Controls(self)
+        if not headless:
+            self.controls.install()
+
+        # Общий кэш изображений и шрифтов: каждый файл читается с диска один раз.
+        self.assets = assets
 
         # Создание экземпляров для хранения статистики и панели результатов.
         self.stats = GameStats(self)
         self.sb = Scoreboard(self)
+        # Рекорды загружаются из базы в фоновом потоке.
+        self.leaderboard = Leaderboard(self, enabled=leaderboard)
+        self._boot_step("scoreboard")
 
         self.ship = Ship(self)
         self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.aliens = Fleet(self)
         self.bonuses = pygame.sprite.Group()
 
-        #Инициализация звуков
-        self.shot_sound = pygame.mixer.Sound(os.path.join('resources/shot.wav'))
-        self.gameover_sound = pygame.mixer.Sound(os.path.join('resources/game_over.wav'))
-        self.kill_sound = pygame.mixer.Sound(os.path.join('resources/kill.wav'))
-        self.lostlife_sound = pygame.mixer.Sound(os.path.join('resources/lost_a_life.wav'))
+        # Пулы переиспользуемых снарядов и бонусов.
+        self.bullet_pool = SpritePool(lambda: Bullet(self))
+        self.bonus_pool = SpritePool(lambda bonus_type: Bonus(self, bonus_type))
 
         self._create_fleet()
+        self._boot_step("sprites")
 
         # Создание кнопки Play.
         self.play_button = Button(self, "Play")
 
+        # Вывод кадров на экран (полный или по грязным прямоугольникам).
+        self.renderer = Renderer(self)
+
+        #Инициализация звуков: микшер открывается сразу, а файлы загружаются
+        # в фоновом потоке (в режиме headless звук не загружается)
+        self.audio = AudioManager(self)
+        self._boot_step("audio")
+
+        # Регулятор качества держит время кадра в пределах бюджета.
+        self.governor = QualityGovernor(self)
+
         # Назначение цвета фона.
         self.bg_color = (70, 130, 180)
+        self._boot_step("other")
+
+    def _boot_step(self, name):
+        """
+        Запоминает длительность шага запуска.
+
+        :param:
+            name (str): Название шага.
+        """
+        now = time.perf_counter()
+        self.boot_times.append((name, now - self._boot_last))
+        self._boot_last = now
+
+    def report_startup(self):
+        """
+        Печатает время до первого кадра с разбивкой по шагам.
+        """
+        total = sum(seconds for name, seconds in self.boot_times)
+        print("Время до первого кадра:")
+        for name, seconds in self.boot_times:
+            print(f"  {name:<12} {seconds * 1000:8.1f} мс")
+        print(f"  {'total':<12} {total * 1000:8.1f} мс")
+
+    def report_capture(self):
+        """
+        Печатает итоги записи кадров и пропускную способность записи.
+        """
+        stats = self.capture.stats()
+        print(f"Запись кадров в {self.capture.take_path}: записано {stats['written']}, "
+              f"пропущено {stats['dropped']}; "
+              f"{stats['write_fps']:.1f} кадров/с, {stats['write_mb_per_s']:.1f} МБ/с "
+              f"в потоке записи, {stats['fps']:.1f} кадров/с в среднем")
+        if stats['error'] is not None:
+            print(f"Запись остановлена из-за ошибки: {stats['error']}")
 
     def run_game(self):
         """
         Запуск основного цикла игры.
         Этот метод запускает основной цикл игры, который обрабатывает события,
         обновляет состояние игры и перерисовывает экран.
+
+        Логика выполняется фиксированными тиками (settings.tick_rate), а
+        отрисовка ограничена settings.fps_limit и интерполирует позиции
+        между тиками, поэтому скорость игры не зависит от компьютера.
+        Пока игра не активна, цикл ждет событий и не нагружает процессор.
         """
+        tick_time = 1.0 / self.settings.tick_rate
+        lag = 0.0
+        frame = 0
+        drawn = True
+        first_frame = True
         while True:
+            if not self.stats.game_active:
+                # Экран меню: перерисовка только после очередного события.
+                self.leaderboard.poll()
+                self._update_screen()
+                if first_frame:
+                    first_frame = False
+                    self._boot_step("first_frame")
+                    if self.startup_profile:
+                        self.report_startup()
+                if self.netplay is None:
+                    # Пока результат игры записывается, меню проверяет его
+                    # появление; иначе ждет событий без ограничения.
+                    timeout = self.leaderboard.MENU_POLL_MS if self.leaderboard.pending else 0
+                    self._check_events([pygame.event.wait(timeout)] + pygame.event.get())
+                else:
+                    # В сетевой игре меню тоже должно принимать данные второго игрока.
+                    self._check_events([pygame.event.wait(self.netplay.MENU_POLL_MS)]
+                                       + pygame.event.get())
+                    self._poll_netplay()
+                self.clock.tick()
+                lag = 0.0
+                continue
+
+            # Частота ограничивается только после выведенного кадра: кадр,
+            # пропущенный регулятором качества, не должен ждать в Clock.tick.
+            frame_time = self.clock.tick(self.settings.fps_limit if drawn else 0) / 1000
+            lag += min(frame_time, self.settings.max_frame_time)
+            # Время работы прошлого кадра без ожидания в Clock.tick.
+            self.governor.update(self.clock.get_rawtime())
+            frame += 1
+
+            self.profiler.begin_frame()
             self._check_events()
+            self._poll_netplay()
+            self.profiler.mark(PHASE_EVENTS)
+            while lag >= tick_time and self.stats.game_active:
+                mask = self.controls.poll()
+                if self.netplay is not None:
+                    mask = self.netplay.exchange(mask)
+                self._apply_inputs(mask)
+                self._update_world()
+                self.controls.after_tick()
+                if self.netplay is not None:
+                    self.netplay.after_tick()
+                lag -= tick_time
+
+            drawn = frame % self.governor.render_interval == 0
+            if drawn:
+                self._update_screen(lag / tick_time)
+            self.profiler.end_frame()
+
+    def step(self, n_ticks=1, inputs=None):
+        """
+        Выполняет несколько логических тиков без отрисовки и звука.
+
+        Используется в режиме headless для ускоренной симуляции: корабль,
+        снаряды, пришельцы и бонусы обновляются так быстро, как позволяет
+        процессор.
+
+        :param:
+            n_ticks (int): Количество тиков.
+            inputs: Управление на каждом тике. Словарь с ключами 'left',
+                'right' и 'fire' или маска INPUT_* применяется ко всем тикам;
+                последовательность словарей или масок задает управление для
+                каждого тика отдельно; функция вызывается как inputs(game, tick)
+                и возвращает словарь или маску.
+        :return:
+            bool: True, если игра все еще активна.
+        """
+        for tick in range(n_ticks):
+            if not self.stats.game_active:
+                break
+
+            if inputs is not None:
+                if callable(inputs):
+                    self._apply_inputs(inputs(self, tick))
+                elif isinstance(inputs, (dict, int)):
+                    self._apply_inputs(inputs)
+                else:
+                    self._apply_inputs(inputs[tick])
+
+            self._update_world()
+        return self.stats.game_active
+
+    def start_game(self, seed=None):
+        """
+        Сбрасывает настройки и статистику и начинает новую игру.
+
+        :param:
+            seed (int): Зерно генератора случайных чисел; по умолчанию выбирается
+                случайно. Одинаковые зерно и управление дают одинаковую игру.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng.seed(seed)
+        if self.recorder is not None:
+            self.recorder.begin(seed)
+
+        # Сброс игровых настроек
+        self.settings.initialize_dinamic_settings()
+
+        # Сброс игровой статистики.
+        self.stats.reset_stats()
+        self.stats.level = 1
+        self.stats.game_active = True
+        self.sb.prep_score()
+        self.sb.prep_level()
+        self.sb.prep_ships()
+
+        # Очистка списков пришельцев, снарядов и бонусов.
+        self.aliens.empty()
+        self.bullet_pool.release_all(self.bullets)
+        self.bonus_pool.release_all(self.bonuses)
+
+        # Создание нового флота и размещение корабля в центре.
+        self._create_fleet()
+        self.ship.center_ship()
+        self.ticks = 0
+        self.scheduler.clear()
+        self.ship.deactivate_shield()
+        self.respawn_pause = False
+        self._fire_pending = False
+        self.controls.reset()
+
+    def start_recording(self, path, hash_interval=1):
+        """
+        Включает запись каждой следующей игры в свой файл.
+
+        :param:
+            path (str): Шаблон имени файлов записи (игры пишутся в <имя>_NNN).
+            hash_interval (int): Интервал контрольных сумм состояния в тиках.
+        """
+        from replay import SessionRecorder
+        self.recorder = SessionRecorder(path, hash_interval)
+
+    def _update_world(self):
+        """
+        Выполняет один логический тик: обновляет корабль, снаряды,
+        пришельцев и бонусы.
+
+        Управление считывается один раз в начале тика в виде маски, поэтому
+        тик зависит только от маски и состояния генератора случайных чисел.
+        Во время паузы после потери корабля мир не обновляется, но тики
+        идут и таймеры планировщика срабатывают.
+        """
+        mask = input_mask(self.ship.moving_left, self.ship.moving_right,
+                          self._fire_pending)
+        self._fire_pending = False
+
+        profiler = self.profiler
+        self.ticks += 1
+        self.scheduler.run(self.ticks)
+
+        if not self.respawn_pause:
+            if mask & INPUT_FIRE:
+                self._fire_bullet()
+            self.ship.update()
+            profiler.mark(PHASE_SHIP)
+            self._update_bullets()
+            self._update_aliens()
+            profiler.mark(PHASE_ALIENS)
+            self._update_bonuses()
+
+        if self.recorder is not None:
+            self.recorder.record(mask, self)
+            if not self.stats.game_active:
+                self.recorder.finish()
+
+        # Звуки тика запускаются один раз, одинаковые запросы слиты.
+        self.audio.flush()
+        profiler.mark(PHASE_BONUSES)
+
+    def _apply_inputs(self, inputs):
+        """
+        Задает управление на следующий тик.
+
+        :param:
+            inputs: Словарь с флагами 'left', 'right' и 'fire' или маска INPUT_*.
+        """
+        if isinstance(inputs, int):
+            self.ship.moving_left = bool(inputs & INPUT_LEFT)
+            self.ship.moving_right = bool(inputs & INPUT_RIGHT)
+            self._fire_pending = bool(inputs & INPUT_FIRE)
+            return
 
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-                self._update_bonuses()
+        self.ship.moving_left = bool(inputs.get('left'))
+        self.ship.moving_right = bool(inputs.get('right'))
+        self._fire_pending = bool(inputs.get('fire'))
 
-            self._update_screen()
+    def start_netplay(self, session):
+        """
+        Подключает сеанс сетевой игры вдвоем.
+
+        :param:
+            session (NetSession): Установленный сеанс (netplay.host_game или
+                netplay.join_game).
+        """
+        self.netplay = session
+
+    def _poll_netplay(self):
+        """
+        Принимает сообщения второго игрока; при разрыве соединения игра
+        продолжается в одиночку.
+        """
+        if self.netplay is not None and not self.netplay.poll():
+            print("Соединение со вторым игроком потеряно.")
+            self.netplay = None
+
+    def _quit(self):
+        """
+        Сохраняет запись сессии (если она ведется) и завершает игру.
+        """
+        if self.recorder is not None:
+            self.recorder.finish()
+        # Незаконченное сохранение должно успеть записаться.
+        self.saves.wait()
+        if self.netplay is not None:
+            self.netplay.close()
+        if self.capture.active:
+            self.capture.stop()
+            self.report_capture()
+        self.leaderboard.close()
+        sys.exit()
 
     def _save_game(self):
         """
         Сохранение текущего состояния игры в файл.
-        Сохраняет уровень, счет и количество жизней в файл `savefile.pkl
+        Снимает полное состояние мира (флот, снаряды, бонусы, щит, настройки
+        и генератор случайных чисел); упаковка и запись в файл выполняются
+        в фоновом потоке и не задерживают кадр.
         """
-        game_data = {
-            "level": self.stats.level,
-            "score": self.stats.score,
-            "lives": self.stats.ships_left
-        }
-        with open("savefile.pkl", "wb") as f:
-            pickle.dump(game_data, f)
+        if self.stats.game_active:
+            self.saves.save()
 
     def _load_game(self):
         """
         Загружение состояния игры из файла.
-        Загружает уровень, счет и количество жизней из файла `savefile.pkl`.
+        Восстанавливает мир целиком и продолжает игру с сохраненного тика.
         Если файл не найден, выводит сообщение об ошибке.
         """
-        try:
-            with open("savefile.pkl", "rb") as f:
-                game_data = pickle.load(f)
-                self.stats.level = game_data["level"]
-                self.stats.score = game_data["score"]
-                self.stats.ships_left = game_data["lives"]
-                self.sb.prep_score()
-                self.sb.prep_level()
-                self.sb.prep_ships()
-        except FileNotFoundError:
-            print("Файл сохранения не найден.")
+        if not self.saves.load():
+            return
 
-    def _check_events(self):
+        # Запись сессии не может продолжиться с загруженного состояния.
+        if self.recorder is not None:
+            self.recorder.finish()
+        self._fire_pending = False
+        self.controls.reset()
+        if not self.headless:
+            pygame.mouse.set_visible(False)
+
+    def _check_events(self, events=None):
         """
         Обрабатывает нажатие клавиш и события мыши.
         Проверяет события, такие как нажатие клавиш и клик мыши,
         и вызывает соответствующие методы для обработки этих событий.
+        Движение и огонь определяются опросом клавиш в начале каждого тика
+        (Controls.poll), поэтому события KEYUP не нужны.
+
+        :param:
+            events (list): Уже полученные события; по умолчанию берется
+                очередь pygame.event.get().
         """
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
-                sys.exit()
+                self._quit()
 
             elif event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
 
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
                 self._check_play_button(mouse_pos)
@@ -149,60 +517,42 @@ class AlienInvasion:
         :param:
             mouse_pos (tuple): Позиция курсора мыши при нажатии.
         """
+        if self.netplay is not None and not self.netplay.is_host:
+            # Игру второго игрока начинает ведущий.
+            return
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         if button_clicked and not self.stats.game_active:
-            # Сброс игровых настроек
-            self.settings.initialize_dinamic_settings()
-
-            # Сброс игровой статистики.
-            self.stats.reset_stats()
-            self.stats.game_active = True
-            self.sb.prep_score()
-            self.sb.prep_level()
-            self.sb.prep_ships()
-
-            # Очистка списков пришельцев и снарядов.
-            self.aliens.empty()
-            self.bullets.empty()
-
-            # Создание нового флота и размещение корабля в центре.
-            self._create_fleet()
-            self.ship.center_ship()
+            self.start_game()
 
             # Указатель мыши скрывается.
             pygame.mouse.set_visible(False)
 
     def _check_keydown_events(self, event):
         """
-        Реагирует на нажатие клавиш
+        Реагирует на нажатие клавиш по назначенным им действиям
 
         :param:
             event (Event): Событие нажатия клавиши.
         """
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-        elif event.key == pygame.K_q:
-            sys.exit()
-        elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
-        elif event.key == pygame.K_s:
+        action = self.controls.action_for(event.key)
+        if action in HELD_ACTIONS:
+            # Короткое нажатие учитывается в следующем тике, даже если
+            # клавиша будет отпущена до опроса.
+            self.controls.key_down(action)
+        elif action == 'quit':
+            self._quit()
+        elif action == 'save':
             self._save_game()
-        elif event.key == pygame.K_l:
+        elif action == 'load':
             self._load_game()
-
-    def _check_keyup_events(self, event):
-        """
-        Реагирует на отпускание клавиш
-
-        :param:
-            event (Event): Событие нажатия клавиши.
-        """
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
+        elif action == 'profiler':
+            self.profiler.toggle()
+        elif action == 'profile_dump':
+            self.profiler.dump(self.profile_path)
+        elif action == 'capture':
+            self.capture.toggle()
+            if not self.capture.active:
+                self.report_capture()
 
     def _fire_bullet(self):
         """
@@ -213,9 +563,9 @@ class AlienInvasion:
         воспроизводится звук выстрела.
         """
         if len(self.bullets) < self.settings.bullet_allowed:
-            new_bullet = Bullet(self)
+            new_bullet = self.bullet_pool.acquire()
             self.bullets.add(new_bullet)
-            self.shot_sound.play()
+            self.audio.play('shot')
 
     def _update_bullets(self):
         """
@@ -227,12 +577,15 @@ class AlienInvasion:
         # Обновление позиций снарядов.
         self.bullets.update()
 
-        # Удаление снарядов, вышедших за край экрана.
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+        # Удаление снарядов, вышедших за край экрана (без копирования группы).
+        offscreen = [bullet for bullet in self.bullets.spritedict
+                     if bullet.rect.bottom <= 0]
+        for bullet in offscreen:
+            self.bullet_pool.release(bullet)
+        self.profiler.mark(PHASE_BULLETS)
 
         self._check_bullet_alien_collisions()
+        self.profiler.mark(PHASE_COLLISIONS)
 
     def _check_bullet_alien_collisions(self):
         """
@@ -242,17 +595,20 @@ class AlienInvasion:
         Увеличивает счет игрока и может создавать бонусы.
         """
         # Удаление снарядов и пришельцев, участвующих в коллизиях.
-        collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, True, True)
+        collisions = groupcollide_fleet(self.bullets, self.aliens)
 
         if collisions:
+            for bullet in collisions:
+                self.bullet_pool.release(bullet)
+
             for aliens in collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
-                self.kill_sound.play()
+                self.audio.play('kill')
 
-                if random.random() < 0.3:  # 30% вероятность появления бонуса
-                    bonus_type = random.choice(['life', 'shield', 'power'])
-                    new_bonus = Bonus(self, bonus_type)
+                if (self.rng.random() < self.settings.bonus_drop_chance
+                        and len(self.bonuses) < self.settings.bonus_limit):
+                    bonus_type = self.rng.choice(['life', 'shield', 'power'])
+                    new_bonus = self.bonus_pool.acquire(bonus_type)
                     self.bonuses.add(new_bonus)
 
             self.sb.prep_score()
@@ -260,10 +616,14 @@ class AlienInvasion:
 
         if not self.aliens:
             # Уничтожение существующих снарядов и создание нового флота.
-            self.bullets.empty()
+            self.bullet_pool.release_all(self.bullets)
             self._create_fleet()
             self.settings.increase_speed()
 
+            # Увеличение уровня.
+            self.stats.level += 1
+            self.sb.prep_level()
+
     def _update_bonuses(self):
         """
         Обновляет позиции бонусов и проверяет столкновения с кораблем.
@@ -274,16 +634,23 @@ class AlienInvasion:
         """
         self.bonuses.update()
 
+        # Бонусы, упавшие за нижний край экрана, возвращаются в пул.
+        screen_bottom = self.settings.screen_height
+        fallen = [bonus for bonus in self.bonuses.spritedict
+                  if bonus.rect.top >= screen_bottom]
+        for bonus in fallen:
+            self.bonus_pool.release(bonus)
+
         # Проверка на столкновение бонусов с кораблем
         collisions = pygame.sprite.spritecollide(self.ship, self.bonuses, True)
         for bonus in collisions:
+            self.bonus_pool.release(bonus)
             if bonus.bonus_type == 'life':
                 self.stats.ships_left += 1
                 self.sb.prep_ships()
 
             elif bonus.bonus_type == 'shield':
-                self.ship.shield_active = True  # Включаем щит
-                self.ship.shield_start_time = pygame.time.get_ticks()
+                self.ship.activate_shield()  # Включаем щит
 
             elif bonus.bonus_type == 'power':
                 self.settings.bullet_allowed += 1  # Увеличиваем количество снарядов
@@ -292,51 +659,34 @@ class AlienInvasion:
         """
         Создание флота вторжения.
 
-        Определяет количество пришельцев, которые могут поместиться на экране,
-        и создает их.
+        Количество пришельцев, которые могут поместиться на экране, и их
+        позиции берутся из кэшированного шаблона раскладки; флот создается
+        одной операцией из переиспользуемых спрайтов. В режиме нагрузки
+        размер флота и количество волн задаются настройками.
         """
-        # Создание пришельца.
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        available_space_x = self.settings.screen_width - (2 * alien_width)
-        number_aliens_x = available_space_x // (2 * alien_width)
-
-        """Определяет количество рядов, помещающихся на экране."""
-        ship_height = self.ship.rect.height
-        available_space_y = (self.settings.screen_height - (3 * alien_height) - ship_height)
-        number_rows = available_space_y // (2 * alien_height)
+        settings = self.settings
+        if settings.stress_mode:
+            xs, ys, grid, wave = self.aliens.stress_layout(
+                settings.stress_fleet_columns, settings.stress_fleet_rows,
+                settings.stress_waves)
+            self.aliens.spawn(xs, ys, grid=grid, wave=wave)
+            return
 
-        # Создание флота вторжения.
-        for row_number in range(number_rows):
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        """
-        Создание пришельца и размещение его в ряду.
-
-        :param:
-            alien_number (int): Индекс пришельца в ряду.
-            row_number (int): Индекс ряда, в котором размещается пришелец.
-        """
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        self.aliens.add(alien)
+        xs, ys, grid = self.aliens.layout(self.ship.rect.height)
+        self.aliens.spawn(xs, ys, grid=grid)
 
     def _check_fleet_edges(self):
         """
         Реагирует на достижение пришельцем края экрана.
 
         Проверяет, достиг ли какой-либо пришелец края экрана и меняет
-        направление флота, если это необходимо.
+        направление флота, если это необходимо. Волны флота в режиме
+        нагрузки разворачиваются независимо друг от друга.
         """
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.aliens.waves > 1:
+            self.aliens.turn_waves(self.settings.fleet_drop_speed)
+        elif self.aliens.check_edges():
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """
@@ -344,8 +694,7 @@ class AlienInvasion:
 
         Меняет направление движения флота и опускает его вниз.
         """
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
+        self.aliens.drop(self.settings.fleet_drop_speed)
         self.settings.fleet_diraction *= -1
 
     def _update_aliens(self):
@@ -355,28 +704,21 @@ class AlienInvasion:
 
         Если флот достиг края экрана, изменяет его направление. Также
         проверяет на столкновение с кораблем игрока и на достижение
-        нижней границы экрана пришельцами. Если все пришельцы уничтожены,
-        создается новый флот и увеличивается скорость игры.
+        нижней границы экрана пришельцами. Переход на следующий уровень
+        выполняется при уничтожении последнего пришельца
+        (_check_bullet_alien_collisions).
         """
         self._check_fleet_edges()
         self.aliens.update()
 
         # Проверка на столкновение корабля с пришельцами
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        if self.aliens.collide_rect(self.ship.rect):
             if not self.ship.shield_active:  # Проверяем, активен ли щит
                 self._ship_hit()
 
         # Проверить, добрались ли пришельцы до нижнего края экрана.
         self._check_aliens_bottom()
 
-        # Проверка на переход на следующий уровень
-        if not self.aliens:  # Если пришельцы уничтожены
-            self.bullets.empty()  # Уничтожаем все снаряды
-            self._create_fleet()  # Создаем новый флот
-            self.settings.increase_speed()  # Увеличиваем скорость
-            self.stats.level += 1
-            self.sb.prep_level()
-
     def _check_aliens_bottom(self):
         """
         Проверяет, добрались ли пришельцы до нижнего края экрана.
@@ -385,12 +727,9 @@ class AlienInvasion:
         воспроизводится звук потери жизни и вызывается метод обработки
         удара по кораблю.
         """
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                self.lostlife_sound.play()
-                self._ship_hit()
-                break
+        if self.aliens.reached_bottom(self.screen.get_rect().bottom):
+            self.audio.play('lostlife')
+            self._ship_hit()
 
     def _ship_hit(self):
         """
@@ -405,7 +744,7 @@ class AlienInvasion:
             # Уменьшение ships_left и обновление панели счета
             self.stats.ships_left -= 1
             self.sb.prep_ships()
-            self.lostlife_sound.play()
+            self.audio.play('lostlife')
 
             # Очистка списков пришельцев и снарядов.
             self.aliens.empty()
@@ -415,33 +754,105 @@ class AlienInvasion:
             self._create_fleet()
             self.ship.center_ship()
 
-            # Пауза
-            sleep(0.5)
+            # Пауза в игровом времени: окно продолжает отвечать на события.
+            self.start_respawn_pause(round(self.settings.respawn_pause
+                                           * self.settings.tick_rate))
         else:
             self.stats.game_active = False
-            self.gameover_sound.play()
-            pygame.mouse.set_visible(True)
+            self.audio.play('gameover')
+            # Результат записывается в фоновом потоке, кадр не ждет диска.
+            self.leaderboard.submit()
+            if not self.headless:
+                pygame.mouse.set_visible(True)
+
+    def start_respawn_pause(self, ticks):
+        """
+        Останавливает мир на заданное число тиков после потери корабля.
+
+        :param:
+            ticks (int): Длительность паузы в тиках.
+        """
+        if self._respawn_timer is not None:
+            self._respawn_timer.cancel()
+        self.respawn_pause = True
+        self._respawn_timer = self.scheduler.schedule(ticks, self._end_respawn_pause)
 
-    def _update_screen(self):
+    def respawn_ticks_left(self):
+        """
+        Возвращает количество тиков до конца паузы (0, если паузы нет).
+        """
+        if not self.respawn_pause:
+            return 0
+        return self._respawn_timer.due - self.ticks
+
+    def _end_respawn_pause(self):
+        """
+        Возобновляет игру после паузы.
+        """
+        self.respawn_pause = False
+        self._respawn_timer = None
+
+    def _update_screen(self, alpha=1.0):
         """
         Обновляет изображения на экране и отображает новый экран.
 
         Заполняет экран фоновым цветом, отображает корабль, снаряды,
         пришельцев и бонусы. Также отображает текущий счет. Если игра
         не активна, отображает кнопку "Play".
-        """
-        self.screen.fill(self.settings.bg_color)
-        self.ship.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        self.aliens.draw(self.screen)
-        self.bonuses.draw(self.screen)
-        self.sb.show_score()
 
+        :param:
+            alpha (float): Доля времени между предыдущим и текущим тиком,
+                используемая для интерполяции позиций.
+        """
+        if self.respawn_pause:
+            # Во время паузы позиции не меняются, интерполировать нечего.
+            alpha = 1.0
+        self.renderer.begin_frame()
+        rects = self._draw_sprites(alpha)
+        profiler = self.profiler
+        profiler.mark(PHASE_DRAW)
+        hud_items = self.sb.show_score()
+        profiler.mark(PHASE_HUD)
 
         # Кнопка Play отображается в том случае, если игра не активна.
         if not self.stats.game_active:
-            self.play_button.draw_button()
+            rects.append(self.play_button.draw_button())
+            # Под кнопкой - таблица рекордов.
+            table_rect = self.leaderboard.draw(self.screen, self.play_button.rect.bottom + 20)
+            if table_rect:
+                rects.append(table_rect)
+
+        overlay_rect = profiler.draw_overlay(self.screen)
+        if overlay_rect:
+            rects.append(overlay_rect)
+        profiler.mark(PHASE_OVERLAY)
 
         # Отображение последнего прорисованного экрана.
-        pygame.display.flip()
\ No newline at end of file
+        self.renderer.present(rects, hud_items)
+        if self.capture.grab():
+            self.report_capture()
+        profiler.mark(PHASE_PRESENT)
+
+    def _draw_sprites(self, alpha=1.0):
+        """
+        Выводит спрайты по слоям: корабль, снаряды, флот, бонусы.
+
+        Каждый слой выводится одним вызовом Surface.blits.
+
+        :param:
+            alpha (float): Доля времени между предыдущим и текущим тиком.
+        :return:
+            list: Прямоугольники, занятые спрайтами (для грязных прямоугольников).
+        """
+        renderer = self.renderer
+        rects = renderer.draw_layer(self.ship.draw_items(alpha))
+        rects += renderer.draw_layer([bullet.draw_item(alpha)
+                                      for bullet in self.bullets.spritedict])
+
+        # Флот движется как единое целое и передается одной полосой.
+        items, fleet_rect = self.aliens.draw_items(alpha)
+        rects += renderer.draw_layer(items, fleet_rect)
+
+        rects += renderer.draw_layer([bonus.draw_item(alpha)
+                                      for bonus in self.bonuses.spritedict])
+        return rects
@@ -0,0 +1,182 @@
+import os
+import pygame
+
+# Каталог с ресурсами игры (не зависит от текущей рабочей директории).
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+
+
+class AssetCache():
+    """
+    Общий реестр изображений и шрифтов, которые загружаются только один раз,
+    а также заранее нарисованных прямоугольников (снаряды, рамка щита).
+
+    Изображения переводятся в формат экрана (convert/convert_alpha), как только
+    создано окно, поэтому вывод спрайтов не требует преобразования пикселей
+    при каждом blit.
+
+    Args:
+        resources_dir (str): Каталог, из которого загружаются ресурсы.
+        load_count (int): Количество чтений изображений с диска.
+        convert_count (int): Количество преобразований в формат экрана.
+        bytes_held (int): Объем памяти, занимаемый изображениями в кэше.
+    """
+
+    def __init__(self, resources_dir=RESOURCES_DIR):
+        """
+        Инициализирует пустой кэш.
+
+        :param:
+            resources_dir (str): Каталог с файлами ресурсов.
+        """
+        self.resources_dir = resources_dir
+        self._images = {}
+        self._fonts = {}
+        self._converted = set()
+        self.load_count = 0
+        self.convert_count = 0
+        self.bytes_held = 0
+
+    def path(self, name):
+        """
+        Возвращает полный путь к файлу ресурса.
+
+        :param:
+            name (str): Имя файла в каталоге ресурсов.
+        """
+        return os.path.join(self.resources_dir, name)
+
+    def image(self, name, colorkey=None):
+        """
+        Возвращает общее изображение из кэша, при необходимости загружая его.
+
+        Изображения с альфа-каналом переводятся через convert_alpha(),
+        остальные - через convert() с необязательным цветовым ключом.
+        Возвращаемая поверхность общая для всех спрайтов и не должна изменяться.
+
+        :param:
+            name (str): Имя файла в каталоге ресурсов.
+            colorkey (tuple): Цвет прозрачности для изображений без альфа-канала.
+        :return:
+            Surface: Изображение в формате экрана (если окно уже создано).
+        """
+        key = (name, colorkey)
+        image = self._images.get(key)
+        if image is None:
+            image = pygame.image.load(self.path(name))
+            self.load_count += 1
+            self._store(key, image)
+
+        if key not in self._converted and pygame.display.get_surface() is not None:
+            image = self._convert(image, colorkey)
+            self.convert_count += 1
+            self._converted.add(key)
+            self._store(key, image)
+        return image
+
+    def rect(self, size, color, width=0):
+        """
+        Возвращает заранее нарисованный прямоугольник заданного цвета.
+
+        Заменяет pygame.draw.rect при каждом кадре: такой прямоугольник
+        выводится обычным blit и может попасть в общий вызов Surface.blits.
+
+        :param:
+            size (tuple): Ширина и высота.
+            color (tuple): Цвет в формате RGB.
+            width (int): Толщина рамки; 0 - залитый прямоугольник.
+        :return:
+            Surface: Изображение в формате экрана (если окно уже создано).
+        """
+        key = ('<rect>', tuple(size), tuple(color), width)
+        image = self._images.get(key)
+        converted = pygame.display.get_surface() is not None
+        if image is not None and (key in self._converted or not converted):
+            return image
+
+        image = pygame.Surface(size)
+        if converted:
+            image = image.convert()
+            self.convert_count += 1
+            self._converted.add(key)
+        if width:
+            # Внутренняя часть рамки прозрачна.
+            transparent = (255, 0, 255) if tuple(color) != (255, 0, 255) else (0, 0, 0)
+            image.fill(transparent)
+            image.set_colorkey(transparent, pygame.RLEACCEL)
+            pygame.draw.rect(image, color, image.get_rect(), width)
+        else:
+            image.fill(color)
+        self._store(key, image)
+        return image
+
+    def font(self, size):
+        """
+        Возвращает общий шрифт по умолчанию заданного размера.
+
+        Используется встроенный шрифт pygame (pygame.font.Font(None, size)):
+        в отличие от SysFont он не сканирует системные шрифты.
+
+        :param:
+            size (int): Размер шрифта.
+        :return:
+            Font: Шрифт.
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def _convert(self, image, colorkey):
+        """
+        Переводит изображение в формат экрана с учетом прозрачности.
+
+        :param:
+            image (Surface): Исходное изображение.
+            colorkey (tuple): Цвет прозрачности или None.
+        """
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+
+        image = image.convert()
+        if colorkey is not None:
+            image.set_colorkey(colorkey, pygame.RLEACCEL)
+        return image
+
+    def _store(self, key, image):
+        """
+        Сохраняет изображение в кэше и пересчитывает занимаемую память.
+        """
+        old = self._images.get(key)
+        if old is not None:
+            self.bytes_held -= old.get_pitch() * old.get_height()
+        self._images[key] = image
+        self.bytes_held += image.get_pitch() * image.get_height()
+
+    def stats(self):
+        """
+        Возвращает статистику кэша.
+
+        :return:
+            dict: Количество изображений, чтений с диска, преобразований и байт в памяти.
+        """
+        return {
+            "images": len(self._images),
+            "loads": self.load_count,
+            "converts": self.convert_count,
+            "bytes": self.bytes_held,
+        }
+
+    def clear(self):
+        """
+        Очищает кэш (например, после смены режима экрана).
+        """
+        self._images.clear()
+        self._fonts.clear()
+        self._converted.clear()
+        self.bytes_held = 0
+
+
+# Единый кэш, общий для всех классов спрайтов.
+assets = AssetCache()
@@ -0,0 +1,178 @@
+import threading
+
+import pygame
+
+
+class AudioManager():
+    """
+    Класс для воспроизведения звуков игры.
+
+    Микшер инициализируется отдельно от остальных модулей pygame, а звуки
+    загружаются в фоновом потоке и не задерживают первый кадр; запросы
+    звуков, которые еще не загружены, пропускаются.
+
+    Звуки не проигрываются сразу: за логический тик запросы накапливаются,
+    одинаковые запросы сливаются в один, и в конце тика каждый звук
+    запускается один раз на канале своей категории. У каждой категории
+    есть зарезервированные каналы, а общее число одновременно звучащих
+    голосов ограничено settings.max_voices. Если свободного канала нет
+    (или занят лимит голосов), новый звук вытесняет самый давний звук своей
+    категории: звуки длиннее интервала между выстрелами не глушат новые.
+
+    Args:
+        enabled (bool): Загружены ли звуки (в режиме headless и без
+            звукового устройства звук отключен).
+        max_voices (int): Максимальное число одновременно звучащих голосов.
+        played (int): Количество запущенных звуков.
+        merged (int): Количество запросов, слитых с уже запрошенными на этом тике.
+        stolen (int): Количество звуков, запущенных вместо самого давнего
+            звука своей категории.
+        dropped (int): Количество звуков, пропущенных из-за ограничения
+            голосов (когда у категории нечего вытеснить) или еще не
+            загруженных.
+    """
+
+    # Звуки: имя -> (файл, категория).
+    SOUNDS = {
+        'shot': ('shot.wav', 'shot'),
+        'kill': ('kill.wav', 'kill'),
+        'lostlife': ('lost_a_life.wav', 'event'),
+        'gameover': ('game_over.wav', 'event'),
+    }
+
+    # Количество каналов, зарезервированных за категорией. Выстрел звучит
+    # около 5 с, поэтому при автоогне его каналов больше всего.
+    CHANNELS = {'shot': 4, 'kill': 3, 'event': 2}
+
+    @staticmethod
+    def pre_init(settings):
+        """
+        Настраивает микшер с малым буфером до его инициализации.
+
+        :param:
+            settings (Settings): Настройки игры.
+        """
+        pygame.mixer.pre_init(settings.audio_frequency, -16, 2, settings.audio_buffer)
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует микшер, резервирует каналы по категориям и начинает
+        фоновую загрузку звуков.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.max_voices = self.settings.max_voices
+        self.played = 0
+        self.merged = 0
+        self.stolen = 0
+        self.dropped = 0
+
+        self._sounds = {}
+        self._channels = {}
+        # Канал -> тик запуска последнего звука на нем.
+        self._started = {}
+        self._pending = []
+        self._loader = None
+        self.enabled = False
+        if ai_game.headless:
+            return
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            # Нет звукового устройства: игра продолжается без звука.
+            return
+        self.enabled = True
+
+        # Все каналы зарезервированы: Sound.play() не займет чужую категорию.
+        total = sum(self.CHANNELS.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        channel_id = 0
+        for category, count in self.CHANNELS.items():
+            self._channels[category] = [pygame.mixer.Channel(channel_id + i)
+                                        for i in range(count)]
+            channel_id += count
+
+        self._loader = threading.Thread(target=self._load_sounds, args=(ai_game.assets,),
+                                        daemon=True)
+        self._loader.start()
+
+    def _load_sounds(self, assets):
+        """
+        Загружает звуки (выполняется в фоновом потоке).
+
+        :param:
+            assets (AssetCache): Кэш ресурсов для путей к файлам.
+        """
+        for name, (filename, category) in self.SOUNDS.items():
+            self._sounds[name] = (pygame.mixer.Sound(assets.path(filename)), category)
+
+    def wait_loaded(self):
+        """
+        Дожидается окончания фоновой загрузки звуков.
+        """
+        if self._loader is not None:
+            self._loader.join()
+
+    def play(self, name):
+        """
+        Запрашивает звук; он прозвучит в конце текущего тика.
+
+        :param:
+            name (str): Имя звука из SOUNDS.
+        """
+        if not self.enabled:
+            return
+        if name in self._pending:
+            self.merged += 1
+            return
+        self._pending.append(name)
+
+    def flush(self):
+        """
+        Запускает звуки, запрошенные за тик, по одному на каждое имя.
+        """
+        if not self._pending:
+            return
+
+        busy = sum(channel.get_busy() for channels in self._channels.values()
+                   for channel in channels)
+        tick = self.ai_game.ticks
+        for name in self._pending:
+            if name not in self._sounds:
+                # Звук еще загружается.
+                self.dropped += 1
+                continue
+            sound, category = self._sounds[name]
+            channels = self._channels[category]
+            channel = None
+            if busy < self.max_voices:
+                channel = next((channel for channel in channels
+                                if not channel.get_busy()), None)
+            if channel is None:
+                # Вытесняется самый давний звук категории; число голосов не растет.
+                playing = [channel for channel in channels if channel.get_busy()]
+                if not playing:
+                    self.dropped += 1
+                    continue
+                channel = min(playing, key=lambda channel: self._started.get(channel, -1))
+                self.stolen += 1
+            else:
+                busy += 1
+            channel.play(sound)
+            self._started[channel] = tick
+            self.played += 1
+        self._pending.clear()
+
+    def stats(self):
+        """
+        Возвращает статистику воспроизведения.
+
+        :return:
+            dict: Запущенные, слитые, вытеснившие другие и пропущенные звуки.
+        """
+        return {"played": self.played, "merged": self.merged, "stolen": self.stolen,
+                "dropped": self.dropped}
@@ -0,0 +1,89 @@
+"""
+Сравнение стоимости проверки коллизий снарядов с флотом.
+
+Для флотов разного размера измеряется время на один снаряд у
+pygame.sprite.groupcollide и у широкой фазы по сетке флота
+(collisions.groupcollide_fleet). Запуск: python bench_collisions.py
+"""
+import random
+import time
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from bullet import Bullet
+from collisions import groupcollide_fleet
+
+
+def build_fleet(game, columns, rows):
+    """
+    Создает флот-решетку заданного размера.
+
+    :param:
+        game (AlienInvasion): Игра в режиме headless.
+        columns (int): Количество пришельцев в ряду.
+        rows (int): Количество рядов.
+    """
+    fleet = game.aliens
+    step_x, step_y = 2 * fleet.alien_width, 2 * fleet.alien_height
+    xs = [fleet.alien_width + step_x * col for row in range(rows) for col in range(columns)]
+    ys = [fleet.alien_height + step_y * row for row in range(rows) for col in range(columns)]
+    fleet.spawn(xs, ys, grid=(columns, rows, step_x, step_y))
+
+
+def build_bullets(game, count, rng):
+    """
+    Создает группу снарядов в случайных позициях над флотом.
+
+    :param:
+        game (AlienInvasion): Игра в режиме headless.
+        count (int): Количество снарядов.
+        rng (Random): Генератор случайных чисел.
+    """
+    bullets = pygame.sprite.Group()
+    bounds = game.aliens.bounds()
+    for _ in range(count):
+        bullet = Bullet(game)
+        bullet.rect.x = rng.randrange(0, int(bounds[1]) + game.aliens.alien_width)
+        bullet.rect.y = rng.randrange(0, int(bounds[2]) + game.aliens.alien_height)
+        bullets.add(bullet)
+    return bullets
+
+
+def measure(collide, game, bullets, frames):
+    """
+    Возвращает среднее время проверки одного снаряда в микросекундах.
+
+    Перед каждой проверкой флот сдвигается, как на обычном тике.
+    """
+    elapsed = 0.0
+    for _ in range(frames):
+        game.aliens.update()
+        start = time.perf_counter()
+        collide(bullets, game.aliens)
+        elapsed += time.perf_counter() - start
+    return elapsed / (frames * len(bullets)) * 1e6
+
+
+def main():
+    """
+    Печатает таблицу стоимости коллизий для флотов разного размера.
+    """
+    game = AlienInvasion(headless=True)
+    rng = random.Random(0)
+    layouts = [(8, 4), (32, 16), (100, 50), (200, 100), (400, 100)]
+
+    print(f"{'aliens':>8} {'groupcollide, us':>18} {'grid, us':>10}")
+    for columns, rows in layouts:
+        build_fleet(game, columns, rows)
+        bullets = build_bullets(game, 50, rng)
+        frames = 20
+        brute = measure(lambda b, f: pygame.sprite.groupcollide(b, f, False, False),
+                        game, bullets, frames)
+        grid = measure(lambda b, f: groupcollide_fleet(b, f, dokill=False),
+                       game, bullets, frames)
+        print(f"{columns * rows:>8} {brute:>18.2f} {grid:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Набор сценарных бенчмарков фаз обновления и отрисовки.
+
+Каждый сценарий готовит игровую ситуацию и прогоняет заданное число
+кадров (один логический тик и одна отрисовка на кадр) с фиктивным
+видеодрайвером, измеряя отдельно _check_events, ship.update,
+_update_bullets, _update_aliens, _update_bonuses, вывод спрайтов
+(_draw_sprites, с пересчетом на один спрайт) и _update_screen.
+Результаты сохраняются в JSON; режим сравнения отмечает фазы, которые
+стали медленнее базовой версии больше чем на заданный порог.
+
+Запуск:
+    python benchmark.py --output results.json
+    python benchmark.py --compare baseline.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Фиктивные драйверы нужно выбрать до импорта игры и инициализации pygame.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from alien_invasion import AlienInvasion
+
+PHASES = ("check_events", "ship_update", "update_bullets",
+          "update_aliens", "update_bonuses", "draw_sprites", "update_screen")
+
+
+def _setup_empty(game):
+    """
+    Пустой экран: нет ни видимых пришельцев, ни снарядов.
+
+    Один пришелец остается далеко над экраном, иначе пустой флот сразу
+    запустил бы переход на следующий уровень.
+    """
+    fleet = game.aliens
+    fleet.spawn([game.settings.screen_width // 2], [-10 * fleet.alien_height])
+
+
+def _setup_default_fleet(game):
+    """Стандартный флот, корабль не стреляет."""
+
+
+def _setup_bullets_50(game):
+    """Стандартный флот и до 50 снарядов одновременно."""
+    game.settings.bullet_allowed = 50
+
+
+def _setup_bonuses(game):
+    """Стандартный флот и сотни падающих бонусов."""
+    for index in range(300):
+        bonus = game.bonus_pool.acquire(('life', 'shield', 'power')[index % 3])
+        bonus.rect.y = game.rng.randrange(0, game.settings.screen_height - 100)
+        bonus.prev_pos = bonus.rect.topleft
+        game.bonuses.add(bonus)
+
+
+def _setup_fleet_10x(game):
+    """Флот в 10 раз больше стандартного (ряды перекрываются по вертикали)."""
+    fleet = game.aliens
+    count = len(fleet) * 10
+    columns = (game.settings.screen_width - 2 * fleet.alien_width) // fleet.alien_width
+    rows = -(-count // columns)
+    step_x, step_y = fleet.alien_width, fleet.alien_height // 2
+    xs = [fleet.alien_width + step_x * col for row in range(rows) for col in range(columns)]
+    ys = [fleet.alien_height + step_y * row for row in range(rows) for col in range(columns)]
+    fleet.spawn(xs, ys, grid=(columns, rows, step_x, step_y))
+
+
+# Сценарий: (подготовка, стрелять ли на каждом тике).
+SCENARIOS = {
+    "empty": (_setup_empty, False),
+    "default_fleet": (_setup_default_fleet, False),
+    "bullets_50": (_setup_bullets_50, True),
+    "many_bonuses": (_setup_bonuses, False),
+    "fleet_10x": (_setup_fleet_10x, False),
+}
+
+
+def run_scenario(game, name, frames, seed=0):
+    """
+    Прогоняет один сценарий и возвращает статистику времени фаз.
+
+    :param:
+        game (AlienInvasion): Игра с фиктивным видеодрайвером.
+        name (str): Имя сценария из SCENARIOS.
+        frames (int): Количество кадров.
+        seed (int): Зерно генератора случайных чисел.
+    :return:
+        dict: Для каждой фазы - среднее, медиана и 95-й перцентиль в
+            микросекундах; для draw_sprites еще среднее число спрайтов и
+            медианная стоимость одного спрайта.
+    """
+    setup, fire = SCENARIOS[name]
+    game.start_game(seed)
+    setup(game)
+
+    # Щит без срока действия: корабль не погибает во время замера.
+    game.ship.shield_active = True
+    game.ship.shield_start_tick = None
+
+    phases = (
+        ("check_events", game._check_events),
+        ("ship_update", game.ship.update),
+        ("update_bullets", game._update_bullets),
+        ("update_aliens", game._update_aliens),
+        ("update_bonuses", game._update_bonuses),
+        ("draw_sprites", game._draw_sprites),
+        ("update_screen", game._update_screen),
+    )
+    samples = np.zeros((frames, len(phases)))
+    sprites = np.zeros(frames)
+    clock = time.perf_counter
+
+    for frame in range(frames):
+        if fire:
+            game._fire_bullet()
+        game.ticks += 1
+        for index, (phase, func) in enumerate(phases):
+            start = clock()
+            func()
+            samples[frame, index] = clock() - start
+        sprites[frame] = game.renderer.sprites_drawn
+
+    samples *= 1e6
+    result = {}
+    for index, (phase, func) in enumerate(phases):
+        column = samples[:, index]
+        result[phase] = {
+            "mean_us": round(float(column.mean()), 2),
+            "p50_us": round(float(np.percentile(column, 50)), 2),
+            "p95_us": round(float(np.percentile(column, 95)), 2),
+        }
+
+    draw = result["draw_sprites"]
+    draw["sprites"] = round(float(sprites.mean()), 1)
+    draw["per_sprite_us"] = round(draw["p50_us"] / max(draw["sprites"], 1), 3)
+    return result
+
+
+def run_suite(names, frames):
+    """
+    Прогоняет набор сценариев.
+
+    :param:
+        names (list): Имена сценариев.
+        frames (int): Количество кадров на сценарий.
+    :return:
+        dict: Метаданные окружения и результаты по сценариям.
+    """
+    # Таблица рекордов не нужна: бенчмарк не создает и не меняет файл базы.
+    game = AlienInvasion(leaderboard=False)
+    results = {}
+    for name in names:
+        results[name] = run_scenario(game, name, frames)
+        print(f"{name}: готово", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "frames": frames,
+            "video_driver": os.environ.get('SDL_VIDEODRIVER'),
+        },
+        "scenarios": results,
+    }
+
+
+def print_table(report):
+    """
+    Печатает медианные времена фаз (мкс) по сценариям и стоимость вывода
+    одного спрайта.
+    """
+    print(f"{'scenario':<15}" + "".join(f"{phase:>16}" for phase in PHASES)
+          + f"{'sprites':>9}{'us/sprite':>11}")
+    for name, phases in report["scenarios"].items():
+        draw = phases["draw_sprites"]
+        print(f"{name:<15}" + "".join(f"{phases[phase]['p50_us']:>16.1f}" for phase in PHASES)
+              + f"{draw['sprites']:>9.0f}{draw['per_sprite_us']:>11.3f}")
+
+
+def compare(report, baseline, threshold):
+    """
+    Сравнивает медианы фаз с базовыми и печатает регрессии.
+
+    :param:
+        report (dict): Текущие результаты.
+        baseline (dict): Базовые результаты.
+        threshold (float): Допустимое относительное замедление (0.1 = 10%).
+    :return:
+        list: Регрессии в виде (сценарий, фаза, было, стало).
+    """
+    regressions = []
+    for name, phases in report["scenarios"].items():
+        base_phases = baseline["scenarios"].get(name)
+        if base_phases is None:
+            continue
+        for phase, values in phases.items():
+            before = base_phases.get(phase, {}).get("p50_us")
+            after = values["p50_us"]
+            if before and after > before * (1 + threshold):
+                regressions.append((name, phase, before, after))
+
+    for name, phase, before, after in regressions:
+        print(f"РЕГРЕССИЯ {name}.{phase}: {before:.1f} -> {after:.1f} мкс "
+              f"(+{(after / before - 1) * 100:.0f}%)")
+    if not regressions:
+        print(f"Регрессий больше {threshold:.0%} нет.")
+    return regressions
+
+
+def main():
+    """
+    Разбирает аргументы командной строки и запускает бенчмарк.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300, help="кадров на сценарий")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="запустить только указанные сценарии")
+    parser.add_argument('--output', help="сохранить результаты в JSON")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON с базовыми результатами")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="допустимое замедление при сравнении (доля)")
+    args = parser.parse_args()
+
+    report = run_suite(args.scenario or list(SCENARIOS), args.frames)
+    print_table(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,12 @@
-import pygame
-import random
-import os
 from pygame.sprite import Sprite
 
+# Файлы изображений для каждого типа бонуса.
+BONUS_IMAGES = {
+    'life': 'life.bmp',
+    'shield': 'shield.bmp',
+    'power': 'powerup.bmp',
+}
+
 
 class Bonus(Sprite):
     """Класс для представления бонуса."""
@@ -18,35 +22,54 @@ class Bonus(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.assets = ai_game.assets
+        self.rng = ai_game.rng
+        self.speed = 1  # Скорость падения бонуса
+        self.reset(bonus_type)
+
+    def reset(self, bonus_type):
+        """
+        Задает тип бонуса и возвращает его в начальную позицию.
+
+        Вызывается при создании бонуса и при повторном использовании из пула.
+
+        Args:
+            bonus_type (str): Тип бонуса ('life', 'shield', 'power').
+        """
         self.bonus_type = bonus_type
 
-        # Загрузка изображения бонуса в зависимости от типа
-        if self.bonus_type == 'life':
-            self.image = pygame.image.load(os.path.join('resources/life.bmp'))
-        elif self.bonus_type == 'shield':
-            self.image = pygame.image.load(os.path.join('resources/shield.bmp'))
-        elif self.bonus_type == 'power':
-            self.image = pygame.image.load(os.path.join('resources/powerup.bmp'))
+        # Изображение бонуса зависит от типа и берется из общего кэша ресурсов.
+        self.image = self.assets.image(BONUS_IMAGES[bonus_type])
 
         self.rect = self.image.get_rect()
 
         # Позиция бонуса
-        self.rect.x = random.randint(0, self.settings.screen_width - self.rect.width)
+        self.rect.x = self.rng.randint(0, self.settings.screen_width - self.rect.width)
         self.rect.y = 0  # Начальная позиция вверху экрана
 
-        self.speed = 1  # Скорость падения бонуса
+        # Позиция на предыдущем тике для интерполяции при отрисовке.
+        self.prev_pos = self.rect.topleft
 
     def update(self):
         """
         Обновляет позицию бонуса.
         Перемещает бонус вниз экрана с заданной скоростью.
         """
+        self.prev_pos = self.rect.topleft
         self.rect.y += self.speed
 
-    def draw_bonus(self):
+    def draw_item(self, alpha=1.0):
         """
-        Выводит бонус на экране.
+        Возвращает бонус для вывода на экран.
+
+        Позиция интерполируется между предыдущим и текущим тиком; сам вывод
+        выполняется одним вызовом Surface.blits для всех бонусов.
 
-        Отображает изображение бонуса в его текущей позиции на экране.
+        :param:
+            alpha (float): Доля пути между предыдущим и текущим тиком (0..1).
+        :return:
+            tuple: (изображение, позиция) для Surface.blits.
         """
-        self.screen.blit(self.image, self.rect)
+        px, py = self.prev_pos
+        return self.image, (round(px + (self.rect.x - px) * alpha),
+                            round(py + (self.rect.y - py) * alpha))
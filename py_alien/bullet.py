@@ -14,14 +14,28 @@ class Bullet(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
+        self.ship = ai_game.ship
+        self.assets = ai_game.assets
         self.color = self.settings.bullet_color
 
         # Создание снаряда в позиции (0,0) и назначение правильной позиции.
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.reset()
+
+    def reset(self):
+        """
+        Возвращает снаряд в текущую позицию корабля.
+
+        Вызывается при создании снаряда и при повторном использовании из пула.
+        """
+        self.rect.size = (self.settings.bullet_width, self.settings.bullet_height)
+        self.rect.midtop = self.ship.rect.midtop
+        # Снаряд выводится заранее залитой поверхностью из общего кэша.
+        self.image = self.assets.rect(self.rect.size, self.color)
 
         # Позиция снаряда храниться в вещественном формате.
         self.y = float(self.rect.y)
+        self.prev_y = self.y
 
     def update(self):
         """
@@ -31,15 +45,21 @@ class Bullet(Sprite):
         обновляет позицию прямоугольника, представляющего снаряд.
         """
         # Обновление позиции снаряда в вещественном формате.
-        self.y -= self.settings.bullet_speed
+        self.prev_y = self.y
+        self.y -= self.settings.bullet_speed * self.settings.bullet_speed_factor
         # Обновление позиции прямоугольника.
         self.rect.y = self.y
 
-    def draw_bullet(self):
+    def draw_item(self, alpha=1.0):
         """
-        Выводит снаряд на экране.
+        Возвращает снаряд для вывода на экран.
+
+        Позиция интерполируется между предыдущим и текущим тиком; сам вывод
+        выполняется одним вызовом Surface.blits для всех снарядов.
 
-        Рисует снаряд в текущей позиции на экране с использованием
-        заданного цвета.
+        :param:
+            alpha (float): Доля пути между предыдущим и текущим тиком (0..1).
+        :return:
+            tuple: (изображение, позиция) для Surface.blits.
         """
-        pygame.draw.rect(self.screen, self.color, self.rect)
\ No newline at end of file
+        return self.image, (self.rect.x, round(self.prev_y + (self.y - self.prev_y) * alpha))
@@ -1,4 +1,4 @@
-import pygame.font
+import pygame
 
 class Button():
     """Класс для создания кнопки в игре."""
@@ -17,7 +17,7 @@ class Button():
         self.width, self.height = 200, 50
         self.button_color = (255, 0, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(48)
 
         # Построение объекта rect кнопки и выравнивание по центру экрана.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -42,6 +42,10 @@ class Button():
         Отображает кнопку и выводит сообщение.
 
         Заполняет область кнопки цветом и отображает текст на кнопке.
+
+        :return:
+            Rect: Область экрана, занятая кнопкой.
         """
         self.screen.fill(self.button_color, self.rect)
-        self.screen.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
+        self.screen.blit(self.msg_image, self.msg_image_rect)
+        return self.rect
\ No newline at end of file
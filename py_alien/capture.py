@@ -0,0 +1,302 @@
+"""
+Асинхронная запись кадров игры в последовательность изображений.
+
+Основной поток только копирует экран в одну из заранее созданных
+поверхностей (один memcpy) и кладет ее в ограниченную очередь; PNG
+кодирует и записывает на диск рабочий поток. pygame.image.save не
+отпускает GIL на время сжатия и останавливал бы игровой цикл, поэтому PNG
+собирается здесь: строки пикселей читаются из буфера поверхности через
+numpy, а сжимает их zlib, который GIL отпускает. В формате raw пиксели
+записываются в один файл прямо из буфера поверхности (через buffer
+interface, без промежуточной копии), а формат пикселей и номера кадров
+сохраняются в frames.json.
+
+Если свободных поверхностей нет (диск не успевает), кадр пропускается и
+учитывается в dropped: запись никогда не задерживает игровой цикл. Ошибка
+записи (например, диск заполнен) останавливает рабочий поток; она
+сохраняется в last_error, и следующий grab() останавливает запись.
+
+Каждый запуск записи (take) пишется в свой подкаталог take_NNN, поэтому
+повторная запись не затирает кадры предыдущей, а счетчики относятся к
+текущему запуску.
+"""
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# Уровень сжатия PNG: быстрое сжатие важнее размера файлов.
+PNG_COMPRESSION = 1
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_chunk(kind, data):
+    """
+    Возвращает блок PNG: длина, тип, данные и контрольная сумма.
+    """
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data)))
+
+
+def encode_png(surface):
+    """
+    Кодирует 24- или 32-битную поверхность в PNG (RGB, без фильтрации строк).
+
+    :param:
+        surface (Surface): Поверхность кадра.
+    :return:
+        bytes: Содержимое файла PNG.
+    """
+    width, height = surface.get_size()
+    bytesize = surface.get_bytesize()
+    pixels = np.frombuffer(surface.get_view('1'), np.uint8)
+    pixels = pixels.reshape(height, surface.get_pitch())[:, :width * bytesize]
+    pixels = pixels.reshape(height, width, bytesize)
+    # Номер байта каждого канала в пикселе определяется его сдвигом.
+    channels = []
+    for shift in surface.get_shifts()[:3]:
+        index = shift // 8
+        channels.append(index if sys.byteorder == 'little' else bytesize - 1 - index)
+
+    rows = np.zeros((height, 1 + width * 3), np.uint8)
+    rows[:, 1:] = pixels[:, :, channels].reshape(height, width * 3)
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (PNG_SIGNATURE + _png_chunk(b'IHDR', header)
+            + _png_chunk(b'IDAT', zlib.compress(rows.data, PNG_COMPRESSION))
+            + _png_chunk(b'IEND', b''))
+
+
+class FrameCapture():
+    """
+    Запись кадров экрана в каталог.
+
+    Args:
+        path (str): Каталог для записей.
+        take_path (str): Подкаталог текущей (или последней) записи.
+        every (int): Записывать каждый every-й кадр.
+        fmt (str): 'png' - отдельные файлы PNG, 'raw' - один файл frames.raw.
+        active (bool): Идет ли запись.
+        frame (int): Номер кадра с начала текущей записи.
+        captured (int): Кадров, поставленных в очередь.
+        dropped (int): Кадров, пропущенных из-за заполненной очереди.
+        written (int): Кадров, записанных на диск.
+        bytes_written (int): Записано байт.
+        last_error (OSError): Ошибка записи, остановившая текущую (или
+            последнюю) запись, или None.
+    """
+
+    FORMATS = ('png', 'raw')
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует запись по настройкам игры (сама запись начинается
+        методом start()).
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        settings = ai_game.settings
+        if settings.capture_format not in self.FORMATS:
+            raise ValueError(f"неизвестный формат записи: {settings.capture_format}")
+        self.screen = ai_game.screen
+        self.path = settings.capture_path
+        self.every = max(1, settings.capture_every)
+        self.fmt = settings.capture_format
+        self.queue_size = settings.capture_queue
+        self.active = False
+        self.take_path = None
+
+        self._pending = None
+        self._free = None
+        self._thread = None
+        self._reset()
+
+    def _reset(self):
+        """
+        Обнуляет счетчики перед новой записью.
+        """
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.last_error = None
+        self._write_time = 0.0
+        self._started = None
+        self._stopped = None
+        self._frames = []
+
+    def _next_take(self):
+        """
+        Возвращает первый свободный подкаталог take_NNN.
+        """
+        take = 1
+        while os.path.exists(os.path.join(self.path, f"take_{take:03d}")):
+            take += 1
+        return os.path.join(self.path, f"take_{take:03d}")
+
+    def start(self):
+        """
+        Создает подкаталог новой записи и поверхности для кадров, обнуляет
+        счетчики и запускает рабочий поток.
+        """
+        if self.active:
+            return
+        self.take_path = self._next_take()
+        os.makedirs(self.take_path)
+        self._reset()
+        # Поверхности того же формата, что и экран: копирование - простой memcpy.
+        self._free = queue.SimpleQueue()
+        for _ in range(self.queue_size):
+            self._free.put(self.screen.copy())
+        self._pending = queue.Queue(self.queue_size + 1)
+        self._started = time.perf_counter()
+        self._stopped = None
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        self.active = True
+
+    def grab(self):
+        """
+        Ставит текущий кадр экрана в очередь записи.
+
+        Вызывается после вывода кадра на экран.
+
+        :return:
+            bool: True, если запись остановлена из-за ошибки записи на диск.
+        """
+        if not self.active:
+            return False
+        if self.last_error is not None:
+            # Рабочий поток остановился: кадры больше не записываются.
+            self.stop()
+            return True
+        frame = self.frame
+        self.frame += 1
+        if frame % self.every:
+            return False
+        try:
+            surface = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        surface.blit(self.screen, (0, 0))
+        self._pending.put_nowait((frame, surface))
+        self.captured += 1
+        return False
+
+    def _worker(self):
+        """
+        Записывает кадры из очереди (выполняется в рабочем потоке).
+
+        При ошибке записи поток сохраняет ее в last_error и завершается.
+        """
+        raw = None
+        try:
+            if self.fmt == 'raw':
+                raw = open(os.path.join(self.take_path, 'frames.raw'), 'wb')
+            while True:
+                item = self._pending.get()
+                if item is None:
+                    break
+                frame, surface = item
+                start = time.perf_counter()
+                if raw is not None:
+                    # Пиксели пишутся прямо из буфера поверхности.
+                    view = surface.get_view('1')
+                    raw.write(view)
+                    size = view.length
+                    del view
+                else:
+                    data = encode_png(surface)
+                    name = os.path.join(self.take_path, f"frame_{frame:06d}.png")
+                    with open(name, 'wb') as f:
+                        f.write(data)
+                    size = len(data)
+                self._write_time += time.perf_counter() - start
+                self.bytes_written += size
+                self.written += 1
+                self._frames.append(frame)
+                self._free.put(surface)
+        except OSError as error:
+            self.last_error = error
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except OSError as error:
+                    self.last_error = self.last_error or error
+
+    def stop(self):
+        """
+        Останавливает запись, дожидаясь записи кадров из очереди.
+        """
+        if not self.active:
+            return
+        self.active = False
+        self._pending.put(None)
+        self._thread.join()
+        self._stopped = time.perf_counter()
+        try:
+            self._write_metadata()
+        except OSError as error:
+            if self.last_error is None:
+                self.last_error = error
+        self._free = None
+
+    def _write_metadata(self):
+        """
+        Сохраняет описание записи: формат пикселей и номера записанных кадров.
+        """
+        width, height = self.screen.get_size()
+        info = {
+            "format": self.fmt,
+            "width": width,
+            "height": height,
+            "pitch": self.screen.get_pitch(),
+            "bytes_per_pixel": self.screen.get_bytesize(),
+            "masks": list(self.screen.get_masks()),
+            "every": self.every,
+            "dropped": self.dropped,
+            "frames": self._frames,
+        }
+        with open(os.path.join(self.take_path, 'frames.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump(info, f)
+
+    def toggle(self):
+        """
+        Останавливает запись или начинает новую (в новом подкаталоге).
+        """
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def stats(self):
+        """
+        Возвращает статистику текущей (или последней) записи.
+
+        :return:
+            dict: Кадры в очереди, пропущенные и записанные, пропускная
+                способность записи (кадров и МБ в секунду работы потока) и
+                средний темп записи за время записи, ошибку записи или None.
+        """
+        elapsed = ((self._stopped or time.perf_counter()) - self._started
+                   if self._started is not None else 0.0)
+        busy = self._write_time or 1e-9
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "written": self.written,
+            "write_fps": self.written / busy,
+            "write_mb_per_s": self.bytes_written / busy / 1e6,
+            "fps": self.written / elapsed if elapsed else 0.0,
+            "error": self.last_error,
+        }
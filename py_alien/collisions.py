@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+
+class SpatialHash():
+    """
+    Равномерная пространственная хеш-сетка для объектов произвольного размещения.
+
+    Используется как запасной вариант широкой фазы для сущностей, которые
+    не образуют регулярной решетки (например, флот произвольной формы).
+
+    Args:
+        cell_size (int): Размер ячейки сетки в пикселях.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Инициализирует пустую сетку.
+
+        :param:
+            cell_size (int): Размер ячейки сетки в пикселях.
+        """
+        self.cell_size = cell_size
+        self._cells = defaultdict(list)
+
+    def _cell_range(self, left, top, right, bottom):
+        """
+        Возвращает диапазоны ячеек, покрывающих прямоугольник.
+        """
+        size = self.cell_size
+        return (range(left // size, (right - 1) // size + 1),
+                range(top // size, (bottom - 1) // size + 1))
+
+    def insert(self, item, left, top, width, height):
+        """
+        Добавляет объект в каждую ячейку, которую он перекрывает.
+
+        :param:
+            item: Объект (спрайт или индекс).
+            left, top, width, height (int): Прямоугольник объекта.
+        """
+        cols, rows = self._cell_range(left, top, left + width, top + height)
+        for row in rows:
+            for col in cols:
+                self._cells[(col, row)].append(item)
+
+    def query(self, rect):
+        """
+        Возвращает объекты из ячеек, перекрывающих прямоугольник.
+
+        Результат - кандидаты без повторов; точную проверку пересечения
+        выполняет вызывающий код.
+
+        :param:
+            rect (Rect): Прямоугольник запроса.
+        :return:
+            list: Объекты-кандидаты в порядке добавления.
+        """
+        cols, rows = self._cell_range(rect.left, rect.top, rect.right, rect.bottom)
+        found = {}
+        cells = self._cells
+        for row in rows:
+            for col in cols:
+                for item in cells.get((col, row), ()):
+                    found[item] = None
+        return list(found)
+
+    def clear(self):
+        """
+        Удаляет все объекты из сетки.
+        """
+        self._cells.clear()
+
+
+def groupcollide_fleet(bullets, fleet, dokill=True):
+    """
+    Аналог pygame.sprite.groupcollide(bullets, fleet, dokill, dokill)
+    с широкой фазой по сетке флота.
+
+    Позиция снаряда сразу переводится в ячейки флота, поэтому стоимость
+    проверки одного снаряда не зависит от размера флота. Результат (состав
+    словаря, порядок снарядов и пришельцев в списках) совпадает с
+    groupcollide.
+
+    :param:
+        bullets (Group): Группа снарядов.
+        fleet (Fleet): Флот пришельцев.
+        dokill (bool): Удалять ли столкнувшиеся снаряды и пришельцев.
+    :return:
+        dict: Снаряд -> список пришельцев, с которыми он столкнулся.
+    """
+    crashed = {}
+    if not fleet:
+        return crashed
+
+    aliens = fleet.alien_sprites
+    for bullet in bullets.sprites():
+        hit = [aliens[index] for index in fleet.collide_indices(bullet.rect)]
+        if not hit:
+            continue
+
+        crashed[bullet] = hit
+        if dokill:
+            for alien in hit:
+                alien.kill()
+            bullet.kill()
+    return crashed
@@ -0,0 +1,194 @@
+from collections import deque
+
+import pygame
+
+from replay import INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE
+
+# Действия, привязанные к клавишам по умолчанию.
+DEFAULT_BINDINGS = {
+    'left': (pygame.K_LEFT, pygame.K_a),
+    'right': (pygame.K_RIGHT, pygame.K_d),
+    'fire': (pygame.K_SPACE,),
+    'quit': (pygame.K_q,),
+    'save': (pygame.K_s,),
+    'load': (pygame.K_l,),
+    'profiler': (pygame.K_F3,),
+    'profile_dump': (pygame.K_F4,),
+    'capture': (pygame.K_F5,),
+}
+
+# Действия, состояние которых опрашивается каждый тик, и их биты маски.
+HELD_ACTIONS = {'left': INPUT_LEFT, 'right': INPUT_RIGHT, 'fire': INPUT_FIRE}
+
+# События, которые обрабатывает игра; остальные отбрасываются самим pygame
+# и не попадают в очередь.
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN,
+                  pygame.WINDOWEXPOSED)
+
+
+class Controls():
+    """
+    Слой ввода: фильтрация событий, опрос клавиш и переназначаемые действия.
+
+    Состояние клавиш движения и огня считывается один раз за логический
+    тик через pygame.key.get_pressed() и упаковывается в маску INPUT_*,
+    поэтому потерянное событие KEYUP не оставляет корабль в движении.
+    Нажатие, отпущенное до опроса, все равно учитывается в ближайшем тике.
+    Пока огонь удерживается, выстрелы повторяются с частотой
+    settings.autofire_rate.
+
+    Задержка ввода измеряется в тиках: от тика, на котором получено
+    нажатие клавиши движения, до тика, на котором сдвинулся корабль.
+
+    Args:
+        bindings (dict): Действие -> кортеж клавиш.
+        latencies (deque): Последние измеренные задержки в тиках.
+    """
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует привязки клавиш по умолчанию.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.bindings = {}
+        self._actions = {}
+        for action, keys in DEFAULT_BINDINGS.items():
+            self.bind(action, *keys)
+
+        self.latencies = deque(maxlen=256)
+        self.reset()
+
+    def install(self):
+        """
+        Оставляет в очереди событий pygame только нужные игре типы.
+        """
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def bind(self, action, *keys):
+        """
+        Назначает действию клавиши вместо прежних.
+
+        :param:
+            action (str): Имя действия из DEFAULT_BINDINGS.
+            *keys (int): Коды клавиш pygame.K_*.
+        """
+        if action not in DEFAULT_BINDINGS:
+            raise ValueError(f"неизвестное действие: {action}")
+        for key in self.bindings.get(action, ()):
+            del self._actions[key]
+        for key in keys:
+            # Клавиша принадлежит только одному действию.
+            other = self._actions.get(key)
+            if other is not None:
+                self.bindings[other] = tuple(k for k in self.bindings[other] if k != key)
+            self._actions[key] = action
+        self.bindings[action] = tuple(keys)
+
+    def action_for(self, key):
+        """
+        Возвращает действие, назначенное клавише.
+
+        :param:
+            key (int): Код клавиши.
+        :return:
+            str: Имя действия или None.
+        """
+        return self._actions.get(key)
+
+    def reset(self):
+        """
+        Сбрасывает накопленные нажатия и состояние автоогня.
+        """
+        self._tapped = 0
+        self._fire_held = False
+        self._next_fire = 0
+        self._press = None
+        self._ship_x = None
+
+    def key_down(self, action):
+        """
+        Запоминает нажатие клавиши опрашиваемого действия до ближайшего тика.
+
+        :param:
+            action (str): Имя действия.
+        """
+        bit = HELD_ACTIONS.get(action)
+        if bit is None:
+            return
+        self._tapped |= bit
+        if bit != INPUT_FIRE:
+            self._press = (bit, self.ai_game.ticks)
+
+    def poll(self):
+        """
+        Считывает состояние клавиш на очередной тик.
+
+        :return:
+            int: Маска INPUT_* для тика.
+        """
+        pressed = pygame.key.get_pressed()
+        mask = tapped = self._tapped
+        self._tapped = 0
+        for action, bit in HELD_ACTIONS.items():
+            if any(pressed[key] for key in self.bindings[action]):
+                mask |= bit
+
+        tick = self.ai_game.ticks
+        if mask & INPUT_FIRE:
+            # Новое нажатие стреляет сразу, удержание - с частотой автоогня.
+            if self._fire_held and not tapped & INPUT_FIRE and not self._autofire_due(tick):
+                mask &= ~INPUT_FIRE
+            else:
+                self._next_fire = tick + self._autofire_interval()
+        self._fire_held = any(pressed[key] for key in self.bindings['fire'])
+
+        if self._press is not None and not mask & self._press[0]:
+            # Клавиша отпущена раньше, чем корабль успел сдвинуться.
+            self._press = None
+        self._ship_x = self.ai_game.ship.x
+        return mask
+
+    def _autofire_interval(self):
+        """
+        Возвращает интервал автоогня в тиках (0 - автоогонь выключен).
+        """
+        rate = self.settings.autofire_rate
+        if not rate:
+            return 0
+        return max(1, round(self.settings.tick_rate / rate))
+
+    def _autofire_due(self, tick):
+        """
+        Проверяет, пора ли повторить выстрел при удерживаемой клавише.
+        """
+        return self._autofire_interval() > 0 and tick >= self._next_fire
+
+    def after_tick(self):
+        """
+        Измеряет задержку до движения корабля после выполненного тика.
+        """
+        if self._press is None or self._ship_x is None:
+            return
+        bit, tick = self._press
+        moved = self.ai_game.ship.x - self._ship_x
+        if (bit == INPUT_LEFT and moved < 0) or (bit == INPUT_RIGHT and moved > 0):
+            self.latencies.append(self.ai_game.ticks - tick)
+            self._press = None
+
+    def stats(self):
+        """
+        Возвращает статистику задержки ввода.
+
+        :return:
+            dict: Количество замеров, средняя и максимальная задержка в тиках.
+        """
+        if not self.latencies:
+            return {"samples": 0, "mean": 0.0, "max": 0}
+        return {"samples": len(self.latencies),
+                "mean": sum(self.latencies) / len(self.latencies),
+                "max": max(self.latencies)}
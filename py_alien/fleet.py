@@ -0,0 +1,495 @@
+import numpy as np
+import pygame
+from pygame.sprite import Group
+
+from alien import Alien
+from collisions import SpatialHash
+
+
+def round_coords(values):
+    """
+    Округляет координаты так же, как pygame.Rect (половина - от нуля).
+
+    :param:
+        values (ndarray): Вещественные координаты.
+    :return:
+        ndarray: Целочисленные координаты.
+    """
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class Fleet(Group):
+    """
+    Флот пришельцев, хранящий координаты в непрерывных массивах NumPy.
+
+    Движение, проверка краев, снижение и достижение нижнего края экрана
+    выполняются векторно, а границы живой части флота кэшируются и
+    сдвигаются вместе с флотом вместо пересчета на каждом тике.
+    Флот остается группой pygame: спрайты Alien синхронизируются с массивами
+    при обращении к sprites(), поэтому Group.draw, groupcollide и
+    spritecollide продолжают работать.
+
+    Раскладка стандартного флота вычисляется один раз для размера экрана
+    и кэшируется как шаблон позиций, а спрайты пришельцев переиспользуются
+    между флотами, поэтому новый флот создается одной операцией.
+
+    В режиме нагрузки флот может состоять из нескольких волн: у каждой
+    волны свое направление, и у края экрана разворачивается и снижается
+    только дошедшая до него волна. Флот из одной волны движется по
+    settings.fleet_diraction.
+
+    Args:
+        screen (Surface): Экран игры.
+        settings (Settings): Настройки игры.
+        image (Surface): Общее изображение пришельца.
+        alien_width (int): Ширина пришельца.
+        alien_height (int): Высота пришельца.
+        x (ndarray): Вещественные координаты левого края пришельцев.
+        y (ndarray): Координаты верхнего края пришельцев.
+        prev_x (ndarray): Координаты x на предыдущем тике (для интерполяции).
+        prev_y (ndarray): Координаты y на предыдущем тике (для интерполяции).
+        alive (ndarray): Маска живых пришельцев.
+        grid (tuple): Раскладка флота (columns, rows, step_x, step_y), если
+            пришельцы стоят в регулярной решетке, иначе None. У флота из
+            нескольких волн решетка общая, а волны идут подряд блоками по
+            columns * rows пришельцев.
+        wave (ndarray): Номер волны каждого пришельца.
+        waves (int): Количество волн.
+        directions (ndarray): Направления волн (при waves > 1).
+    """
+
+    # Шаблоны раскладки флота: (размеры экрана, пришельца и корабля) -> (xs, ys, grid).
+    _layouts = {}
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует пустой флот.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        super().__init__()
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        self.image = ai_game.assets.image('alien.bmp')
+        self.alien_width, self.alien_height = self.image.get_size()
+
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.prev_x = np.zeros(0)
+        self.prev_y = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self._aliens = []
+        self.grid = None
+        self.wave = np.zeros(0, dtype=np.int64)
+        self.waves = 1
+        self.directions = np.ones(1, dtype=np.int64)
+
+        # Широкая фаза: начало решетки или хеш-сетка; сбрасываются при движении.
+        self._origin = None
+        self._hash = None
+
+        # Кэш границ живой части флота: (min x, max x, max y).
+        self._bounds = None
+        # Нужна ли синхронизация rect спрайтов с массивами.
+        self._rects_stale = False
+
+    def layout(self, ship_height):
+        """
+        Возвращает шаблон раскладки стандартного флота.
+
+        Пришельцы расставляются рядами с интервалом в ширину (высоту)
+        пришельца; раскладка вычисляется один раз для каждого сочетания
+        размеров экрана, пришельца и корабля.
+
+        :param:
+            ship_height (int): Высота корабля.
+        :return:
+            tuple: (xs, ys, grid) - координаты по строкам и решетка.
+        """
+        width, height = self.alien_width, self.alien_height
+        key = (self.settings.screen_width, self.settings.screen_height,
+               width, height, ship_height)
+        template = self._layouts.get(key)
+        if template is None:
+            available_space_x = self.settings.screen_width - (2 * width)
+            number_aliens_x = available_space_x // (2 * width)
+
+            # Определяет количество рядов, помещающихся на экране.
+            available_space_y = self.settings.screen_height - (3 * height) - ship_height
+            number_rows = available_space_y // (2 * height)
+
+            columns = np.arange(number_aliens_x)
+            rows = np.arange(number_rows)
+            xs = np.tile(width + 2 * width * columns, number_rows).astype(np.float64)
+            ys = np.repeat(height + 2 * height * rows, number_aliens_x).astype(np.float64)
+            template = (xs, ys, (number_aliens_x, number_rows, 2 * width, 2 * height))
+            self._layouts[key] = template
+        return template
+
+    def stress_layout(self, columns, rows, waves):
+        """
+        Возвращает шаблон раскладки флота для режима нагрузки.
+
+        Размер решетки задается независимо от экрана: если ряды или колонны
+        не помещаются с обычным интервалом, интервал уменьшается (пришельцы
+        могут перекрываться). Волны расположены полосами в верхней половине
+        экрана; нечетные волны начинают у правого края. Все волны - одинаковые
+        решетки, поэтому широкая фаза коллизий работает по решетке каждой волны.
+
+        :param:
+            columns (int): Количество пришельцев в ряду.
+            rows (int): Количество рядов в волне.
+            waves (int): Количество волн.
+        :return:
+            tuple: (xs, ys, grid, wave) - координаты, решетка и номера волн.
+        """
+        width, height = self.alien_width, self.alien_height
+        screen_width, screen_height = self.settings.screen_width, self.settings.screen_height
+        key = ('stress', screen_width, screen_height, width, height, columns, rows, waves)
+        template = self._layouts.get(key)
+        if template is None:
+            # Волна занимает не больше трех четвертей ширины экрана, чтобы ей было куда двигаться.
+            step_x = max(1, min(2 * width, (screen_width * 3 // 4 - width) // max(columns - 1, 1)))
+            band = screen_height // 2 // waves
+            step_y = max(1, min(2 * height, (band - height) // max(rows - 1, 1)))
+            span = step_x * (columns - 1) + width
+
+            xs, ys, wave = [], [], []
+            for index in range(waves):
+                left = width if index % 2 == 0 else max(1, screen_width - width - span)
+                top = height + index * band
+                xs.append(np.tile(left + step_x * np.arange(columns), rows))
+                ys.append(np.repeat(top + step_y * np.arange(rows), columns))
+                wave.append(np.full(columns * rows, index))
+            template = (np.concatenate(xs).astype(np.float64),
+                        np.concatenate(ys).astype(np.float64), (columns, rows, step_x, step_y),
+                        np.concatenate(wave).astype(np.int64))
+            self._layouts[key] = template
+        return template
+
+    def spawn(self, xs, ys, grid=None, alive=None, wave=None, directions=None):
+        """
+        Создает новый флот в заданных позициях одной операцией.
+
+        :param:
+            xs (sequence): Координаты левого края пришельцев.
+            ys (sequence): Координаты верхнего края пришельцев.
+            grid (tuple): (columns, rows, step_x, step_y), если позиции
+                заданы по строкам регулярной решетки с целым шагом.
+            alive (sequence): Маска живых пришельцев (при восстановлении
+                сохраненной игры); по умолчанию живы все.
+            wave (sequence): Номера волн пришельцев; по умолчанию одна волна.
+            directions (sequence): Направления волн; по умолчанию четные
+                волны движутся по settings.fleet_diraction, нечетные - навстречу.
+        """
+        self.empty()
+        self.x = np.array(xs, dtype=np.float64)
+        self.y = np.array(ys, dtype=np.float64)
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+        # Спрайты прежних флотов переиспользуются, недостающие создаются.
+        count = len(self.x)
+        if len(self._aliens) < count:
+            self._aliens.extend(Alien(self.ai_game, index)
+                                for index in range(len(self._aliens), count))
+        elif len(self._aliens) > count:
+            del self._aliens[count:]
+        if alive is None:
+            self.alive = np.ones(len(self.x), dtype=bool)
+            self.add(*self._aliens)
+        else:
+            self.alive = np.array(alive, dtype=bool)
+            self.add(*[self._aliens[index] for index in np.flatnonzero(self.alive).tolist()])
+        self.grid = grid
+        if wave is None:
+            self.wave = np.zeros(count, dtype=np.int64)
+            self.waves = 1
+        else:
+            self.wave = np.array(wave, dtype=np.int64)
+            self.waves = int(self.wave.max()) + 1 if count else 1
+        if directions is None:
+            directions = self.settings.fleet_diraction * (1 - 2 * (np.arange(self.waves) % 2))
+        self.directions = np.array(directions, dtype=np.int64)
+        self._origin = None
+        self._hash = None
+        self._bounds = None
+        self._rects_stale = True
+
+    @property
+    def alien_sprites(self):
+        """
+        Список спрайтов флота по индексам массивов (включая уничтоженных).
+        """
+        return self._aliens
+
+    def sprites(self):
+        """
+        Возвращает список живых пришельцев с актуальными rect.
+        """
+        if self._rects_stale:
+            self._sync_rects()
+        return super().sprites()
+
+    def __bool__(self):
+        return bool(self.spritedict)
+
+    def __len__(self):
+        return len(self.spritedict)
+
+    def _sync_rects(self):
+        """
+        Переносит координаты из массивов в rect спрайтов.
+        """
+        xs = round_coords(self.x).tolist()
+        ys = round_coords(self.y).tolist()
+        for alien in self.spritedict:
+            alien.rect.topleft = (xs[alien.index], ys[alien.index])
+        self._rects_stale = False
+
+    def remove_internal(self, sprite):
+        """
+        Убирает пришельца из флота и помечает его в маске как уничтоженного.
+        """
+        super().remove_internal(sprite)
+        self.alive[sprite.index] = False
+        self._bounds = None
+
+    def empty(self):
+        """
+        Удаляет весь флот без поштучной синхронизации координат.
+        """
+        for alien in self.spritedict:
+            alien.remove_internal(self)
+        self.spritedict.clear()
+        self.alive[:] = False
+        self._bounds = None
+
+    def bounds(self):
+        """
+        Возвращает границы живой части флота.
+
+        :return:
+            tuple: (min x, max x, max y) левых/верхних краев живых пришельцев
+                или None, если флот пуст.
+        """
+        if self._bounds is None and self.spritedict:
+            x = self.x[self.alive]
+            self._bounds = (x.min(), x.max(), self.y[self.alive].max())
+        return self._bounds
+
+    def update(self):
+        """
+        Перемещает весь флот влево или вправо одной векторной операцией.
+        """
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+
+        speed = self.settings.alien_speed * self.settings.alien_speed_factor
+        if self.waves > 1:
+            # Волны движутся каждая в своем направлении.
+            self.x += speed * self.directions[self.wave]
+            self._bounds = None
+            self._origin = None
+            self._hash = None
+            self._rects_stale = True
+            return
+
+        dx = speed * self.settings.fleet_diraction
+        self.x += dx
+        if self._bounds is not None:
+            min_x, max_x, max_y = self._bounds
+            self._bounds = (min_x + dx, max_x + dx, max_y)
+        self._origin = None
+        self._hash = None
+        self._rects_stale = True
+
+    def check_edges(self):
+        """
+        Возвращает True, если хотя бы один пришелец находится у края экрана.
+        """
+        bounds = self.bounds()
+        if bounds is None:
+            return False
+        left = round_coords(np.float64(bounds[0]))
+        right = round_coords(np.float64(bounds[1])) + self.alien_width
+        return bool(right >= self.screen.get_rect().right or left <= 0)
+
+    def turn_waves(self, distance):
+        """
+        Разворачивает и опускает волны, дошедшие до края экрана.
+
+        :param:
+            distance (int): Величина снижения в пикселях.
+        :return:
+            bool: True, если развернулась хотя бы одна волна.
+        """
+        alive = self.alive
+        if not alive.any():
+            return False
+        wave = self.wave[alive]
+        xs = round_coords(self.x[alive])
+        left = np.full(self.waves, np.iinfo(np.int64).max)
+        right = np.full(self.waves, np.iinfo(np.int64).min)
+        np.minimum.at(left, wave, xs)
+        np.maximum.at(right, wave, xs + self.alien_width)
+
+        turned = (right >= self.screen.get_rect().right) | (left <= 0)
+        if not turned.any():
+            return False
+        self.y[turned[self.wave]] += distance
+        self.directions[turned] *= -1
+        self._bounds = None
+        self._origin = None
+        self._hash = None
+        self._rects_stale = True
+        return True
+
+    def drop(self, distance):
+        """
+        Опускает весь флот на заданное расстояние.
+
+        :param:
+            distance (int): Величина снижения в пикселях.
+        """
+        self.y += distance
+        if self._bounds is not None:
+            min_x, max_x, max_y = self._bounds
+            self._bounds = (min_x, max_x, max_y + distance)
+        self._origin = None
+        self._hash = None
+        self._rects_stale = True
+
+    def reached_bottom(self, bottom):
+        """
+        Проверяет, добрался ли хотя бы один пришелец до нижней границы.
+
+        :param:
+            bottom (int): Координата нижней границы.
+        :return:
+            bool: True, если пришелец достиг границы.
+        """
+        bounds = self.bounds()
+        if bounds is None:
+            return False
+        return bool(bounds[2] + self.alien_height >= bottom)
+
+    def collide_rect(self, rect):
+        """
+        Проверяет пересечение прямоугольника с живыми пришельцами.
+
+        Векторный аналог pygame.sprite.spritecollideany для флота.
+
+        :param:
+            rect (Rect): Проверяемый прямоугольник.
+        :return:
+            bool: True, если прямоугольник пересекается хотя бы с одним пришельцем.
+        """
+        bounds = self.bounds()
+        if bounds is None:
+            return False
+
+        # Быстрый отказ: прямоугольник ниже всего флота.
+        if rect.top >= bounds[2] + self.alien_height:
+            return False
+
+        xs = round_coords(self.x[self.alive])
+        ys = round_coords(self.y[self.alive])
+        hits = ((xs < rect.right) & (xs + self.alien_width > rect.left) &
+                (ys < rect.bottom) & (ys + self.alien_height > rect.top))
+        return bool(hits.any())
+
+    def collide_indices(self, rect):
+        """
+        Возвращает индексы живых пришельцев, пересекающихся с прямоугольником.
+
+        Для флота-решетки позиция прямоугольника сразу переводится в диапазон
+        ячеек (флот движется как единое целое, поэтому все пришельцы имеют
+        одинаковое смещение относительно решетки); у флота из нескольких волн
+        так проверяется решетка каждой волны. Для флота без решетки
+        используется пространственная хеш-сетка.
+
+        :param:
+            rect (Rect): Проверяемый прямоугольник.
+        :return:
+            list: Индексы по возрастанию (в порядке группы).
+        """
+        if self.grid is None:
+            return self._hash_indices(rect)
+
+        columns, rows, step_x, step_y = self.grid
+        size = columns * rows
+        if self._origin is None:
+            # Начало решетки каждой волны - ее первый пришелец.
+            starts = np.arange(self.waves) * size
+            self._origin = list(zip(round_coords(self.x[starts]).tolist(),
+                                    round_coords(self.y[starts]).tolist()))
+        width, height = self.alien_width, self.alien_height
+
+        alive = self.alive
+        indices = []
+        for base, (left, top) in zip(range(0, len(alive), size), self._origin):
+            first_col = max(0, (rect.left - width - left) // step_x + 1)
+            last_col = min(columns - 1, (rect.right - 1 - left) // step_x)
+            first_row = max(0, (rect.top - height - top) // step_y + 1)
+            last_row = min(rows - 1, (rect.bottom - 1 - top) // step_y)
+            if first_col > last_col or first_row > last_row:
+                continue
+
+            for row in range(first_row, last_row + 1):
+                start = base + row * columns
+                for index in range(start + first_col, start + last_col + 1):
+                    if alive[index]:
+                        indices.append(index)
+        return indices
+
+    def _hash_indices(self, rect):
+        """
+        Широкая фаза через пространственную хеш-сетку для флота без решетки.
+        """
+        xs = round_coords(self.x)
+        ys = round_coords(self.y)
+        width, height = self.alien_width, self.alien_height
+        if self._hash is None:
+            self._hash = SpatialHash(2 * max(width, height))
+            for index in np.flatnonzero(self.alive).tolist():
+                self._hash.insert(index, int(xs[index]), int(ys[index]), width, height)
+
+        alive = self.alive
+        indices = []
+        for index in self._hash.query(rect):
+            x, y = xs[index], ys[index]
+            if (alive[index] and x < rect.right and x + width > rect.left and
+                    y < rect.bottom and y + height > rect.top):
+                indices.append(index)
+        indices.sort()
+        return indices
+
+    def draw_items(self, alpha=1.0):
+        """
+        Возвращает живых пришельцев для вывода одним вызовом Surface.blits.
+
+        :param:
+            alpha (float): Доля пути между предыдущим и текущим тиком (0..1).
+        :return:
+            tuple: (пары (изображение, позиция), полоса экрана, занятая
+                флотом) или ([], None), если флот пуст.
+        """
+        if not self.spritedict:
+            return [], None
+
+        alive = self.alive
+        px = self.prev_x[alive]
+        py = self.prev_y[alive]
+        xs = round_coords(px + (self.x[alive] - px) * alpha)
+        ys = round_coords(py + (self.y[alive] - py) * alpha)
+
+        image = self.image
+        items = [(image, pos) for pos in zip(xs.tolist(), ys.tolist())]
+
+        left, top = int(xs.min()), int(ys.min())
+        return items, pygame.Rect(left, top,
+                                  int(xs.max()) - left + self.alien_width,
+                                  int(ys.max()) - top + self.alien_height)
@@ -0,0 +1,99 @@
+class QualityGovernor():
+    """
+    Регулятор качества по бюджету времени кадра.
+
+    Следит за временем работы последних кадров (без ожидания в
+    Clock.tick) и при выходе за settings.target_frame_ms понижает качество
+    на одну ступень, а при устойчивом запасе - возвращает его.
+
+    Ступени качества:
+        0 - полное качество;
+        1 - панель результатов обновляется не чаще 4 раз в секунду,
+            одновременно звучат не больше 3 звуков;
+        2 - щит рисуется без рамки, звучат не больше 2 звуков;
+        3 - экран перерисовывается через кадр (логика по-прежнему
+            выполняется каждый кадр).
+
+    Args:
+        level (int): Текущая ступень качества.
+        adaptive (bool): Меняется ли ступень автоматически.
+        render_interval (int): Перерисовывать экран раз в столько кадров.
+        changes (int): Количество смен ступени.
+    """
+
+    MAX_LEVEL = 3
+    # Сколько кадров усредняется перед решением.
+    WINDOW = 30
+    # Доля бюджета, ниже которой качество можно повысить.
+    HEADROOM = 0.6
+    # Сколько окон подряд должен держаться запас перед повышением качества.
+    RECOVER_WINDOWS = 3
+    # Ограничение одновременных звуков по ступеням (None - из настроек).
+    VOICES = (None, 3, 2, 2)
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует регулятор и применяет начальную ступень из настроек.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.adaptive = self.settings.adaptive_quality
+        self.changes = 0
+        self._samples = []
+        self._calm_windows = 0
+        self.level = None
+        self.set_level(self.settings.quality_level)
+
+    def update(self, frame_ms):
+        """
+        Учитывает время работы очередного кадра.
+
+        :param:
+            frame_ms (float): Время работы кадра в миллисекундах.
+        """
+        if not self.adaptive:
+            return
+        self._samples.append(frame_ms)
+        if len(self._samples) < self.WINDOW:
+            return
+
+        # Решение принимается по 90-му перцентилю окна: редкие выбросы не в счет.
+        samples = sorted(self._samples)
+        load = samples[int(len(samples) * 0.9)]
+        self._samples.clear()
+
+        budget = self.settings.target_frame_ms
+        if load > budget and self.level < self.MAX_LEVEL:
+            self._calm_windows = 0
+            self.set_level(self.level + 1)
+        elif load < budget * self.HEADROOM and self.level > 0:
+            self._calm_windows += 1
+            if self._calm_windows >= self.RECOVER_WINDOWS:
+                self._calm_windows = 0
+                self.set_level(self.level - 1)
+        else:
+            self._calm_windows = 0
+
+    def set_level(self, level):
+        """
+        Устанавливает ступень качества и настраивает компоненты игры.
+
+        :param:
+            level (int): Ступень от 0 до MAX_LEVEL.
+        """
+        level = max(0, min(self.MAX_LEVEL, level))
+        if self.level is not None and self.level != level:
+            self.changes += 1
+        self.level = level
+
+        game = self.ai_game
+        game.sb.refresh_interval = 250 if level >= 1 else 0
+        game.ship.shield_outline = level < 2
+        voices = self.VOICES[level]
+        game.audio.max_voices = (self.settings.max_voices if voices is None
+                                 else min(voices, self.settings.max_voices))
+        self.render_interval = 2 if level >= 3 else 1
+        game.profiler.extra_lines = [f"quality {level}" + ("" if self.adaptive else " (fixed)")]
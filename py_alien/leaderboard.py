@@ -0,0 +1,325 @@
+import queue
+import sqlite3
+import threading
+import time
+
+import pygame
+
+from assets import assets
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    profile TEXT NOT NULL,
+    seed INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_profile_score ON runs (profile, score);
+"""
+
+
+def top_runs(conn, profile, count):
+    """
+    Возвращает лучшие игры профиля (обход индекса с конца, без сортировки).
+
+    :param:
+        conn (Connection): Соединение с базой.
+        profile (str): Профиль настроек.
+        count (int): Количество игр.
+    :return:
+        list: Кортежи (счет, уровень, длительность в секундах).
+    """
+    return conn.execute(
+        "SELECT score, level, duration FROM runs WHERE profile = ? "
+        "ORDER BY score DESC LIMIT ?", (profile, count)).fetchall()
+
+
+def rank_of(conn, profile, score):
+    """
+    Возвращает место и процентиль счета среди игр профиля.
+
+    Оба значения считаются по диапазонам индекса (profile, score).
+
+    :param:
+        conn (Connection): Соединение с базой.
+        profile (str): Профиль настроек.
+        score (int): Счет.
+    :return:
+        tuple: (место, доля игр с меньшим счетом в процентах, всего игр).
+    """
+    total, = conn.execute("SELECT COUNT(*) FROM runs WHERE profile = ?",
+                          (profile,)).fetchone()
+    better, = conn.execute("SELECT COUNT(*) FROM runs WHERE profile = ? AND score > ?",
+                           (profile, score)).fetchone()
+    worse, = conn.execute("SELECT COUNT(*) FROM runs WHERE profile = ? AND score < ?",
+                          (profile, score)).fetchone()
+    # Сама игра в процентиль не входит.
+    others = total - 1
+    percentile = 100.0 * worse / others if others > 0 else 100.0
+    return better + 1, percentile, total
+
+
+def score_at(conn, profile, percentile):
+    """
+    Возвращает счет, ниже которого заданная доля игр профиля.
+
+    :param:
+        conn (Connection): Соединение с базой.
+        profile (str): Профиль настроек.
+        percentile (float): Процентиль от 0 до 100.
+    :return:
+        int: Счет или None, если игр нет.
+    """
+    total, = conn.execute("SELECT COUNT(*) FROM runs WHERE profile = ?",
+                          (profile,)).fetchone()
+    if not total:
+        return None
+    offset = min(total - 1, int(total * percentile / 100))
+    row = conn.execute("SELECT score FROM runs WHERE profile = ? "
+                       "ORDER BY score LIMIT 1 OFFSET ?", (profile, offset)).fetchone()
+    return row[0]
+
+
+class Leaderboard():
+    """
+    Таблица рекордов в базе SQLite.
+
+    Все обращения к базе выполняет один фоновый поток: игра только ставит
+    результат в очередь и на кадре окончания игры не ждет диска. После
+    каждой записи поток сам запрашивает лучшие игры, место и процентиль
+    нового результата и публикует их в summary; экран окончания игры
+    выводит то, что уже опубликовано. Результаты разных профилей настроек
+    (например, обычной игры и режима нагрузки) не смешиваются.
+
+    В режиме headless таблица отключена: обучающие и нагрузочные прогоны
+    не попадают в рекорды. Ее можно отключить и для игры с окном
+    (например, в бенчмарках), тогда файл базы не создается.
+
+    Args:
+        enabled (bool): Ведется ли таблица.
+        path (str): Файл базы.
+        profile (str): Профиль настроек текущей игры.
+        summary (dict): Последние опубликованные результаты или None.
+        last_error (Exception): Ошибка базы или None.
+        writes (int): Количество записанных игр.
+    """
+
+    # Интервал опроса меню, пока результат записывается (мс).
+    MENU_POLL_MS = 50
+
+    def __init__(self, ai_game, enabled=True):
+        """
+        Запускает поток, который открывает базу и загружает рекорды.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+            enabled (bool): Вести ли таблицу (в режиме headless не ведется).
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.path = self.settings.leaderboard_path
+        self.size = self.settings.leaderboard_size
+        self.summary = None
+        self.last_error = None
+        self.writes = 0
+
+        self._queue = queue.SimpleQueue()
+        self._submitted = 0
+        self._published = 0
+        # Номер запроса, которым записана последняя законченная игра.
+        self._own_request = None
+        self._seen = None
+        self._image = None
+        self._font = None
+        self._thread = None
+        self.enabled = enabled and not ai_game.headless
+        if self.enabled:
+            self._request("load")
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+
+    @property
+    def profile(self):
+        """
+        Профиль настроек текущей игры.
+        """
+        return "stress" if self.settings.stress_mode else "normal"
+
+    @property
+    def pending(self):
+        """
+        True, если есть результаты, которые еще не записаны и не опубликованы.
+        """
+        return self._published < self._submitted
+
+    def _request(self, command, record=None):
+        """
+        Ставит команду для фонового потока в очередь.
+
+        :param:
+            command (str): "load" - опубликовать результаты профиля,
+                "insert" - записать игру и опубликовать результаты.
+            record (tuple): Значения столбцов новой игры.
+        :return:
+            int: Номер запроса.
+        """
+        self._submitted += 1
+        self._queue.put((command, self.profile, record, self._submitted))
+        return self._submitted
+
+    def submit(self):
+        """
+        Ставит в очередь запись закончившейся игры.
+        """
+        if not self.enabled:
+            return
+        stats = self.ai_game.stats
+        # Пока результат этой игры не опубликован, строка "Ваш результат"
+        # прошлой игры не выводится.
+        self._image = None
+        record = (stats.score, stats.level, self.ai_game.ticks / self.settings.tick_rate,
+                  self.profile, self.ai_game.seed, time.time())
+        self._own_request = self._request("insert", record)
+
+    def _worker(self):
+        """
+        Выполняет запросы к базе из очереди (фоновый поток).
+        """
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as error:
+            self.last_error = error
+            self.enabled = False
+            # Меню не должно ждать результатов, которых не будет.
+            self._published = self._submitted
+            return
+        while True:
+            command, profile, record, request = self._queue.get()
+            if command is None:
+                break
+            try:
+                self._execute(conn, command, profile, record, request)
+            except sqlite3.Error as error:
+                self.last_error = error
+            self._published += 1
+        conn.close()
+
+    def _execute(self, conn, command, profile, record, request):
+        """
+        Записывает игру (если нужно) и публикует результаты профиля.
+
+        В summary сохраняется номер запроса: по нему видно, чьим
+        результатом является last.
+        """
+        last = None
+        if command == "insert":
+            with conn:
+                conn.execute("INSERT INTO runs (score, level, duration, profile, seed, "
+                             "played_at) VALUES (?, ?, ?, ?, ?, ?)", record)
+            self.writes += 1
+            rank, percentile, total = rank_of(conn, profile, record[0])
+            last = {"score": record[0], "rank": rank, "percentile": percentile}
+        top = top_runs(conn, profile, self.size)
+        total, = conn.execute("SELECT COUNT(*) FROM runs WHERE profile = ?",
+                              (profile,)).fetchone()
+        # Словарь заменяется целиком: основной поток видит согласованные данные.
+        self.summary = {
+            "profile": profile,
+            "top": top,
+            "best": top[0][0] if top else 0,
+            "runs": total,
+            "median": score_at(conn, profile, 50),
+            "last": last,
+            "request": request,
+        }
+
+    def poll(self):
+        """
+        Переносит лучший результат из базы в рекорд игры.
+
+        :return:
+            bool: True, если с прошлого вызова опубликованы новые результаты.
+        """
+        summary = self.summary
+        if (self.enabled and summary is not None and summary["profile"] != self.profile
+                and not self.pending):
+            # Профиль сменился (например, включен режим нагрузки).
+            self._request("load")
+        if summary is None or summary is self._seen:
+            return False
+        self._seen = summary
+        self._image = None
+        stats = self.ai_game.stats
+        if summary["profile"] == self.profile and summary["best"] > stats.high_score:
+            stats.high_score = summary["best"]
+            self.ai_game.sb.prep_high_score()
+        return True
+
+    def close(self):
+        """
+        Дожидается записи результатов из очереди и закрывает базу.
+        """
+        if self._thread is None:
+            return
+        self._queue.put((None, None, None, None))
+        self._thread.join()
+        self._thread = None
+
+    def draw(self, screen, top):
+        """
+        Выводит таблицу рекордов на экран окончания игры.
+
+        :param:
+            screen (Surface): Экран игры.
+            top (int): Верхняя граница таблицы.
+        :return:
+            Rect: Область таблицы или None, если выводить нечего.
+        """
+        summary = self._seen
+        if summary is None or summary["profile"] != self.profile:
+            return None
+        if self._image is None:
+            self._image = self._render(summary)
+        rect = self._image.get_rect(midtop=(screen.get_rect().centerx, top))
+        screen.blit(self._image, rect)
+        return rect
+
+    def _render(self, summary):
+        """
+        Отрисовывает строки таблицы.
+
+        :param:
+            summary (dict): Опубликованные результаты.
+        :return:
+            Surface: Изображение таблицы.
+        """
+        if self._font is None:
+            self._font = assets.font(32)
+
+        lines = ["Лучшие результаты:"]
+        for place, (score, level, duration) in enumerate(summary["top"], 1):
+            minutes, seconds = divmod(int(duration), 60)
+            lines.append(f"{place}. {score:,}  уровень {level}  {minutes}:{seconds:02d}")
+        last = summary["last"]
+        if last is not None and summary["request"] == self._own_request:
+            lines.append(f"Ваш результат: {last['score']:,} - {last['rank']} место, "
+                         f"лучше {last['percentile']:.0f}% игр")
+        if summary["median"] is not None:
+            lines.append(f"Игр: {summary['runs']}, медиана {summary['median']:,}")
+
+        text_color = (30, 30, 30)
+        bg_color = self.settings.bg_color
+        images = [self._font.render(line, True, text_color, bg_color) for line in lines]
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        image = pygame.Surface((width, height))
+        image.fill(bg_color)
+        y = 0
+        for line in images:
+            image.blit(line, ((width - line.get_width()) // 2, y))
+            y += line.get_height()
+        return image
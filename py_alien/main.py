@@ -1,6 +1,69 @@
+import argparse
+import time
+
+# Время импорта pygame и модулей игры входит в разбивку --startup-profile.
+_import_start = time.perf_counter()
 from alien_invasion import AlienInvasion
+from capture import FrameCapture
+_import_time = time.perf_counter() - _import_start
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument('--record', metavar='FILE',
+                        help="записывать игры для воспроизведения (replay.py), каждую "
+                             "в свой файл FILE_NNN")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="включить профилировщик кадров; F4 сохраняет буфер в FILE "
+                             "(.json - Chrome trace, иначе CSV)")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="вывести время до первого кадра по шагам запуска")
+    parser.add_argument('--stress', action='store_true',
+                        help="режим нагрузки: большой флот из нескольких волн, "
+                             "тысячи снарядов и бонусов (профилировщик включен)")
+    parser.add_argument('--host', action='store_true',
+                        help="сетевая игра вдвоем: ждать подключения второго игрока")
+    parser.add_argument('--join', metavar='ADDRESS',
+                        help="сетевая игра вдвоем: подключиться к ведущему по адресу")
+    parser.add_argument('--port', type=int, help="порт сетевой игры")
+    parser.add_argument('--capture', metavar='DIR',
+                        help="записывать кадры в каталог DIR, каждую запись в свой "
+                             "подкаталог take_NNN (F5 - остановить/начать новую)")
+    parser.add_argument('--capture-every', type=int, metavar='N',
+                        help="записывать каждый N-й кадр")
+    parser.add_argument('--capture-format', choices=('png', 'raw'),
+                        help="формат записи: png - файл на кадр, raw - пиксели "
+                             "подряд в frames.raw")
+    args = parser.parse_args()
+
     # Создание экземпляра и запуск игры.
     game = AlienInvasion()
+    game.boot_times.insert(0, ("import", _import_time))
+    game.startup_profile = args.startup_profile
+    if args.record:
+        game.start_recording(args.record)
+    if args.stress:
+        game.settings.stress_mode = True
+    if args.profile or args.stress:
+        game.profile_path = args.profile or game.profile_path
+        game.profiler.toggle()
+    if args.capture:
+        game.settings.capture_path = args.capture
+        if args.capture_every:
+            game.settings.capture_every = args.capture_every
+        if args.capture_format:
+            game.settings.capture_format = args.capture_format
+        game.capture = FrameCapture(game)
+        game.capture.start()
+    if args.host or args.join:
+        import netplay
+        port = args.port or game.settings.net_port
+        if args.host:
+            print(f"Ожидание второго игрока на порту {port} "
+                  f"({game.settings.net_accept_timeout} с)...")
+            try:
+                game.start_netplay(netplay.host_game(game, port))
+            except TimeoutError:
+                parser.exit(1, "Второй игрок не подключился.\n")
+        else:
+            game.start_netplay(netplay.join_game(game, args.join, port))
     game.run_game()
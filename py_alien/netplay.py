@@ -0,0 +1,568 @@
+"""
+Сетевая игра вдвоем по TCP.
+
+Ведущий (host) выполняет полную симуляцию, второй игрок (guest)
+подключается к нему и ведет ту же игру как предсказание. Кораблем
+управляют оба: маски управления игроков объединяются. Каждый игрок
+отправляет свою маску, только когда она изменилась. Ведущий раз в
+settings.net_snapshot_interval тиков отправляет снимок состояния (флот,
+маска живых пришельцев, снаряды, бонусы, генератор случайных чисел) в
+формате сохранения. Снимок сжимается как разность (XOR + zlib)
+с последним снимком, получение которого подтвердил второй игрок. Ведущий
+хранит только settings.net_history последних снимков: если подтвержденный
+снимок старше, следующий отправляется целиком (разность с пустой базой).
+
+Поврежденный снимок (не распаковывается или не разбирается) второй игрок
+отбрасывает, учитывает в статистике и до следующего полного снимка
+остальные снимки не применяет.
+
+Второй игрок хранит контрольные суммы своего состояния на тиках
+снимков: если сумма совпала, предсказание верно и снимок не применяется;
+иначе состояние восстанавливается из снимка, а тики, выполненные после
+него, повторяются с известным управлением. Маски ведущего хранятся по
+тикам, на которые они отмечены. Маску второго игрока ведущий применяет с
+тика, на котором получил ее, и сообщает этот тик (MSG_APPLIED), поэтому
+при повторе свои маски берутся так, как их применил ведущий; для тиков,
+до которых ведущий еще не дошел, - как они были нажаты.
+
+Для замера трафика и задержки на одной машине:
+    python netplay.py --ticks 2400
+"""
+import argparse
+import socket
+import struct
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+import pygame
+
+import savegame
+from replay import state_hash
+
+# Кадр сообщения: длина данных и тип.
+FRAME = struct.Struct('<IB')
+MSG_INPUT, MSG_SNAPSHOT, MSG_ACK, MSG_PING, MSG_PONG, MSG_APPLIED = range(1, 7)
+
+# Ввод (и подтверждение применения ввода второго игрока): тик и маска INPUT_*.
+INPUT = struct.Struct('<QB')
+# Снимок: номер, номер базового снимка, тик, длина тела, контрольная сумма, идет ли игра.
+SNAPSHOT = struct.Struct('<IIQII?')
+ACK = struct.Struct('<I')
+PING = struct.Struct('<d')
+
+
+def xor_delta(body, base):
+    """
+    Побайтовая разность двух тел снимков (короткое дополняется нулями).
+
+    Неизменившиеся байты дают нули, которые zlib сжимает почти до нуля.
+
+    :param:
+        body (bytes): Новое тело.
+        base (bytes): Базовое тело.
+    :return:
+        bytes: Разность длиной max(len(body), len(base)).
+    """
+    size = max(len(body), len(base))
+    a = np.frombuffer(body.ljust(size, b'\0'), np.uint8)
+    b = np.frombuffer(base.ljust(size, b'\0'), np.uint8)
+    return (a ^ b).tobytes()
+
+
+def mask_at(changes, base, tick):
+    """
+    Возвращает маску, действующую на тике.
+
+    :param:
+        changes (dict): Изменения маски: тик, с которого действует, -> маска.
+        base (int): Маска, действовавшая до самого раннего изменения.
+        tick (int): Тик.
+    :return:
+        int: Маска из последнего изменения, отмеченного не позже тика.
+    """
+    stamps = [key for key in changes if key <= tick]
+    if not stamps:
+        return base
+    return changes[max(stamps)]
+
+
+class NetSession():
+    """
+    Соединение двух игроков.
+
+    Args:
+        is_host (bool): Ведущий ли это игрок.
+        connected (bool): Открыто ли соединение.
+        peer_mask (int): Последняя маска управления другого игрока.
+        bytes_sent (int): Отправлено байт.
+        bytes_received (int): Получено байт.
+        ticks_run (int): Выполнено тиков с начала сеанса.
+        snapshots (int): Отправлено (получено) снимков.
+        corrections (int): Снимков, по которым второй игрок исправил состояние.
+        confirmed (int): Снимков, совпавших с предсказанием второго игрока.
+        dropped (int): Снимков, отброшенных вторым игроком: поврежденных и
+            пропущенных в ожидании полного снимка.
+    """
+
+    # Интервал ожидания событий в меню, чтобы продолжать принимать данные.
+    MENU_POLL_MS = 50
+    # Сколько хранить замеров задержки.
+    RTT_SAMPLES = 32
+
+    def __init__(self, ai_game, sock, is_host):
+        """
+        Инициализирует сеанс поверх установленного соединения.
+
+        :param:
+            ai_game (AlienInvasion): Игра.
+            sock (socket): Подключенный TCP-сокет.
+            is_host (bool): Ведущий ли это игрок.
+        """
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.is_host = is_host
+        self.sock = sock
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        self.connected = True
+
+        self.peer_mask = 0
+        self._sent_mask = None
+        self._recv = bytearray()
+        self._send = bytearray()
+
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.ticks_run = 0
+        self.snapshots = 0
+        self.corrections = 0
+        self.confirmed = 0
+        self.dropped = 0
+        self._snapshot_bytes = 0
+        self._body_bytes = 0
+        self._rtts = deque(maxlen=self.RTT_SAMPLES)
+
+        # Ведущий: номер последнего снимка, подтвержденная база и неподтвержденные тела.
+        self._snapshot_id = 0
+        self._acked = (0, b'')
+        self._history = {}
+        # Второй игрок: полученные тела, ожидается ли полный снимок, свои маски
+        # и контрольные суммы по тикам.
+        self._bodies = {0: b''}
+        self._need_full = False
+        self._own = {}
+        self._hashes = {}
+        # Второй игрок: изменения маски ведущего и своей маски в том виде, как
+        # ее применил ведущий (тик, с которого действует, -> маска), маски до
+        # самых ранних изменений и последний тик, выполненный ведущим.
+        self._peer_masks = {}
+        self._peer_base = 0
+        self._applied = {}
+        self._applied_base = 0
+        self._host_tick = 0
+
+    def exchange(self, mask):
+        """
+        Отправляет свою маску (если она изменилась) и возвращает общую.
+
+        Вызывается перед каждым тиком.
+
+        :param:
+            mask (int): Маска INPUT_* этого игрока.
+        :return:
+            int: Маска обоих игроков для тика.
+        """
+        tick = self.ai_game.ticks + 1
+        if mask != self._sent_mask:
+            self._queue(MSG_INPUT, INPUT.pack(tick, mask))
+            self._sent_mask = mask
+        if self.is_host:
+            return mask | self.peer_mask
+        self._own[tick] = mask
+        return mask | mask_at(self._peer_masks, self._peer_base, tick)
+
+    def _own_mask_at(self, tick):
+        """
+        Возвращает свою маску второго игрока на тике так, как ее применил ведущий.
+
+        :param:
+            tick (int): Тик.
+        :return:
+            int: Примененная маска, если ведущий уже выполнил тик, иначе нажатая.
+        """
+        if tick <= self._host_tick:
+            return mask_at(self._applied, self._applied_base, tick)
+        return self._own.get(tick, 0)
+
+    def after_tick(self):
+        """
+        Отправляет снимок (ведущий) или запоминает контрольную сумму
+        (второй игрок) и периодически измеряет задержку.
+        """
+        game = self.ai_game
+        self.ticks_run += 1
+        snapshot_tick = game.ticks % self.settings.net_snapshot_interval == 0
+        if self.is_host:
+            if snapshot_tick or not game.stats.game_active:
+                self._send_snapshot()
+        elif snapshot_tick:
+            self._hashes[game.ticks] = state_hash(game)
+
+        if self.ticks_run % (self.settings.tick_rate // 2) == 0:
+            self._queue(MSG_PING, PING.pack(time.perf_counter()))
+        self.flush()
+
+    def _send_snapshot(self):
+        """
+        Отправляет снимок как разность с последним подтвержденным.
+        """
+        game = self.ai_game
+        body = savegame.encode_body(savegame.capture(game))
+        self._snapshot_id += 1
+        if self._snapshot_id - self._acked[0] > self.settings.net_history:
+            # Подтвержденная база вышла из окна: снимок отправляется целиком.
+            self._acked = (0, b'')
+        base_id, base = self._acked
+        payload = zlib.compress(xor_delta(body, base))
+        self._queue(MSG_SNAPSHOT, SNAPSHOT.pack(
+            self._snapshot_id, base_id, game.ticks, len(body), state_hash(game),
+            game.stats.game_active) + payload)
+        self._history[self._snapshot_id] = body
+        self._history.pop(self._snapshot_id - self.settings.net_history, None)
+        self.snapshots += 1
+        self._snapshot_bytes += len(payload)
+        self._body_bytes += len(body)
+
+    def poll(self):
+        """
+        Принимает и обрабатывает все пришедшие сообщения.
+
+        :return:
+            bool: False, если соединение закрыто.
+        """
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b''
+            if not data:
+                self.connected = False
+                break
+            self._recv += data
+            self.bytes_received += len(data)
+
+        snapshots = []
+        while len(self._recv) >= FRAME.size:
+            size, kind = FRAME.unpack_from(self._recv)
+            if len(self._recv) < FRAME.size + size:
+                break
+            payload = bytes(self._recv[FRAME.size:FRAME.size + size])
+            del self._recv[:FRAME.size + size]
+            if kind != MSG_SNAPSHOT:
+                self._handle(kind, payload)
+                continue
+            # Снимки применяются после остальных сообщений: повтор тиков после
+            # снимка должен знать весь уже пришедший ввод. Снимок конца игры
+            # применяется сразу: ввод после него относится к следующей игре.
+            snapshots.append(payload)
+            if len(payload) >= SNAPSHOT.size and not SNAPSHOT.unpack_from(payload)[5]:
+                for snapshot in snapshots:
+                    self._apply_snapshot(snapshot)
+                snapshots = []
+        for payload in snapshots:
+            self._apply_snapshot(payload)
+        self.flush()
+        return self.connected
+
+    def _handle(self, kind, payload):
+        """
+        Обрабатывает одно сообщение.
+        """
+        if kind == MSG_INPUT:
+            tick, mask = INPUT.unpack(payload)
+            if self.is_host:
+                if mask != self.peer_mask:
+                    # Маска действует со следующего тика ведущего.
+                    self._queue(MSG_APPLIED, INPUT.pack(self.ai_game.ticks + 1, mask))
+            else:
+                self._peer_masks[tick] = mask
+                self._host_tick = max(self._host_tick, tick - 1)
+            self.peer_mask = mask
+        elif kind == MSG_APPLIED:
+            tick, mask = INPUT.unpack(payload)
+            self._applied[tick] = mask
+            self._host_tick = max(self._host_tick, tick - 1)
+        elif kind == MSG_ACK:
+            (snapshot_id,) = ACK.unpack(payload)
+            body = self._history.get(snapshot_id)
+            if body is not None:
+                self._acked = (snapshot_id, body)
+                self._history = {key: value for key, value in self._history.items()
+                                 if key > snapshot_id}
+        elif kind == MSG_PING:
+            self._queue(MSG_PONG, payload)
+        elif kind == MSG_PONG:
+            (sent,) = PING.unpack(payload)
+            self._rtts.append((time.perf_counter() - sent) * 1000)
+
+    def _decode_snapshot(self, payload):
+        """
+        Разбирает снимок ведущего.
+
+        :param:
+            payload (bytes): Данные сообщения MSG_SNAPSHOT.
+        :return:
+            tuple: (номер, номер базы, тик, тело, контрольная сумма, идет ли
+                игра, разобранный снимок).
+        :raises:
+            ValueError: Если базы нет или тело не совпадает с заголовком.
+            zlib.error: Если разность не распаковывается.
+            struct.error: Если заголовок или тело обрезаны.
+        """
+        snapshot_id, base_id, tick, size, checksum, active = SNAPSHOT.unpack_from(payload)
+        base = self._bodies.get(base_id)
+        if base is None:
+            raise ValueError(f"нет базового снимка {base_id}")
+        delta = zlib.decompress(payload[SNAPSHOT.size:])
+        if len(delta) < size:
+            raise ValueError(f"разность короче тела снимка: {len(delta)} < {size}")
+        body = xor_delta(delta, base)[:size]
+        state = savegame.decode_body(body)
+        return snapshot_id, base_id, tick, body, checksum, active, state
+
+    def _apply_snapshot(self, payload):
+        """
+        Восстанавливает снимок ведущего у второго игрока.
+
+        Поврежденный снимок отбрасывается; после него применяется только
+        полный снимок (без базы).
+        """
+        try:
+            snapshot_id, base_id, tick, body, checksum, active, state = \
+                self._decode_snapshot(payload)
+        except (ValueError, zlib.error, struct.error):
+            self.dropped += 1
+            self._need_full = True
+            return
+        if self._need_full and base_id != 0:
+            self.dropped += 1
+            return
+        self._need_full = False
+        self._host_tick = max(self._host_tick, tick)
+        # Тела старше окна ведущего базами уже не будут.
+        oldest = max(base_id, snapshot_id - self.settings.net_history)
+        self._bodies = {key: value for key, value in self._bodies.items()
+                        if key == 0 or key >= oldest}
+        self._bodies[snapshot_id] = body
+        self._queue(MSG_ACK, ACK.pack(snapshot_id))
+        self.snapshots += 1
+        self._snapshot_bytes += len(payload) - SNAPSHOT.size
+        self._body_bytes += len(body)
+
+        game = self.ai_game
+        was_active = game.stats.game_active
+        if was_active and active and self._hashes.get(tick) == checksum:
+            # Предсказание совпало с ведущим.
+            self.confirmed += 1
+        else:
+            self.corrections += 1
+            current = game.ticks
+            savegame.restore(game, state)
+            if was_active and active and 0 < current - tick <= self.settings.tick_rate:
+                self._resimulate(tick, current)
+            if not active:
+                game.stats.game_active = False
+        if was_active != active and not game.headless:
+            # Указатель мыши виден только в меню.
+            pygame.mouse.set_visible(not active)
+        if not active:
+            # Следующая игра начнется с нулевого тика: история прошлой не нужна.
+            self._own = {}
+            self._hashes = {}
+            self._peer_masks = {}
+            self._peer_base = self.peer_mask
+            self._applied = {}
+            self._applied_base = self._sent_mask or 0
+            self._host_tick = 0
+            return
+        self._peer_base = mask_at(self._peer_masks, self._peer_base, tick)
+        self._applied_base = mask_at(self._applied, self._applied_base, tick)
+        self._own = {key: value for key, value in self._own.items() if key > tick}
+        self._hashes = {key: value for key, value in self._hashes.items() if key > tick}
+        self._peer_masks = {key: value for key, value in self._peer_masks.items()
+                            if key > tick}
+        self._applied = {key: value for key, value in self._applied.items() if key > tick}
+
+    def _resimulate(self, tick, current):
+        """
+        Повторяет тики после снимка с известным управлением (без звука).
+
+        :param:
+            tick (int): Тик снимка.
+            current (int): Тик, до которого игра уже дошла.
+        """
+        game = self.ai_game
+        audio_enabled = game.audio.enabled
+        game.audio.enabled = False
+        for step_tick in range(tick + 1, current + 1):
+            game._apply_inputs(self._own_mask_at(step_tick)
+                               | mask_at(self._peer_masks, self._peer_base, step_tick))
+            game._update_world()
+            if step_tick % self.settings.net_snapshot_interval == 0:
+                self._hashes[step_tick] = state_hash(game)
+        game.audio.enabled = audio_enabled
+
+    def _queue(self, kind, payload):
+        """
+        Добавляет сообщение в буфер отправки.
+        """
+        frame = FRAME.pack(len(payload), kind) + payload
+        self._send += frame
+        self.bytes_sent += len(frame)
+
+    def flush(self):
+        """
+        Отправляет накопленные сообщения, не блокируя игру.
+        """
+        while self._send and self.connected:
+            try:
+                sent = self.sock.send(self._send)
+            except BlockingIOError:
+                return
+            except OSError:
+                self.connected = False
+                return
+            del self._send[:sent]
+
+    def close(self):
+        """
+        Закрывает соединение.
+        """
+        self.connected = False
+        self.sock.close()
+
+    def stats(self):
+        """
+        Возвращает статистику трафика и задержки.
+
+        Трафик пересчитывается на секунду игрового времени, поэтому не
+        зависит от того, идет ли игра в реальном времени или ускоренно.
+
+        :return:
+            dict: Байт в секунду в обе стороны, средний RTT (мс), количество
+                снимков, средний размер снимка в сети и без сжатия,
+                исправления и подтверждения предсказаний, отброшенные снимки.
+        """
+        seconds = max(self.ticks_run, 1) / self.settings.tick_rate
+        snapshots = max(self.snapshots, 1)
+        return {
+            "sent_per_second": self.bytes_sent / seconds,
+            "received_per_second": self.bytes_received / seconds,
+            "rtt_ms": sum(self._rtts) / len(self._rtts) if self._rtts else None,
+            "snapshots": self.snapshots,
+            "snapshot_bytes": self._snapshot_bytes / snapshots,
+            "body_bytes": self._body_bytes / snapshots,
+            "corrections": self.corrections,
+            "confirmed": self.confirmed,
+            "dropped": self.dropped,
+        }
+
+
+def host_game(ai_game, port, address='127.0.0.1', timeout=None):
+    """
+    Ждет подключения второго игрока.
+
+    :param:
+        ai_game (AlienInvasion): Игра ведущего.
+        port (int): Порт (0 - выбрать свободный).
+        address (str): Адрес, на котором принимаются подключения.
+        timeout (float): Сколько секунд ждать (по умолчанию
+            settings.net_accept_timeout).
+    :return:
+        NetSession: Сеанс ведущего.
+    :raises:
+        TimeoutError: Если второй игрок не подключился за timeout секунд.
+    """
+    if timeout is None:
+        timeout = ai_game.settings.net_accept_timeout
+    with socket.create_server((address, port)) as server:
+        server.settimeout(timeout)
+        conn, _ = server.accept()
+    return NetSession(ai_game, conn, is_host=True)
+
+
+def join_game(ai_game, address, port):
+    """
+    Подключается к ведущему.
+
+    :param:
+        ai_game (AlienInvasion): Игра второго игрока.
+        address (str): Адрес ведущего.
+        port (int): Порт ведущего.
+    :return:
+        NetSession: Сеанс второго игрока.
+    """
+    return NetSession(ai_game, socket.create_connection((address, port)), is_host=False)
+
+
+def main():
+    """
+    Проводит сетевую игру двух ботов через loopback и печатает статистику.
+    """
+    from alien_invasion import AlienInvasion
+    from sweep import bot_policy
+    from replay import INPUT_FIRE, input_mask
+
+    parser = argparse.ArgumentParser(description="Замер трафика сетевой игры через loopback")
+    parser.add_argument('--ticks', type=int, default=240 * 10, help="количество тиков")
+    parser.add_argument('--seed', type=int, default=1, help="зерно игры")
+    args = parser.parse_args()
+
+    host = AlienInvasion(headless=True)
+    guest = AlienInvasion(headless=True)
+    # Оба сеанса в одном процессе: подключение принимается после connect().
+    with socket.create_server(('127.0.0.1', 0)) as server:
+        client = socket.create_connection(server.getsockname())
+        conn, _ = server.accept()
+    host_session = NetSession(host, conn, is_host=True)
+    guest_session = NetSession(guest, client, is_host=False)
+
+    host.start_game(args.seed)
+    for tick in range(args.ticks):
+        # Второй игрок получает снимок предыдущего тика ведущего, находясь на том же тике.
+        guest_session.poll()
+        if guest.stats.game_active:
+            guest._apply_inputs(guest_session.exchange(INPUT_FIRE if tick % 120 < 10 else 0))
+            guest._update_world()
+            guest_session.after_tick()
+
+        if not host.stats.game_active:
+            host.start_game(args.seed + tick)
+        host_session.poll()
+        host._apply_inputs(host_session.exchange(input_mask(**bot_policy(host, tick))))
+        host._update_world()
+        host_session.after_tick()
+
+    # Последний снимок: состояния должны совпасть.
+    host_session._send_snapshot()
+    host_session.flush()
+    time.sleep(0.05)
+    guest_session.poll()
+    print(f"Состояния совпадают: {state_hash(host) == state_hash(guest)} "
+          f"(тик {host.ticks}, счет {host.stats.score})")
+    for name, session in (("host", host_session), ("guest", guest_session)):
+        stats = session.stats()
+        rtt = f"{stats['rtt_ms']:.2f}" if stats['rtt_ms'] is not None else "-"
+        print(f"{name:<6} отправлено {stats['sent_per_second']:,.0f} Б/с, "
+              f"получено {stats['received_per_second']:,.0f} Б/с, RTT {rtt} мс, "
+              f"снимков {stats['snapshots']} ({stats['snapshot_bytes']:.0f} из "
+              f"{stats['body_bytes']:.0f} Б), исправлений {stats['corrections']}, "
+              f"подтверждений {stats['confirmed']}, отброшено {stats['dropped']}")
+
+
+if __name__ == '__main__':
+    main()
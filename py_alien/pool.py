@@ -0,0 +1,87 @@
+class SpritePool():
+    """
+    Пул переиспользуемых спрайтов.
+
+    Вместо создания нового объекта на каждый выстрел или бонус спрайт
+    берется из списка свободных и переинициализируется методом reset().
+    Спрайты, покинувшие игру, возвращаются в пул через release().
+
+    Args:
+        hits (int): Количество выдач спрайтов из пула.
+        misses (int): Количество созданий новых спрайтов (пул был пуст).
+        releases (int): Количество возвратов спрайтов в пул.
+    """
+
+    def __init__(self, factory):
+        """
+        Инициализирует пустой пул.
+
+        :param:
+            factory (callable): Функция, создающая новый спрайт; получает те
+                же аргументы, что и метод reset() спрайта.
+        """
+        self._factory = factory
+        self._free = []
+        self._free_ids = set()
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+
+    def acquire(self, *args):
+        """
+        Выдает спрайт из пула или создает новый.
+
+        :param:
+            *args: Аргументы для reset() (или для factory при создании).
+        :return:
+            Sprite: Готовый к использованию спрайт.
+        """
+        if self._free:
+            sprite = self._free.pop()
+            self._free_ids.discard(id(sprite))
+            sprite.reset(*args)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        return self._factory(*args)
+
+    def release(self, sprite):
+        """
+        Убирает спрайт из всех групп и возвращает его в пул.
+
+        Повторный возврат того же спрайта игнорируется.
+
+        :param:
+            sprite (Sprite): Спрайт, покинувший игру.
+        """
+        sprite.kill()
+        if id(sprite) in self._free_ids:
+            return
+        self._free_ids.add(id(sprite))
+        self._free.append(sprite)
+        self.releases += 1
+
+    def release_all(self, group):
+        """
+        Возвращает в пул все спрайты группы.
+
+        :param:
+            group (Group): Группа, которая будет очищена.
+        """
+        for sprite in group.sprites():
+            self.release(sprite)
+
+    def stats(self):
+        """
+        Возвращает статистику пула.
+
+        :return:
+            dict: Выдачи из пула, промахи, возвраты и число свободных спрайтов.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "releases": self.releases,
+            "free": len(self._free),
+        }
@@ -0,0 +1,244 @@
+"""
+Встроенный профилировщик кадров.
+
+Время каждой фазы кадра (события, корабль, снаряды, коллизии, пришельцы,
+бонусы, отрисовка, панель, вывод на экран) накапливается за кадр и
+сохраняется в кольцевой буфер фиксированного размера. Буфер можно
+показать поверх игры (p50/p99 времени кадра и фаз) и выгрузить в формате
+Chrome trace (chrome://tracing, Perfetto) или CSV.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+from assets import assets
+
+# Фазы кадра в порядке выполнения.
+PHASES = ("events", "ship", "bullets", "collisions", "aliens", "bonuses",
+          "draw", "hud", "overlay", "present")
+(PHASE_EVENTS, PHASE_SHIP, PHASE_BULLETS, PHASE_COLLISIONS, PHASE_ALIENS,
+ PHASE_BONUSES, PHASE_DRAW, PHASE_HUD, PHASE_OVERLAY, PHASE_PRESENT) = range(len(PHASES))
+
+
+class FrameProfiler():
+    """
+    Профилировщик фаз кадра с кольцевым буфером.
+
+    Пока профилировщик выключен, mark() сразу возвращается, поэтому
+    замеры почти ничего не стоят.
+
+    Args:
+        enabled (bool): Ведется ли запись.
+        show_overlay (bool): Показывать ли статистику поверх игры.
+        capacity (int): Количество кадров в буфере.
+        frames (int): Количество записанных кадров (включая вытесненные).
+        extra_lines (list): Дополнительные строки для вывода на оверлее.
+    """
+
+    # Как часто (в кадрах) пересчитывается текст оверлея.
+    OVERLAY_REFRESH = 30
+
+    def __init__(self, capacity=600):
+        """
+        Инициализирует пустой буфер.
+
+        :param:
+            capacity (int): Количество последних кадров, хранящихся в буфере.
+        """
+        self.enabled = False
+        self.show_overlay = False
+        self.capacity = capacity
+        self.frames = 0
+        self.extra_lines = []
+
+        # Строка буфера: время начала кадра, фазы, полное время кадра (в секундах).
+        self._buffer = np.zeros((capacity, len(PHASES) + 2))
+        self._row = np.zeros(len(PHASES))
+        self._origin = time.perf_counter()
+        self._frame_start = self._origin
+        self._last = self._origin
+
+        self._font = None
+        self._overlay_image = None
+        self._overlay_age = 0
+
+    def toggle(self):
+        """
+        Включает или выключает запись вместе с оверлеем.
+        """
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self._overlay_image = None
+
+    def begin_frame(self):
+        """
+        Отмечает начало кадра.
+        """
+        if not self.enabled:
+            return
+        self._row[:] = 0.0
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """
+        Относит время, прошедшее с предыдущей отметки, к указанной фазе.
+
+        За кадр фаза может встретиться несколько раз (несколько логических
+        тиков); ее время суммируется.
+
+        :param:
+            phase (int): Индекс фазы (PHASE_*).
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._row[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """
+        Сохраняет накопленные времена фаз кадра в буфер.
+        """
+        if not self.enabled:
+            return
+        line = self._buffer[self.frames % self.capacity]
+        line[0] = self._frame_start - self._origin
+        line[1:-1] = self._row
+        line[-1] = self._last - self._frame_start
+        self.frames += 1
+
+    def samples(self):
+        """
+        Возвращает записанные кадры в хронологическом порядке.
+
+        :return:
+            ndarray: Строки (начало, фазы..., полное время) в секундах.
+        """
+        if self.frames <= self.capacity:
+            return self._buffer[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self._buffer[start:], self._buffer[:start]))
+
+    def summary(self):
+        """
+        Возвращает p50 и p99 времени кадра и каждой фазы.
+
+        :return:
+            dict: Имя фазы (и 'frame') -> (p50, p99) в миллисекундах.
+        """
+        data = self.samples()
+        if not len(data):
+            return {}
+        p50, p99 = np.percentile(data[:, 1:], (50, 99), axis=0) * 1000
+        names = PHASES + ("frame",)
+        return {name: (p50[i], p99[i]) for i, name in enumerate(names)}
+
+    def draw_overlay(self, screen):
+        """
+        Выводит статистику поверх кадра.
+
+        Текст пересчитывается раз в OVERLAY_REFRESH кадров, в остальных
+        кадрах выводится готовое изображение.
+
+        :param:
+            screen (Surface): Экран игры.
+        :return:
+            Rect: Область оверлея или None, если он не показывается.
+        """
+        if not self.show_overlay:
+            return None
+
+        self._overlay_age -= 1
+        if self._overlay_image is None or self._overlay_age <= 0:
+            self._overlay_image = self._render_overlay()
+            self._overlay_age = self.OVERLAY_REFRESH
+
+        rect = self._overlay_image.get_rect(bottomleft=(10, screen.get_height() - 10))
+        screen.blit(self._overlay_image, rect)
+        return rect
+
+    def _render_overlay(self):
+        """
+        Отрисовывает текст оверлея.
+
+        :return:
+            Surface: Изображение со строками статистики.
+        """
+        if self._font is None:
+            self._font = assets.font(22)
+
+        stats = self.summary()
+        lines = list(self.extra_lines)
+        if "frame" in stats:
+            p50, p99 = stats["frame"]
+            lines.append(f"frame  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+            for name in PHASES:
+                p50, p99 = stats[name]
+                lines.append(f"{name:<10} {p50:6.2f} / {p99:6.2f}")
+        else:
+            lines.append("profiler: no frames yet")
+
+        images = [self._font.render(line, True, (255, 255, 255), (0, 0, 0))
+                  for line in lines]
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        overlay = pygame.Surface((width, height))
+        y = 0
+        for image in images:
+            overlay.blit(image, (0, y))
+            y += image.get_height()
+        return overlay
+
+    def dump(self, path):
+        """
+        Сохраняет буфер в файл: .json - Chrome trace, иначе CSV.
+
+        :param:
+            path (str): Путь к файлу.
+        """
+        if path.endswith('.json'):
+            self.dump_chrome_trace(path)
+        else:
+            self.dump_csv(path)
+
+    def dump_chrome_trace(self, path):
+        """
+        Сохраняет буфер в формате Chrome trace.
+
+        Каждый кадр - событие 'frame', внутри него фазы выложены подряд
+        с суммарной за кадр длительностью.
+
+        :param:
+            path (str): Путь к файлу .json.
+        """
+        events = []
+        for line in self.samples():
+            start = line[0] * 1e6
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": round(start, 1), "dur": round(line[-1] * 1e6, 1)})
+            offset = start
+            for index, name in enumerate(PHASES):
+                duration = line[1 + index] * 1e6
+                if duration:
+                    events.append({"name": name, "ph": "X", "pid": 0, "tid": 0,
+                                   "ts": round(offset, 1), "dur": round(duration, 1)})
+                offset += duration
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def dump_csv(self, path):
+        """
+        Сохраняет буфер в CSV: по строке на кадр, времена в миллисекундах.
+
+        :param:
+            path (str): Путь к файлу .csv.
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(("start_ms",) + PHASES + ("frame_ms",))
+            for line in self.samples():
+                writer.writerow([f"{value * 1000:.4f}" for value in line])
@@ -0,0 +1,165 @@
+import pygame
+
+
+class Renderer():
+    """
+    Класс, выводящий готовый кадр на экран.
+
+    В обычном режиме экран каждый кадр заливается фоном целиком и
+    выводится через pygame.display.flip(). В режиме грязных прямоугольников
+    стираются только области, занятые спрайтами и панелью результатов на
+    прошлом кадре, а на экран передаются только изменившиеся области
+    через pygame.display.update(rects).
+
+    Спрайты выводятся слоями (корабль, снаряды, флот, бонусы): все пары
+    (изображение, позиция) слоя передаются одним вызовом Surface.blits.
+
+    Args:
+        screen (Surface): Экран игры.
+        settings (Settings): Настройки игры.
+        dirty_rects (bool): Включен ли режим грязных прямоугольников.
+        background (Surface): Кэшированный фон для стирания областей.
+        pixels_pushed (int): Количество пикселей, переданных на экран за последний кадр.
+        rects_pushed (int): Количество прямоугольников, переданных за последний кадр.
+        frame_pixels (int): Количество пикселей в полном кадре.
+        sprites_drawn (int): Количество спрайтов, выведенных в текущем кадре.
+        blit_calls (int): Количество вызовов Surface.blits в текущем кадре.
+    """
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует отрисовщик.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс.
+        """
+        self.screen = ai_game.screen
+        self.screen_rect = self.screen.get_rect()
+        self.settings = ai_game.settings
+        self.dirty_rects = self.settings.dirty_rect_rendering
+
+        self.background = None
+        self._erase_rects = []
+        self._prev_sprite_rects = []
+        self._prev_hud = {}
+
+        self.frame_pixels = self.screen_rect.width * self.screen_rect.height
+        self.pixels_pushed = 0
+        self.rects_pushed = 0
+        self.sprites_drawn = 0
+        self.blit_calls = 0
+
+    def begin_frame(self):
+        """
+        Готовит экран к отрисовке нового кадра.
+
+        В обычном режиме заливает экран фоном. В режиме грязных
+        прямоугольников восстанавливает фон только под прошлым кадром.
+        """
+        self.sprites_drawn = 0
+        self.blit_calls = 0
+        if not self.dirty_rects:
+            self.screen.fill(self.settings.bg_color)
+            return
+
+        if self.background is None:
+            self.background = pygame.Surface(self.screen_rect.size).convert(self.screen)
+            self.background.fill(self.settings.bg_color)
+            self.screen.blit(self.background, (0, 0))
+            # Первый кадр передается на экран целиком.
+            self._prev_sprite_rects = [self.screen_rect.copy()]
+            return
+
+        for rect in self._erase_rects:
+            self.screen.blit(self.background, rect, rect)
+
+    def draw_layer(self, items, bounds=None):
+        """
+        Выводит слой спрайтов одним вызовом Surface.blits.
+
+        :param:
+            items (list): Пары (изображение, позиция или прямоугольник).
+            bounds (Rect): Общая область слоя; если задана, в режиме грязных
+                прямоугольников она заменяет прямоугольники отдельных спрайтов.
+        :return:
+            list: Прямоугольники слоя для present() (в обычном режиме пустой).
+        """
+        if not items:
+            return []
+        self.sprites_drawn += len(items)
+        self.blit_calls += 1
+
+        if not self.dirty_rects:
+            # Полный кадр передается целиком, прямоугольники не нужны.
+            self.screen.blits(items, doreturn=False)
+            return []
+        if bounds is not None:
+            self.screen.blits(items, doreturn=False)
+            return [bounds]
+        return self.screen.blits(items)
+
+    def present(self, sprite_rects, hud_items=()):
+        """
+        Передает кадр на экран.
+
+        :param:
+            sprite_rects (list): Прямоугольники, занятые спрайтами в этом кадре.
+            hud_items (list): Пары (изображение, прямоугольник) панели результатов.
+        """
+        if not self.dirty_rects:
+            pygame.display.flip()
+            self.pixels_pushed = self.frame_pixels
+            self.rects_pushed = 1
+            return
+
+        hud = {}
+        for image, rect in hud_items:
+            hud[(rect.x, rect.y, rect.width, rect.height)] = image
+
+        # Область панели передается, только если ее изображение изменилось.
+        changed_hud = [pygame.Rect(key) for key, image in hud.items()
+                       if self._prev_hud.get(key) is not image]
+        vanished_hud = [pygame.Rect(key) for key in self._prev_hud if key not in hud]
+
+        rects = self._merge(self._prev_sprite_rects + sprite_rects
+                            + changed_hud + vanished_hud)
+        pygame.display.update(rects)
+        self.pixels_pushed = sum(rect.width * rect.height for rect in rects)
+        self.rects_pushed = len(rects)
+
+        # На следующем кадре стираются спрайты и вся панель результатов.
+        self._prev_sprite_rects = list(sprite_rects)
+        self._erase_rects = self._prev_sprite_rects + [pygame.Rect(key) for key in hud]
+        self._prev_hud = hud
+
+    def _merge(self, rects):
+        """
+        Обрезает прямоугольники по экрану и объединяет крупные перекрывающиеся.
+
+        Крупные области (полоса флота, панель результатов) на соседних кадрах
+        почти совпадают, поэтому их объединение не увеличивает число пикселей.
+
+        :param:
+            rects (list): Прямоугольники для передачи на экран.
+        :return:
+            list: Итоговый список прямоугольников.
+        """
+        merged = []
+        large = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not (rect.width and rect.height):
+                continue
+            if rect.width * rect.height < 4096:
+                merged.append(rect)
+                continue
+
+            for i, other in enumerate(large):
+                union = other.union(rect)
+                if (union.width * union.height
+                        <= other.width * other.height + rect.width * rect.height):
+                    large[i] = union
+                    break
+            else:
+                large.append(rect)
+        return merged + large
@@ -0,0 +1,237 @@
+"""
+Детерминированная запись и воспроизведение игровых сессий.
+
+Запись хранит зерно генератора случайных чисел, состояние управления на
+каждом тике (один байт) и контрольные суммы состояния мира. Воспроизведение
+прогоняет запись через ту же игровую логику в режиме headless с
+максимальной скоростью и сообщает о первом расхождении.
+
+Запуск: python replay.py session.airec
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+
+# Биты управления на одном тике.
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_FIRE = 4
+
+# Заголовок: сигнатура, версия, зерно, интервал контрольных сумм, число тиков.
+MAGIC = b'AIRC'
+VERSION = 2
+HEADER = struct.Struct('<4sBQHI')
+
+
+def input_mask(left=False, right=False, fire=False):
+    """
+    Упаковывает состояние управления в битовую маску.
+
+    :param:
+        left (bool): Движение влево.
+        right (bool): Движение вправо.
+        fire (bool): Выстрел.
+    :return:
+        int: Маска из битов INPUT_*.
+    """
+    return (INPUT_LEFT if left else 0) | (INPUT_RIGHT if right else 0) | (INPUT_FIRE if fire else 0)
+
+
+def state_hash(ai_game):
+    """
+    Вычисляет контрольную сумму состояния мира.
+
+    Учитываются корабль, флот, снаряды, бонусы, счет и настройки,
+    изменяющиеся в ходе игры.
+
+    :param:
+        ai_game (AlienInvasion): Игра.
+    :return:
+        int: CRC32 состояния.
+    """
+    ship = ai_game.ship
+    stats = ai_game.stats
+    settings = ai_game.settings
+    fleet = ai_game.aliens
+
+    # Счет может выйти за 64 бита, поэтому в сумму идут его младшие 64 бита.
+    crc = zlib.crc32(struct.pack(
+        '<iidQiiiib', ship.rect.x, ship.rect.y, ship.x, stats.score & 0xFFFFFFFFFFFFFFFF,
+        stats.level, stats.ships_left, settings.bullet_allowed, settings.fleet_diraction,
+        ship.shield_active))
+    crc = zlib.crc32(fleet.x.tobytes(), crc)
+    crc = zlib.crc32(fleet.y.tobytes(), crc)
+    crc = zlib.crc32(fleet.alive.tobytes(), crc)
+    if fleet.waves > 1:
+        crc = zlib.crc32(fleet.directions.tobytes(), crc)
+    for bullet in ai_game.bullets.spritedict:
+        crc = zlib.crc32(struct.pack('<id', bullet.rect.x, bullet.y), crc)
+    for bonus in ai_game.bonuses.spritedict:
+        crc = zlib.crc32(struct.pack('<ii', bonus.rect.x, bonus.rect.y), crc)
+        crc = zlib.crc32(bonus.bonus_type.encode(), crc)
+    return crc
+
+
+class SessionRecorder():
+    """
+    Запись сессии: зерно и управление на каждом тике.
+
+    Каждая игра сессии сохраняется в свой файл с номером: для path
+    'session.airec' это session_001.airec, session_002.airec и т.д. (первый
+    свободный номер), поэтому следующая игра не затирает предыдущую.
+
+    Args:
+        path (str): Шаблон имени файлов записи.
+        game_path (str): Файл последней сохраненной игры или None.
+        hash_interval (int): Через сколько тиков сохраняется контрольная сумма
+            состояния (0 - не сохранять).
+        seed (int): Зерно генератора случайных чисел записываемой игры.
+    """
+
+    def __init__(self, path, hash_interval=1):
+        """
+        Инициализирует пустую запись.
+
+        :param:
+            path (str): Шаблон имени файлов записи.
+            hash_interval (int): Интервал контрольных сумм в тиках.
+        """
+        self.path = path
+        self.game_path = None
+        self.hash_interval = hash_interval
+        self.seed = None
+        self._inputs = bytearray()
+        self._hashes = []
+
+    def begin(self, seed):
+        """
+        Начинает запись новой игры.
+
+        :param:
+            seed (int): Зерно генератора случайных чисел.
+        """
+        self.seed = seed
+        self._inputs = bytearray()
+        self._hashes = []
+
+    def record(self, mask, ai_game):
+        """
+        Записывает управление прошедшего тика и, при необходимости,
+        контрольную сумму состояния после него.
+
+        :param:
+            mask (int): Маска управления на тике.
+            ai_game (AlienInvasion): Игра.
+        """
+        if self.seed is None:
+            return
+        self._inputs.append(mask)
+        if self.hash_interval and len(self._inputs) % self.hash_interval == 0:
+            self._hashes.append(state_hash(ai_game))
+
+    def _next_path(self):
+        """
+        Возвращает первый свободный файл вида <имя>_NNN<расширение>.
+        """
+        root, ext = os.path.splitext(self.path)
+        number = 1
+        while os.path.exists(f"{root}_{number:03d}{ext}"):
+            number += 1
+        return f"{root}_{number:03d}{ext}"
+
+    def finish(self):
+        """
+        Сохраняет запись игры в новый файл и прекращает запись.
+        """
+        if self.seed is None:
+            return
+        self.game_path = self._next_path()
+        save_recording(self.game_path, self.seed, bytes(self._inputs), self._hashes,
+                       self.hash_interval)
+        self.seed = None
+
+
+def save_recording(path, seed, inputs, hashes, hash_interval):
+    """
+    Сохраняет запись в компактном двоичном формате.
+
+    :param:
+        path (str): Путь к файлу.
+        seed (int): Зерно генератора случайных чисел.
+        inputs (bytes): Маски управления по тикам.
+        hashes (list): Контрольные суммы состояния.
+        hash_interval (int): Интервал контрольных сумм в тиках.
+    """
+    body = inputs + struct.pack(f'<{len(hashes)}I', *hashes)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, seed, hash_interval, len(inputs)))
+        f.write(zlib.compress(body, 9))
+
+
+def load_recording(path):
+    """
+    Загружает запись из файла.
+
+    :param:
+        path (str): Путь к файлу.
+    :return:
+        tuple: (seed, inputs, hashes, hash_interval).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, version, seed, hash_interval, ticks = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: неизвестный формат записи")
+
+    body = zlib.decompress(data[HEADER.size:])
+    inputs = body[:ticks]
+    count = (len(body) - ticks) // 4
+    hashes = list(struct.unpack_from(f'<{count}I', body, ticks))
+    return seed, inputs, hashes, hash_interval
+
+
+def replay(path, ai_game=None):
+    """
+    Воспроизводит запись без отрисовки с максимальной скоростью.
+
+    :param:
+        path (str): Путь к записи.
+        ai_game (AlienInvasion): Игра в режиме headless; по умолчанию создается новая.
+    :return:
+        dict: Число тиков, время в секундах и первый тик расхождения (или None).
+    """
+    from alien_invasion import AlienInvasion
+
+    seed, inputs, hashes, hash_interval = load_recording(path)
+    if ai_game is None:
+        ai_game = AlienInvasion(headless=True)
+    ai_game.start_game(seed)
+
+    diverged_at = None
+    start = time.perf_counter()
+    for tick, mask in enumerate(inputs, 1):
+        ai_game.step(1, mask)
+        if hash_interval and tick % hash_interval == 0 and diverged_at is None:
+            expected = hashes[tick // hash_interval - 1]
+            if state_hash(ai_game) != expected:
+                diverged_at = tick
+    elapsed = time.perf_counter() - start
+
+    return {"ticks": len(inputs), "seconds": elapsed, "diverged_at": diverged_at}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit("Использование: python replay.py <файл записи>")
+
+    result = replay(sys.argv[1])
+    rate = result["ticks"] / result["seconds"] if result["seconds"] else 0.0
+    print(f"Тиков: {result['ticks']}, время: {result['seconds']:.3f} с, "
+          f"{rate:,.0f} тиков/с")
+    if result["diverged_at"] is None:
+        print("Расхождений нет.")
+    else:
+        print(f"Расхождение на тике {result['diverged_at']}.")
@@ -0,0 +1,438 @@
+"""
+Сохранение и загрузка полного состояния игры.
+
+Снимок включает статистику, изменяющиеся настройки, корабль и щит,
+координаты, маску живых пришельцев и волны флота, снаряды, бонусы и состояние
+генератора случайных чисел. Формат - компактный версионированный
+двоичный (struct + zlib), без pickle. Снимок снимается в основном
+потоке, а упаковка, сжатие и запись выполняются в фоновом потоке;
+файл записывается во временный и атомарно переименовывается.
+"""
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from bonus import BONUS_IMAGES
+
+MAGIC = b'AISV'
+VERSION = 4
+HEADER = struct.Struct('<4sBI')
+
+# Тики, уровень, жизни, щит (тик начала или -1), направление флота, лимит снарядов,
+# оставшиеся тики паузы после потери корабля.
+CORE = struct.Struct('<QIiqbII')
+# Коэффициенты скорости корабля, снарядов и пришельцев.
+FACTORS = struct.Struct('<ddd')
+# Корабль: x, rect.x, rect.y.
+SHIP = struct.Struct('<dii')
+# Флот: количество пришельцев, есть ли решетка, решетка.
+FLEET = struct.Struct('<I?iiii')
+# Снаряд: rect.x, y, ширина, высота.
+BULLET = struct.Struct('<idHH')
+# Бонус: тип, rect.x, rect.y.
+BONUS = struct.Struct('<Bii')
+
+BONUS_TYPES = tuple(BONUS_IMAGES)
+
+
+def _pack_int(value):
+    """
+    Упаковывает целое произвольной длины (счет и стоимость пришельца
+    растут без ограничения).
+    """
+    data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+    return struct.pack('<H', len(data)) + data
+
+
+def _unpack_int(data, offset):
+    """
+    Распаковывает целое, записанное _pack_int.
+
+    :return:
+        tuple: (значение, смещение после него).
+    """
+    (length,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    return int.from_bytes(data[offset:offset + length], 'little', signed=True), offset + length
+
+
+def capture(ai_game):
+    """
+    Снимает копию состояния игры.
+
+    Копируются только числа и массивы, поэтому снимок можно упаковывать
+    в другом потоке, пока игра продолжается.
+
+    :param:
+        ai_game (AlienInvasion): Игра.
+    :return:
+        dict: Снимок состояния.
+    """
+    settings = ai_game.settings
+    stats = ai_game.stats
+    ship = ai_game.ship
+    fleet = ai_game.aliens
+
+    shield_tick = -1
+    if ship.shield_active:
+        shield_tick = ship.shield_start_tick if ship.shield_start_tick is not None else -2
+
+    return {
+        "ticks": ai_game.ticks,
+        "level": stats.level,
+        "ships_left": stats.ships_left,
+        "score": stats.score,
+        "high_score": stats.high_score,
+        "shield_tick": shield_tick,
+        "fleet_direction": settings.fleet_diraction,
+        "bullet_allowed": settings.bullet_allowed,
+        "pause_ticks": ai_game.respawn_ticks_left(),
+        "alien_points": settings.alien_points,
+        "factors": (settings.ship_speed_factor, settings.bullet_speed_factor,
+                    settings.alien_speed_factor),
+        "ship": (ship.x, ship.rect.x, ship.rect.y),
+        "rng": ai_game.rng.getstate(),
+        "grid": fleet.grid,
+        "fleet_x": fleet.x.copy(),
+        "fleet_y": fleet.y.copy(),
+        "fleet_alive": fleet.alive.copy(),
+        "fleet_wave": fleet.wave.copy() if fleet.waves > 1 else None,
+        "fleet_directions": fleet.directions.copy(),
+        "bullets": [(bullet.rect.x, bullet.y, bullet.rect.width, bullet.rect.height)
+                    for bullet in ai_game.bullets.spritedict],
+        "bonuses": [(BONUS_TYPES.index(bonus.bonus_type), bonus.rect.x, bonus.rect.y)
+                    for bonus in ai_game.bonuses.spritedict],
+    }
+
+
+def encode(snapshot):
+    """
+    Упаковывает снимок в двоичный формат.
+
+    :param:
+        snapshot (dict): Снимок, полученный capture().
+    :return:
+        bytes: Содержимое файла сохранения.
+    """
+    body = encode_body(snapshot)
+    return HEADER.pack(MAGIC, VERSION, len(body)) + zlib.compress(body)
+
+
+def encode_body(snapshot):
+    """
+    Упаковывает снимок без заголовка и сжатия (используется и при
+    передаче состояния по сети).
+
+    :param:
+        snapshot (dict): Снимок, полученный capture().
+    :return:
+        bytes: Несжатое тело снимка.
+    """
+    parts = [
+        CORE.pack(snapshot["ticks"], snapshot["level"], snapshot["ships_left"],
+                  snapshot["shield_tick"], snapshot["fleet_direction"],
+                  snapshot["bullet_allowed"], snapshot["pause_ticks"]),
+        _pack_int(snapshot["score"]),
+        _pack_int(snapshot["high_score"]),
+        _pack_int(snapshot["alien_points"]),
+        FACTORS.pack(*snapshot["factors"]),
+        SHIP.pack(*snapshot["ship"]),
+    ]
+
+    # Состояние Mersenne Twister: 625 слов и отложенное значение gauss.
+    version, words, gauss_next = snapshot["rng"]
+    parts.append(struct.pack('<B625I?d', version, *words, gauss_next is not None,
+                             gauss_next or 0.0))
+
+    grid = snapshot["grid"]
+    count = len(snapshot["fleet_x"])
+    parts.append(FLEET.pack(count, grid is not None, *(grid or (0, 0, 0, 0))))
+    parts.append(snapshot["fleet_x"].astype('<f8').tobytes())
+    parts.append(snapshot["fleet_y"].astype('<f8').tobytes())
+    parts.append(np.packbits(snapshot["fleet_alive"]).tobytes())
+    # Волны флота (режим нагрузки): их направления и номер волны каждого пришельца.
+    directions = snapshot["fleet_directions"]
+    parts.append(struct.pack('<I', len(directions)))
+    parts.append(directions.astype('<i1').tobytes())
+    if snapshot["fleet_wave"] is not None:
+        parts.append(snapshot["fleet_wave"].astype('<u4').tobytes())
+
+    parts.append(struct.pack('<I', len(snapshot["bullets"])))
+    parts.extend(BULLET.pack(*bullet) for bullet in snapshot["bullets"])
+    parts.append(struct.pack('<I', len(snapshot["bonuses"])))
+    parts.extend(BONUS.pack(*bonus) for bonus in snapshot["bonuses"])
+    return b''.join(parts)
+
+
+def decode(data):
+    """
+    Распаковывает файл сохранения в снимок.
+
+    :param:
+        data (bytes): Содержимое файла.
+    :return:
+        dict: Снимок состояния.
+    :raises:
+        ValueError: Если файл поврежден или имеет другую версию формата.
+    """
+    try:
+        magic, version, size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("неизвестный формат сохранения")
+        body = zlib.decompress(data[HEADER.size:])
+        if len(body) != size:
+            raise ValueError("поврежденное сохранение")
+    except (struct.error, zlib.error) as error:
+        raise ValueError(f"поврежденное сохранение: {error}") from error
+    return decode_body(body)
+
+
+def decode_body(body):
+    """
+    Распаковывает тело снимка, записанное encode_body().
+
+    :param:
+        body (bytes): Несжатое тело снимка.
+    :return:
+        dict: Снимок состояния.
+    :raises:
+        ValueError: Если данные повреждены.
+    """
+    try:
+        return _decode_body(body)
+    except struct.error as error:
+        raise ValueError(f"поврежденное сохранение: {error}") from error
+
+
+def _decode_body(body):
+    """
+    Разбирает поля тела снимка по порядку.
+    """
+    snapshot = {}
+    (snapshot["ticks"], snapshot["level"], snapshot["ships_left"], snapshot["shield_tick"],
+     snapshot["fleet_direction"], snapshot["bullet_allowed"],
+     snapshot["pause_ticks"]) = CORE.unpack_from(body)
+    offset = CORE.size
+    snapshot["score"], offset = _unpack_int(body, offset)
+    snapshot["high_score"], offset = _unpack_int(body, offset)
+    snapshot["alien_points"], offset = _unpack_int(body, offset)
+    snapshot["factors"] = FACTORS.unpack_from(body, offset)
+    offset += FACTORS.size
+    snapshot["ship"] = SHIP.unpack_from(body, offset)
+    offset += SHIP.size
+
+    rng = struct.unpack_from('<B625I?d', body, offset)
+    offset += struct.calcsize('<B625I?d')
+    snapshot["rng"] = (rng[0], rng[1:626], rng[627] if rng[626] else None)
+
+    count, has_grid, *grid = FLEET.unpack_from(body, offset)
+    offset += FLEET.size
+    snapshot["grid"] = tuple(grid) if has_grid else None
+    snapshot["fleet_x"] = np.frombuffer(body, '<f8', count, offset).astype(np.float64)
+    offset += 8 * count
+    snapshot["fleet_y"] = np.frombuffer(body, '<f8', count, offset).astype(np.float64)
+    offset += 8 * count
+    packed = np.frombuffer(body, np.uint8, (count + 7) // 8, offset)
+    snapshot["fleet_alive"] = np.unpackbits(packed)[:count].astype(bool)
+    offset += (count + 7) // 8
+    (waves,) = struct.unpack_from('<I', body, offset)
+    offset += 4
+    snapshot["fleet_directions"] = np.frombuffer(body, '<i1', waves, offset).astype(np.int64)
+    offset += waves
+    snapshot["fleet_wave"] = None
+    if waves > 1:
+        snapshot["fleet_wave"] = np.frombuffer(body, '<u4', count, offset).astype(np.int64)
+        offset += 4 * count
+
+    (bullets,) = struct.unpack_from('<I', body, offset)
+    offset += 4
+    snapshot["bullets"] = list(BULLET.iter_unpack(body[offset:offset + bullets * BULLET.size]))
+    offset += bullets * BULLET.size
+    (bonuses,) = struct.unpack_from('<I', body, offset)
+    offset += 4
+    snapshot["bonuses"] = list(BONUS.iter_unpack(body[offset:offset + bonuses * BONUS.size]))
+    return snapshot
+
+
+def restore(ai_game, snapshot):
+    """
+    Восстанавливает мир игры из снимка за один проход.
+
+    :param:
+        ai_game (AlienInvasion): Игра.
+        snapshot (dict): Снимок состояния.
+    """
+    settings = ai_game.settings
+    stats = ai_game.stats
+    ship = ai_game.ship
+
+    # Таймеры прежней игры отменяются, нужные планируются заново.
+    ai_game.scheduler.clear()
+    ai_game.ticks = snapshot["ticks"]
+    stats.level = snapshot["level"]
+    stats.ships_left = snapshot["ships_left"]
+    stats.score = snapshot["score"]
+    stats.high_score = max(stats.high_score, snapshot["high_score"])
+    stats.game_active = True
+
+    settings.fleet_diraction = snapshot["fleet_direction"]
+    settings.bullet_allowed = snapshot["bullet_allowed"]
+    settings.alien_points = snapshot["alien_points"]
+    (settings.ship_speed_factor, settings.bullet_speed_factor,
+     settings.alien_speed_factor) = snapshot["factors"]
+
+    ship.x, ship.rect.x, ship.rect.y = snapshot["ship"]
+    ship.prev_pos = ship.rect.topleft
+    shield_tick = snapshot["shield_tick"]
+    ship.deactivate_shield()
+    if shield_tick >= 0:
+        ship.activate_shield(shield_tick)
+    elif shield_tick == -2:
+        # Щит без срока действия.
+        ship.shield_active = True
+    ship.moving_left = ship.moving_right = False
+
+    ai_game.aliens.spawn(snapshot["fleet_x"], snapshot["fleet_y"], snapshot["grid"],
+                         snapshot["fleet_alive"], snapshot["fleet_wave"],
+                         snapshot["fleet_directions"])
+
+    ai_game.bullet_pool.release_all(ai_game.bullets)
+    for x, y, width, height in snapshot["bullets"]:
+        bullet = ai_game.bullet_pool.acquire()
+        bullet.rect.size = (width, height)
+        # Изображение пула создано под размер по умолчанию: берется под сохраненный.
+        bullet.image = bullet.assets.rect(bullet.rect.size, bullet.color)
+        bullet.rect.x = x
+        bullet.y = bullet.prev_y = y
+        bullet.rect.y = y
+        ai_game.bullets.add(bullet)
+
+    # Бонусы при создании выбирают случайную позицию, поэтому состояние
+    # генератора восстанавливается после них.
+    ai_game.bonus_pool.release_all(ai_game.bonuses)
+    for type_index, x, y in snapshot["bonuses"]:
+        bonus = ai_game.bonus_pool.acquire(BONUS_TYPES[type_index])
+        bonus.rect.topleft = (x, y)
+        bonus.prev_pos = bonus.rect.topleft
+        ai_game.bonuses.add(bonus)
+
+    ai_game.rng.setstate(snapshot["rng"])
+
+    ai_game.respawn_pause = False
+    if snapshot["pause_ticks"]:
+        ai_game.start_respawn_pause(snapshot["pause_ticks"])
+
+    ai_game.sb.prep_score()
+    ai_game.sb.prep_high_score()
+    ai_game.sb.prep_level()
+    ai_game.sb.prep_ships()
+
+
+def write_atomic(path, data):
+    """
+    Записывает файл через временный файл и атомарное переименование.
+
+    При сбое во время записи прежнее сохранение остается целым.
+
+    :param:
+        path (str): Путь к файлу.
+        data (bytes): Содержимое.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SaveManager():
+    """
+    Неблокирующее сохранение и загрузка игры.
+
+    Args:
+        path (str): Файл сохранения.
+        last_error (Exception): Ошибка последнего фонового сохранения или None.
+        saves (int): Количество завершенных сохранений.
+    """
+
+    def __init__(self, ai_game, path="savefile.sav"):
+        """
+        Инициализирует менеджер сохранений.
+
+        :param:
+            ai_game (AlienInvasion): Игра.
+            path (str): Файл сохранения.
+        """
+        self.ai_game = ai_game
+        self.path = path
+        self.last_error = None
+        self.saves = 0
+        self._thread = None
+
+    @property
+    def pending(self):
+        """
+        True, если фоновое сохранение еще выполняется.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def save(self):
+        """
+        Снимает состояние игры и сохраняет его в фоновом потоке.
+
+        :return:
+            Thread: Поток записи.
+        """
+        snapshot = capture(self.ai_game)
+        # Сохранения записываются по порядку: новое ждет окончания предыдущего.
+        previous = self._thread
+        self._thread = threading.Thread(target=self._write, args=(snapshot, previous),
+                                        daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _write(self, snapshot, previous):
+        """
+        Упаковывает и записывает снимок (выполняется в фоновом потоке).
+        """
+        if previous is not None:
+            previous.join()
+        try:
+            write_atomic(self.path, encode(snapshot))
+            self.saves += 1
+            self.last_error = None
+        except OSError as error:
+            self.last_error = error
+
+    def wait(self):
+        """
+        Дожидается окончания фонового сохранения.
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def load(self):
+        """
+        Загружает сохранение и восстанавливает игру.
+
+        :return:
+            bool: True, если игра восстановлена.
+        """
+        # Загрузка не должна прочитать файл, который еще пишется.
+        self.wait()
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = decode(f.read())
+        except FileNotFoundError:
+            print("Файл сохранения не найден.")
+            return False
+        except ValueError as error:
+            print(f"Не удалось загрузить сохранение: {error}")
+            return False
+
+        restore(self.ai_game, snapshot)
+        return True
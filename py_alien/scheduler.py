@@ -0,0 +1,109 @@
+import heapq
+import itertools
+
+
+class Timer():
+    """
+    Запланированный вызов.
+
+    Args:
+        due (int): Логический тик, на котором выполняется вызов.
+        callback (callable): Вызываемая функция.
+        args (tuple): Аргументы вызова.
+        cancelled (bool): Отменен ли вызов.
+    """
+
+    def __init__(self, due, callback, args):
+        """
+        Инициализирует вызов.
+        """
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Отменяет вызов, если он еще не выполнен.
+        """
+        self.cancelled = True
+
+
+class Scheduler():
+    """
+    Планировщик игрового времени на основе кучи.
+
+    Время отсчитывается в логических тиках игры, а не по часам, поэтому
+    паузы и таймеры работают одинаково в окне, в режиме headless и при
+    ускоренной симуляции и не блокируют цикл игры.
+
+    Args:
+        tick_rate (int): Количество тиков в секунде игрового времени.
+        fired (int): Количество выполненных вызовов.
+    """
+
+    def __init__(self, ai_game):
+        """
+        Инициализирует пустой планировщик.
+
+        :param:
+            ai_game (object): Ссылка на основной игровой класс (счетчик тиков).
+        """
+        self.ai_game = ai_game
+        self.tick_rate = ai_game.settings.tick_rate
+        self.fired = 0
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, delay, callback, *args):
+        """
+        Планирует вызов через заданное число тиков.
+
+        :param:
+            delay (int): Задержка в тиках (не меньше 1).
+            callback (callable): Вызываемая функция.
+            *args: Аргументы вызова.
+        :return:
+            Timer: Вызов, который можно отменить.
+        """
+        timer = Timer(self.ai_game.ticks + max(1, delay), callback, args)
+        heapq.heappush(self._heap, (timer.due, next(self._sequence), timer))
+        return timer
+
+    def after(self, seconds, callback, *args):
+        """
+        Планирует вызов через заданное игровое время.
+
+        :param:
+            seconds (float): Задержка в секундах игрового времени.
+            callback (callable): Вызываемая функция.
+            *args: Аргументы вызова.
+        :return:
+            Timer: Вызов, который можно отменить.
+        """
+        return self.schedule(round(seconds * self.tick_rate), callback, *args)
+
+    def run(self, tick):
+        """
+        Выполняет все вызовы, срок которых наступил, в порядке планирования.
+
+        :param:
+            tick (int): Текущий логический тик.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= tick:
+            timer = heapq.heappop(heap)[2]
+            if not timer.cancelled:
+                self.fired += 1
+                timer.callback(*timer.args)
+
+    def clear(self):
+        """
+        Отменяет все запланированные вызовы.
+        """
+        for entry in self._heap:
+            entry[2].cancel()
+        self._heap.clear()
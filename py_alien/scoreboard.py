@@ -1,13 +1,17 @@
-import pygame.font
-from pygame.sprite import Group
+import time
 
-from ship import Ship
+import pygame
 
 class Scoreboard():
     """
         Класс для вывода игровой информации, включая текущий счет, рекорды,
     уровень и количество оставшихся кораблей.
 
+        Надписи и цифры отрисовываются шрифтом один раз (атлас глифов), а
+    значения собираются из готовых глифов. Методы prep_* только помечают
+    элементы как устаревшие; все изменения за кадр применяются одной
+    перекомпоновкой в show_score, и панель выводится на экран одним blit.
+
         Args:
             ai_game (object): Ссылка на экземпляр основного игрового класса.
             screen (Surface): Экран, на котором будет отображаться информация.
@@ -23,9 +27,19 @@ class Scoreboard():
             high_score_rect (Rect): Прямоугольник для размещения рекорда.
             level_image (Surface): Изображение уровня.
             level_rect (Rect): Прямоугольник для размещения уровня.
-            ships (Group): Группа кораблей, представляющих оставшиеся жизни игрока.
+            ships_image (Surface): Полоса значков оставшихся кораблей.
+            ships_rect (Rect): Прямоугольник для размещения полосы кораблей.
+            hud_image (Surface): Скомпонованная панель со всеми элементами.
+            hud_rect (Rect): Прямоугольник для размещения панели.
+            font_renders (int): Общее количество вызовов font.render.
+            font_renders_per_second (int): Вызовы font.render за последнюю секунду.
+            refresh_interval (int): Минимальный интервал между перекомпоновками
+                панели в миллисекундах (0 - без ограничения).
     """
 
+    # Цвет прозрачности скомпонованной панели.
+    HUD_COLORKEY = (255, 0, 255)
+
     def __init__(self, ai_game):
         """
         Инициализирует атрибуты подсчета очков и подготавливает
@@ -40,51 +54,193 @@ class Scoreboard():
 
         # Настройка шрифта для вывода счета.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(48)
+
+        # Счетчики вызовов font.render.
+        self.font_renders = 0
+        self.font_renders_per_second = 0
+        self._renders_window_start = self._now()
+        self._renders_window_count = 0
+
+        # Атлас глифов: надписи и символы чисел отрисовываются один раз.
+        self._labels = {
+            "score": self._render("Счет: "),
+            "high_score": self._render("Рекорд: "),
+            "level": self._render("Уровень: "),
+        }
+        self._glyphs = {char: self._render(char) for char in "0123456789,"}
+        self._ship_icon = ai_game.assets.image('ship.bmp')
+
+        self.hud_image = None
+        self.hud_rect = None
+        self._dirty = set()
+        self.refresh_interval = 0
+        self._last_refresh = 0
 
         # Подготовка изображений счетов.
         self.prep_score()
         self.prep_high_score()
         self.prep_level()
         self.prep_ships()
+        self._refresh()
 
-    def prep_score(self):
+    @staticmethod
+    def _now():
+        """
+        Возвращает монотонное время в миллисекундах (не требует инициализации
+        таймера pygame).
+        """
+        return time.monotonic() * 1000
+
+    def _render(self, text):
+        """
+        Отрисовывает текст шрифтом панели и учитывает вызов в счетчике.
+
+        :param:
+            text (str): Текст для отрисовки.
+        :return:
+            Surface: Изображение текста.
+        """
+        self.font_renders += 1
+        self._renders_window_count += 1
+        return self.font.render(text, True, self.text_color, self.bg_color)
+
+    def _compose_text(self, label, value):
         """
-        Преобразует текущий счет в графическое изображение и устанавливает
-        его позицию на экране.
+        Собирает изображение "надпись + число" из атласа глифов.
+
+        :param:
+            label (str): Ключ надписи в атласе.
+            value (str): Строка из цифр и запятых.
+        :return:
+            Surface: Готовое изображение.
         """
-        rounded_score = round(self.stats.score, -1)
-        score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(f"Счет: {score_str}", True, self.text_color, self.settings.bg_color)
+        parts = [self._labels[label]] + [self._glyphs[char] for char in value]
+        width = sum(part.get_width() for part in parts)
+        height = max(part.get_height() for part in parts)
 
-        # Вывод счета в правой верхней части экрана.
-        self.score_rect = self.score_image.get_rect()
-        self.score_rect.right = self.screen_rect.right - 20
-        self.score_rect.top = 20
+        image = pygame.Surface((width, height))
+        image.fill(self.bg_color)
+        x = 0
+        for part in parts:
+            image.blit(part, (x, 0))
+            x += part.get_width()
+        return image
+
+    def prep_score(self):
+        """
+        Помечает изображение текущего счета для перекомпоновки.
+        """
+        self._dirty.add("score")
 
     def prep_high_score(self):
         """
-        Преобразует рекордный счет в графическое изображение
-        и устанавливает его позицию на экране.
+        Помечает изображение рекорда для перекомпоновки.
         """
-        high_score = round(self.stats.high_score, -1)
-        high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(f"Рекорд: {high_score_str}", True, self.text_color, self.settings.bg_color)
+        self._dirty.add("high_score")
 
-        # Рекорд выравнивается по центру верхний стороны.
-        self.high_score_rect = self.high_score_image.get_rect()
-        self.high_score_rect.centerx = self.screen_rect.centerx
-        self.high_score_rect.top = self.screen_rect.top
+    def prep_level(self):
+        """
+        Помечает изображение уровня для перекомпоновки.
+        """
+        self._dirty.add("level")
+
+    def prep_ships(self):
+        """
+        Помечает полосу оставшихся кораблей для перекомпоновки.
+        """
+        self._dirty.add("ships")
+
+    def _refresh(self):
+        """
+        Применяет все накопленные изменения одной перекомпоновкой панели.
+        """
+        if not self._dirty:
+            return
+        dirty = self._dirty
+
+        if "score" in dirty:
+            # Вывод счета в правой верхней части экрана.
+            rounded_score = round(self.stats.score, -1)
+            self.score_image = self._compose_text("score", "{:,}".format(rounded_score))
+            self.score_rect = self.score_image.get_rect()
+            self.score_rect.right = self.screen_rect.right - 20
+            self.score_rect.top = 20
+
+        if "high_score" in dirty:
+            # Рекорд выравнивается по центру верхний стороны.
+            high_score = round(self.stats.high_score, -1)
+            self.high_score_image = self._compose_text("high_score", "{:,}".format(high_score))
+            self.high_score_rect = self.high_score_image.get_rect()
+            self.high_score_rect.centerx = self.screen_rect.centerx
+            self.high_score_rect.top = self.screen_rect.top
+
+        if "level" in dirty or "score" in dirty:
+            # Уровень выводится под счетом.
+            if "level" in dirty:
+                self.level_image = self._compose_text("level", str(self.stats.level))
+            self.level_rect = self.level_image.get_rect()
+            self.level_rect.right = self.score_rect.right
+            self.level_rect.top = self.score_rect.bottom + 10
+
+        if "ships" in dirty:
+            # Значки кораблей собираются из одного общего изображения.
+            icon_width, icon_height = self._ship_icon.get_size()
+            count = max(self.stats.ships_left, 0)
+            self.ships_image = pygame.Surface((max(count * icon_width, 1), icon_height))
+            self.ships_image.fill(self.HUD_COLORKEY)
+            for ship_number in range(count):
+                self.ships_image.blit(self._ship_icon, (ship_number * icon_width, 0))
+            self.ships_image.set_colorkey(self.HUD_COLORKEY)
+            self.ships_rect = self.ships_image.get_rect(topleft=(10, 10))
+
+        self._compose_hud()
+        self._dirty = set()
+
+    def _compose_hud(self):
+        """
+        Собирает все элементы панели на одну поверхность с цветовым ключом.
+        """
+        items = self._items()
+        self.hud_rect = items[0][1].unionall([rect for image, rect in items[1:]])
+        self.hud_image = pygame.Surface(self.hud_rect.size)
+        self.hud_image.fill(self.HUD_COLORKEY)
+        for image, rect in items:
+            self.hud_image.blit(image, rect.move(-self.hud_rect.x, -self.hud_rect.y))
+        self.hud_image.set_colorkey(self.HUD_COLORKEY, pygame.RLEACCEL)
+
+    def _items(self):
+        """
+        Возвращает элементы панели парами (изображение, прямоугольник).
+        """
+        return [(self.score_image, self.score_rect),
+                (self.high_score_image, self.high_score_rect),
+                (self.level_image, self.level_rect),
+                (self.ships_image, self.ships_rect)]
 
     def show_score(self):
         """
         Отображает текущий счет, рекорд, уровень и количество оставшихся
         кораблей на экране.
+
+        :return:
+            list: Элементы панели парами (изображение, прямоугольник).
         """
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+        now = self._now()
+        # Ограничение частоты действует только во время игры: в меню панель
+        # перерисовывается редко и должна показывать итоговый счет.
+        if (not self.stats.game_active
+                or now - self._last_refresh >= self.refresh_interval):
+            self._refresh()
+            self._last_refresh = now
+        self.screen.blit(self.hud_image, self.hud_rect)
+
+        if now - self._renders_window_start >= 1000:
+            self.font_renders_per_second = self._renders_window_count
+            self._renders_window_count = 0
+            self._renders_window_start = now
+
+        return self._items()
 
     def check_high_score(self):
         """
@@ -93,28 +249,3 @@ class Scoreboard():
         if self.stats.score > self.stats.high_score:
             self.stats.high_score = self.stats.score
             self.prep_high_score()
-
-    def prep_level(self):
-        """
-        Преобразует уровень в графическое изображение и устанавливает его
-        позицию на экране.
-        """
-        level_str = str(self.stats.level)
-        self.level_image = self.font.render(f"Уровень: {level_str}", True, self.text_color, self.bg_color)
-
-        # Убедитесь, что rect правильно установлен
-        self.level_rect = self.level_image.get_rect()
-        self.level_rect.right = self.score_rect.right
-        self.level_rect.top = self.score_rect.bottom + 10
-
-    def prep_ships(self):
-        """
-        Создает графическое представление оставшихся кораблей и
-        добавляет их в группу.
-        """
-        self.ships = Group()
-        for ship_number in range(self.stats.ships_left):
-            self.ship = Ship(self.ai_game)
-            self.ship.rect.x = 10 + ship_number * self.ship.rect.width
-            self.ship.rect.y = 10
-            self.ships.add(self.ship)
\ No newline at end of file
@@ -8,6 +8,8 @@ class Settings():
         bg_color (tuple): Цвет фона игры в формате RGB.
         ship_speed (float): Скорость перемещения корабля.
         ship_limit (int): Максимальное количество кораблей, доступных игроку.
+        shield_duration (int): Длительность щита в секундах игрового времени.
+        respawn_pause (float): Пауза после потери корабля в секундах игрового времени.
         bullet_speed (float): Скорость снарядов.
         bullet_width (int): Ширина снаряда.
         bullet_height (int): Высота снаряда.
@@ -16,12 +18,44 @@ class Settings():
         alien_speed (float): Скорость перемещения пришельцев.
         fleet_drop_speed (int): Скорость, с которой пришельцы опускаются вниз.
         fleet_direction (int): Направление движения флота пришельцев (1 для вправо, -1 для влево).
+        bonus_drop_chance (float): Вероятность появления бонуса при уничтожении пришельцев.
         speedup_scale (float): Темп увеличения скорости игры.
         score_scale (float): Темп увеличения стоимости пришельцев.
-        ship_speed_factor (float): Фактор изменения скорости корабля во время игры.
-        bullet_speed_factor (float): Фактор изменения скорости снарядов во время игры.
-        alien_speed_factor (float): Фактор изменения скорости пришельцев во время игры.
+        ship_speed_factor (float): Множитель ship_speed, растущий с уровнем.
+        bullet_speed_factor (float): Множитель bullet_speed, растущий с уровнем.
+        alien_speed_factor (float): Множитель alien_speed, растущий с уровнем.
         alien_points (int): Количество очков, получаемых за уничтожение пришельца.
+        tick_rate (int): Частота логических тиков симуляции в секунду.
+        fps_limit (int): Максимальная частота отрисовки кадров.
+        max_frame_time (float): Максимальное время кадра (в секундах), которое
+            учитывается симуляцией; защищает от лавины тиков после зависания.
+        dirty_rect_rendering (bool): Выводить на экран только изменившиеся
+            области вместо полного кадра.
+        audio_frequency (int): Частота дискретизации микшера.
+        audio_buffer (int): Размер буфера микшера в сэмплах (меньше - ниже задержка).
+        max_voices (int): Максимальное число одновременно звучащих звуков.
+        target_frame_ms (float): Бюджет времени работы кадра в миллисекундах.
+        quality_level (int): Начальная ступень качества (0 - полное, 3 - минимальное).
+        adaptive_quality (bool): Менять ступень качества по времени кадра.
+        autofire_rate (float): Выстрелов в секунду при удержании клавиши огня
+            (0 - один выстрел на нажатие).
+        bonus_limit (int): Максимальное количество бонусов на экране.
+        net_port (int): Порт сетевой игры.
+        net_snapshot_interval (int): Интервал снимков состояния в сетевой игре (в тиках).
+        net_history (int): Сколько последних снимков ведущий хранит как базы
+            разностей; если подтвержден более старый, снимок отправляется целиком.
+        net_accept_timeout (float): Сколько секунд ведущий ждет подключения.
+        capture_path (str): Каталог записей кадров; каждая запись (F5 -
+            начать/остановить) пишется в свой подкаталог take_NNN.
+        capture_format (str): Формат записи кадров: 'png' или 'raw'.
+        capture_every (int): Записывать каждый capture_every-й кадр.
+        capture_queue (int): Количество кадров, ожидающих записи на диск.
+        leaderboard_path (str): Файл базы SQLite с таблицей рекордов.
+        leaderboard_size (int): Количество лучших игр на экране окончания игры.
+        stress_mode (bool): Режим нагрузки: флот задается stress_fleet_columns x
+            stress_fleet_rows независимо от размера экрана, состоит из
+            stress_waves волн со своими направлениями, а лимиты снарядов и
+            бонусов подняты до stress_bullet_allowed и stress_bonus_limit.
     """
 
     def __init__(self):
@@ -33,22 +67,72 @@ class Settings():
         self.screen_height = 750
         self.bg_color = (70, 130, 180)
 
+        # Темп игры: скорости ниже заданы в пикселях за тик.
+        self.tick_rate = 240
+        self.fps_limit = 60
+        self.max_frame_time = 0.25
+
+        # Вывод на экран только изменившихся областей.
+        self.dirty_rect_rendering = False
+
+        # Параметры звука
+        self.audio_frequency = 44100
+        self.audio_buffer = 256
+        self.max_voices = 6
+
+        # Регулятор качества: бюджет кадра и начальная ступень.
+        self.target_frame_ms = 1000 / self.fps_limit
+        self.quality_level = 0
+        self.adaptive_quality = True
+
+        # Управление: частота автоогня при удержании клавиши огня.
+        self.autofire_rate = 6
+
+        # Сетевая игра: порт, интервал снимков состояния (в тиках), окно
+        # хранимых снимков и время ожидания подключения (в секундах).
+        self.net_port = 50007
+        self.net_snapshot_interval = 30
+        self.net_history = 16
+        self.net_accept_timeout = 60
+
+        # Запись кадров: каталог, формат, прореживание и размер очереди.
+        self.capture_path = "capture"
+        self.capture_format = 'png'
+        self.capture_every = 1
+        self.capture_queue = 32
+
+        # Таблица рекордов: файл базы и количество выводимых игр.
+        self.leaderboard_path = "leaderboard.db"
+        self.leaderboard_size = 5
+
         # Настройки корабля
         self.ship_speed = 1.5
         self.ship_limit = 3
+        self.shield_duration = 10  # секунд игрового времени
+        self.respawn_pause = 0.5
 
         # Параметры снаряда
         self.bullet_speed = 1.5
         self.bullet_width = 3
         self.bullet_height = 15
         self.bullet_color = (60, 60, 60)
-        self.bullet_allowed = 3
 
         # Настройка пришельцев
         self.alien_speed = 1.0
         self.fleet_drop_speed = 10
         self.fleet_diraction = 1
 
+        # Вероятность появления бонуса при попадании
+        self.bonus_drop_chance = 0.3
+
+        # Режим нагрузки для проверки обновления и коллизий на больших флотах.
+        self.stress_mode = False
+        self.stress_fleet_columns = 40
+        self.stress_fleet_rows = 10
+        self.stress_waves = 4
+        self.stress_bullet_allowed = 2000
+        self.stress_bonus_limit = 2000
+
         # Темп ускорения игры
         self.speedup_scale = 1.1
 
@@ -64,12 +148,21 @@ class Settings():
         Эти настройки включают скорость корабля, скорость снарядов и скорость пришельцев.
         Также устанавливается начальное количество очков за уничтожение пришельца.
         """
-        self.ship_speed_factor = 1.5
-        self.bullet_speed_factor = 3.0
+        # Множители базовых скоростей; increase_speed увеличивает их с уровнем.
+        self.ship_speed_factor = 1.0
+        self.bullet_speed_factor = 1.0
         self.alien_speed_factor = 1.0
 
         self.fleet_diraction = 1
 
+        # Бонусы 'power' увеличивают лимит снарядов только до конца игры.
+        if self.stress_mode:
+            self.bullet_allowed = self.stress_bullet_allowed
+            self.bonus_limit = self.stress_bonus_limit
+        else:
+            self.bullet_allowed = 3
+            self.bonus_limit = 100
+
         # Подсчет очков
         self.alien_points = 50
 
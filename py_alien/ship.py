@@ -1,5 +1,3 @@
-import pygame
-import os
 from pygame.sprite import Sprite
 
 class Ship(Sprite):
@@ -16,7 +14,9 @@ class Ship(Sprite):
         moving_right (bool): Флаг, указывающий, движется ли корабль вправо.
         moving_left (bool): Флаг, указывающий, движется ли корабль влево.
         shield_active (bool): Флаг, указывающий, активен ли щит корабля.
-        shield_start_time (int): Время активации щита в миллисекундах.
+        shield_start_tick (int): Логический тик игры, на котором был активирован щит.
+        shield_timer (Timer): Запланированное отключение щита или None.
+        shield_outline (bool): Рисовать ли рамку щита (отключается регулятором качества).
     """
     def __init__(self, ai_game):
         """
@@ -26,12 +26,13 @@ class Ship(Sprite):
              ai_game (object): Ссылка на основной игровой класс, содержащий экран и настройки.
         """
         super().__init__()
+        self.ai_game = ai_game
         self.screen = ai_game.screen
         self.settings = ai_game.settings
         self.screen_rect = ai_game.screen.get_rect()
 
-        # Загружает изображение корабля и получает прямоугольник.
-        self.image = pygame.image.load(os.path.join('resources/ship.bmp'))
+        # Изображение корабля берется из общего кэша ресурсов.
+        self.image = ai_game.assets.image('ship.bmp')
         self.rect = self.image.get_rect()
         # Каждый новый корабль появляется у нижнего края экрана.
         self.rect.midbottom = self.screen_rect.midbottom
@@ -39,13 +40,18 @@ class Ship(Sprite):
         # Сохранение вещественной координаты центра корабля.
         self.x = float(self.rect.x)
 
+        # Позиция на предыдущем тике для интерполяции при отрисовке.
+        self.prev_pos = self.rect.topleft
+
         # Флаг перемещения
         self.moving_right = False
         self.moving_left = False
 
         # Атрибут для щита
         self.shield_active = False
-        self.shield_start_time = None
+        self.shield_start_tick = None
+        self.shield_timer = None
+        self.shield_outline = True
 
     def update(self):
         """
@@ -53,41 +59,79 @@ class Ship(Sprite):
 
         Если флаг перемещения вправо установлен и корабль не выходит за пределы экрана,
         позиция корабля обновляется. Аналогично для флага перемещения влево.
-        Также проверяется, активен ли щит, и если он активен более 10 секунд, он отключается.
         """
+        self.prev_pos = self.rect.topleft
+
         # Обновляем атрибут x, а не rect.
+        speed = self.settings.ship_speed * self.settings.ship_speed_factor
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x = min(self.x + speed, self.screen_rect.right - self.rect.width)
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x = max(self.x - speed, 0)
 
         # Обновление атрибута rect на основании self.x
-        if self.moving_right:
-            self.rect.x += 1
-        if self.moving_left:
-            self.rect.x -= 1
-
-            # Проверяем, отключен ли щит
-        if self.shield_active and self.shield_start_time:
-            if pygame.time.get_ticks() - self.shield_start_time >= 10000:  # 10 секунд
-                self.shield_active = False
-                self.shield_start_time = None  # Сбрасываем время активации
-
-    def blitme(self):
+        self.rect.x = self.x
+
+    def activate_shield(self, start_tick=None):
         """
-        Рисует корабль в текущей позиции.
+        Включает щит на settings.shield_duration секунд игрового времени.
 
-        Если щит активен, рисует рамку вокруг корабля, указывая на активный щит.
+        Отключение планируется в планировщике игры, поэтому корабль не
+        проверяет время щита на каждом тике. Повторный бонус продлевает щит.
+
+        :param:
+            start_tick (int): Тик включения щита; по умолчанию текущий тик
+                (другое значение используется при загрузке сохранения).
         """
-        self.screen.blit(self.image, self.rect)
+        if start_tick is None:
+            start_tick = self.ai_game.ticks
+        if self.shield_timer is not None:
+            self.shield_timer.cancel()
 
-        if self.shield_active:
-            shield_rect = self.rect.inflate(10, 10)  # Увеличиваем размер рамки
-            pygame.draw.rect(self.screen, (0, 255, 0), shield_rect, 2)  # Рисуем рамку щита
+        self.shield_active = True
+        self.shield_start_tick = start_tick
+        shield_ticks = self.settings.shield_duration * self.settings.tick_rate
+        remaining = start_tick + shield_ticks - self.ai_game.ticks
+        self.shield_timer = self.ai_game.scheduler.schedule(remaining, self.deactivate_shield)
+
+    def deactivate_shield(self):
+        """
+        Отключает щит и отменяет запланированное отключение.
+        """
+        if self.shield_timer is not None:
+            self.shield_timer.cancel()
+            self.shield_timer = None
+        self.shield_active = False
+        self.shield_start_tick = None  # Сбрасываем время активации
+
+    def draw_items(self, alpha=1.0):
+        """
+        Возвращает корабль (и рамку щита, если он активен) для вывода на экран.
+
+        Рамка щита - заранее нарисованное изображение из общего кэша,
+        поэтому корабль и щит выводятся одним вызовом Surface.blits.
+
+        :param:
+            alpha (float): Доля пути между предыдущим и текущим тиком (0..1).
+        :return:
+            list: Пары (изображение, прямоугольник) для Surface.blits.
+        """
+        px, py = self.prev_pos
+        draw_rect = self.rect.copy()
+        draw_rect.topleft = (round(px + (self.rect.x - px) * alpha),
+                             round(py + (self.rect.y - py) * alpha))
+        items = [(self.image, draw_rect)]
+
+        if self.shield_active and self.shield_outline:
+            shield_rect = draw_rect.inflate(10, 10)  # Увеличиваем размер рамки
+            items.append((self.ai_game.assets.rect(shield_rect.size, (0, 255, 0), 2),
+                          shield_rect))
+        return items
 
     def center_ship(self):
         """
         Размещает корабль в центре нижней стороны.
         """
         self.rect.midbottom = self.screen_rect.midbottom
-        self.x = float(self.rect.x)
\ No newline at end of file
+        self.x = float(self.rect.x)
+        self.prev_pos = self.rect.topleft
\ No newline at end of file
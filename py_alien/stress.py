@@ -0,0 +1,164 @@
+"""
+Нагрузочный прогон игры в режиме stress_mode.
+
+Флот задается количеством колонн, рядов и волн независимо от размера
+экрана, а снаряды и бонусы на каждом тике добираются до заданного
+количества в случайных позициях, поэтому обновление и коллизии все время
+работают на худшей нагрузке. Время фаз каждого тика записывает
+профилировщик кадров; в конце печатаются p50/p99 фаз и тика, средние
+количества объектов и пропускная способность.
+
+Запуск:
+    python stress.py --columns 60 --rows 20 --waves 4 --bullets 2000 --bonuses 1000
+    python stress.py --render --profile stress.json
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from bonus import BONUS_IMAGES
+from profiler import FrameProfiler, PHASES
+
+BONUS_TYPES = tuple(BONUS_IMAGES)
+
+
+def configure(settings, columns, rows, waves, bullets, bonuses):
+    """
+    Включает режим нагрузки с заданным размером флота и лимитами.
+
+    :param:
+        settings (Settings): Настройки игры.
+        columns (int): Пришельцев в ряду.
+        rows (int): Рядов в волне.
+        waves (int): Количество волн.
+        bullets (int): Лимит снарядов.
+        bonuses (int): Лимит бонусов.
+    """
+    settings.stress_mode = True
+    settings.stress_fleet_columns = columns
+    settings.stress_fleet_rows = rows
+    settings.stress_waves = waves
+    settings.stress_bullet_allowed = bullets
+    settings.stress_bonus_limit = bonuses
+
+
+def top_up(game, bullets, bonuses, rng):
+    """
+    Добирает снаряды и бонусы до заданного количества.
+
+    :param:
+        game (AlienInvasion): Игра.
+        bullets (int): Нужное количество снарядов.
+        bonuses (int): Нужное количество бонусов.
+        rng (Random): Генератор позиций (отдельный от игрового).
+    """
+    width, height = game.settings.screen_width, game.settings.screen_height
+    for _ in range(bullets - len(game.bullets)):
+        bullet = game.bullet_pool.acquire()
+        bullet.rect.x = rng.randrange(width)
+        bullet.y = bullet.prev_y = rng.uniform(0, height)
+        bullet.rect.y = bullet.y
+        game.bullets.add(bullet)
+    for _ in range(bonuses - len(game.bonuses)):
+        bonus = game.bonus_pool.acquire(rng.choice(BONUS_TYPES))
+        bonus.rect.y = rng.randrange(height)
+        bonus.prev_pos = bonus.rect.topleft
+        game.bonuses.add(bonus)
+
+
+def run(game, ticks, bullets, bonuses, render=False, seed=0):
+    """
+    Выполняет нагрузочный прогон.
+
+    :param:
+        game (AlienInvasion): Игра с включенным stress_mode.
+        ticks (int): Количество тиков.
+        bullets (int): Количество снарядов, поддерживаемое на каждом тике.
+        bonuses (int): Количество бонусов, поддерживаемое на каждом тике.
+        render (bool): Отрисовывать кадр после каждого тика.
+        seed (int): Зерно игры и генератора позиций.
+    :return:
+        dict: Сводка: p50/p99 фаз и тика (мс), средние количества объектов,
+            тиков в секунду.
+    """
+    rng = random.Random(seed)
+    game.start_game(seed)
+    # Корабль не погибает и не ждет после потери жизни: нагрузка не прерывается.
+    game.ship.shield_active = True
+    game.settings.respawn_pause = 0
+    game.stats.ships_left = ticks
+
+    profiler = game.profiler = FrameProfiler(capacity=ticks)
+    profiler.toggle()
+    counts = np.zeros((ticks, 3))
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        top_up(game, bullets, bonuses, rng)
+        counts[tick] = (len(game.aliens), len(game.bullets), len(game.bonuses))
+        profiler.begin_frame()
+        game._update_world()
+        if render:
+            game._update_screen()
+        profiler.end_frame()
+    elapsed = time.perf_counter() - start
+
+    aliens, bullets_mean, bonuses_mean = counts.mean(axis=0)
+    return {
+        "phases": profiler.summary(),
+        "aliens": aliens,
+        "bullets": bullets_mean,
+        "bonuses": bonuses_mean,
+        "ticks_per_second": ticks / elapsed,
+    }
+
+
+def print_report(report):
+    """
+    Печатает сводку нагрузочного прогона.
+    """
+    print(f"Объектов в среднем: пришельцев {report['aliens']:.0f}, "
+          f"снарядов {report['bullets']:.0f}, бонусов {report['bonuses']:.0f}")
+    print(f"{'phase':<12}{'p50 ms':>10}{'p99 ms':>10}")
+    phases = report["phases"]
+    for name in PHASES + ("frame",):
+        p50, p99 = phases[name]
+        if p99:
+            print(f"{name:<12}{p50:>10.3f}{p99:>10.3f}")
+    print(f"{report['ticks_per_second']:,.0f} тиков/с")
+
+
+def main():
+    """
+    Разбирает аргументы командной строки и запускает прогон.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--columns', type=int, default=40, help="пришельцев в ряду")
+    parser.add_argument('--rows', type=int, default=10, help="рядов в волне")
+    parser.add_argument('--waves', type=int, default=4, help="количество волн")
+    parser.add_argument('--bullets', type=int, default=2000, help="снарядов на экране")
+    parser.add_argument('--bonuses', type=int, default=500, help="бонусов на экране")
+    parser.add_argument('--ticks', type=int, default=1000, help="количество тиков")
+    parser.add_argument('--render', action='store_true',
+                        help="отрисовывать кадры (фиктивный видеодрайвер)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="сохранить время тиков (.json - Chrome trace, иначе CSV)")
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from alien_invasion import AlienInvasion
+
+    game = AlienInvasion(headless=not args.render)
+    configure(game.settings, args.columns, args.rows, args.waves, args.bullets, args.bonuses)
+    report = run(game, args.ticks, args.bullets, args.bonuses, render=args.render)
+    print_report(report)
+    if args.profile:
+        game.profiler.dump(args.profile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+Перебор параметров Settings для балансировки игры.
+
+Для каждой комбинации значений из сетки несколько игр проходит бот в
+режиме headless. Игры распределяются по пулу процессов (по умолчанию на
+все ядра); каждый процесс один раз импортирует pygame и создает одну игру,
+которая переиспользуется для всех заданий. Результаты каждой игры
+дописываются в CSV по мере готовности, в конце печатается сводная
+таблица: средний достигнутый уровень, счет и стоимость тика.
+
+Запуск:
+    python sweep.py --param speedup_scale=1.1,1.2,1.3 \\
+        --param bonus_drop_chance=0.1,0.3 --games 8 --output sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+
+from settings import Settings
+
+# Игра в каждом процессе пула; создается в инициализаторе.
+_game = None
+_defaults = None
+
+
+def parse_param(text):
+    """
+    Разбирает параметр сетки вида 'name=v1,v2,...'.
+
+    :param:
+        text (str): Описание параметра.
+    :return:
+        tuple: (имя, список значений).
+    """
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"ожидается name=v1,v2: {text}")
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            parsed.append(float(value))
+    return name.strip(), parsed
+
+
+def build_grid(params):
+    """
+    Строит все комбинации значений параметров.
+
+    :param:
+        params (list): Пары (имя, значения).
+    :return:
+        list: Словари {имя: значение}.
+    """
+    names = [name for name, values in params]
+    return [dict(zip(names, combo))
+            for combo in itertools.product(*[values for name, values in params])]
+
+
+def check_params(names):
+    """
+    Проверяет, что перебираемые параметры есть в Settings: опечатка в имени
+    иначе молча создала бы новый атрибут, и все конфигурации совпали бы.
+
+    :param:
+        names (iterable): Имена параметров.
+    :raises:
+        ValueError: Если параметра нет в Settings.
+    """
+    settings = Settings()
+    unknown = [name for name in names if not hasattr(settings, name)]
+    if unknown:
+        raise ValueError(f"неизвестные параметры Settings: {', '.join(unknown)}")
+
+
+def bot_policy(game, tick):
+    """
+    Простой бот: держится под ближайшим пришельцем нижнего ряда с учетом
+    упреждения (флот сдвигается, пока летит снаряд) и стреляет, когда
+    снаряд попадет в любого пришельца.
+
+    :param:
+        game (AlienInvasion): Игра.
+        tick (int): Номер тика в текущем вызове step().
+    :return:
+        dict: Управление на тик.
+    """
+    fleet = game.aliens
+    if not fleet:
+        return {'fire': False}
+
+    settings = game.settings
+    ship = game.ship.rect
+    alive = fleet.alive
+    ys = fleet.y[alive]
+    # Где окажутся центры пришельцев, когда до них долетит снаряд.
+    flight = (ship.top - ys) / (settings.bullet_speed * settings.bullet_speed_factor)
+    centers = (fleet.x[alive] + fleet.alien_width / 2
+               + flight * settings.alien_speed * settings.alien_speed_factor
+               * settings.fleet_diraction)
+    lowest = centers[ys == ys.max()]
+    target = lowest[abs(lowest - ship.centerx).argmin()]
+    # Корабль стоит, если до цели меньше одного шага: иначе он перескакивает ее.
+    step = max(settings.ship_speed * settings.ship_speed_factor, 2)
+
+    return {
+        'left': ship.centerx > target + step,
+        'right': ship.centerx < target - step,
+        'fire': bool((abs(centers - ship.centerx) < fleet.alien_width / 2).any()),
+    }
+
+
+def _init_worker():
+    """
+    Инициализатор процесса пула: pygame импортируется и игра создается один раз.
+    """
+    global _game, _defaults
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    from alien_invasion import AlienInvasion
+
+    _game = AlienInvasion(headless=True)
+    _defaults = dict(vars(_game.settings))
+
+
+def run_job(job):
+    """
+    Проходит одну игру с заданными настройками (выполняется в процессе пула).
+
+    :param:
+        job (tuple): (номер конфигурации, параметры, зерно, предел тиков).
+    :return:
+        dict: Результат игры.
+    """
+    config_id, params, seed, max_ticks = job
+    game = _game
+    settings = game.settings
+    vars(settings).update(_defaults)
+    for name, value in params.items():
+        setattr(settings, name, value)
+
+    game.start_game(seed)
+    start = time.perf_counter()
+    game.step(max_ticks, bot_policy)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "config": config_id,
+        **params,
+        "seed": seed,
+        "level": game.stats.level,
+        "score": game.stats.score,
+        "ticks": game.ticks,
+        "finished": not game.stats.game_active,
+        "us_per_tick": round(elapsed / max(game.ticks, 1) * 1e6, 2),
+        "pid": os.getpid(),
+    }
+
+
+def run_sweep(grid, games, max_ticks, workers, output):
+    """
+    Прогоняет сетку параметров на пуле процессов.
+
+    :param:
+        grid (list): Конфигурации (словари параметров).
+        games (int): Количество игр на конфигурацию.
+        max_ticks (int): Предел тиков на игру.
+        workers (int): Количество процессов.
+        output (str): CSV, в который дописываются результаты.
+    :return:
+        list: Результаты всех игр.
+    """
+    check_params(grid[0])
+    jobs = [(config_id, params, seed, max_ticks)
+            for config_id, params in enumerate(grid) for seed in range(games)]
+    fields = (["config"] + list(grid[0]) +
+              ["seed", "level", "score", "ticks", "finished", "us_per_tick", "pid"])
+
+    results = []
+    with open(output, 'w', newline='', encoding='utf-8') as f, \
+            multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for done, result in enumerate(pool.imap_unordered(run_job, jobs), 1):
+            writer.writerow(result)
+            f.flush()
+            results.append(result)
+            print(f"\r{done}/{len(jobs)}", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    return results
+
+
+def summarize(grid, results):
+    """
+    Печатает сводную таблицу по конфигурациям.
+
+    :param:
+        grid (list): Конфигурации.
+        results (list): Результаты игр.
+    """
+    names = list(grid[0])
+    header = "".join(f"{name:>20}" for name in names)
+    print(header + f"{'level':>8}{'score':>14}{'us/tick':>10}{'finished':>10}")
+    for config_id, params in enumerate(grid):
+        rows = [row for row in results if row["config"] == config_id]
+        level = sum(row["level"] for row in rows) / len(rows)
+        score = sum(row["score"] for row in rows) / len(rows)
+        cost = sum(row["us_per_tick"] for row in rows) / len(rows)
+        finished = sum(row["finished"] for row in rows)
+        values = "".join(f"{params[name]:>20}" for name in names)
+        print(values + f"{level:>8.2f}{score:>14,.0f}{cost:>10.1f}{finished:>7}/{len(rows)}")
+
+
+def main():
+    """
+    Разбирает аргументы командной строки и запускает перебор.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--param', type=parse_param, action='append', required=True,
+                        help="параметр Settings и его значения: name=v1,v2,...")
+    parser.add_argument('--games', type=int, default=4, help="игр на конфигурацию")
+    parser.add_argument('--max-ticks', type=int, default=240 * 300,
+                        help="предел тиков на игру")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="количество процессов")
+    parser.add_argument('--output', default='sweep.csv', help="CSV с результатами игр")
+    args = parser.parse_args()
+    try:
+        check_params(name for name, values in args.param)
+    except ValueError as error:
+        parser.error(str(error))
+
+    grid = build_grid(args.param)
+    start = time.perf_counter()
+    results = run_sweep(grid, args.games, args.max_ticks, args.workers, args.output)
+    summarize(grid, results)
+    print(f"Игр: {len(results)}, время: {time.perf_counter() - start:.1f} с")
+
+
+if __name__ == '__main__':
+    main()
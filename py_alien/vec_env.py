@@ -0,0 +1,187 @@
+"""
+Векторная среда для обучения агентов.
+
+N независимых игр в режиме headless выполняются в ногу: step() принимает
+пакет действий и возвращает массивы NumPy с наблюдениями, наградами
+(прирост счета) и флагами окончания. Закончившиеся игры сразу
+перезапускаются с новым зерном.
+
+Запуск замера пропускной способности:
+    python vec_env.py --envs 16 --steps 2000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from alien_invasion import AlienInvasion
+from replay import INPUT_LEFT, INPUT_RIGHT, INPUT_FIRE
+
+
+class VecEnv():
+    """
+    Пакет из N игр, выполняемых синхронно.
+
+    Наблюдение одной игры - вектор float32:
+        [x корабля, min x флота, max x флота, max y флота, щит,
+         маска живых пришельцев (max_aliens), координаты снарядов
+         (max_bullets пар x, y; отсутствующие снаряды - -1)].
+    Координаты нормированы на размер экрана.
+
+    Args:
+        num_envs (int): Количество игр.
+        frame_skip (int): Количество логических тиков на один шаг среды.
+        max_episode_ticks (int): Предел длины эпизода в тиках (0 - без предела).
+        max_aliens (int): Размер маски пришельцев в наблюдении.
+        max_bullets (int): Количество снарядов в наблюдении.
+        obs_size (int): Длина вектора наблюдения.
+        episodes (int): Количество завершенных эпизодов.
+    """
+
+    def __init__(self, num_envs, frame_skip=4, max_episode_ticks=0, max_bullets=8, seed=0):
+        """
+        Создает игры и запускает первые эпизоды.
+
+        :param:
+            num_envs (int): Количество игр.
+            frame_skip (int): Тиков на шаг среды.
+            max_episode_ticks (int): Предел длины эпизода в тиках.
+            max_bullets (int): Количество снарядов в наблюдении.
+            seed (int): Начальное зерно; эпизоды получают зерна seed, seed+1, ...
+        """
+        self.num_envs = num_envs
+        self.frame_skip = frame_skip
+        self.max_episode_ticks = max_episode_ticks
+        self.max_bullets = max_bullets
+        self.episodes = 0
+        self._next_seed = seed
+
+        self.games = [AlienInvasion(headless=True) for _ in range(num_envs)]
+        for game in self.games:
+            self._reset_game(game)
+
+        settings = self.games[0].settings
+        self._scale = np.array([settings.screen_width, settings.screen_height],
+                               dtype=np.float32)
+        self.max_aliens = len(self.games[0].aliens.alive)
+        self.obs_size = 5 + self.max_aliens + 2 * max_bullets
+
+        self._obs = np.zeros((num_envs, self.obs_size), dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._dones = np.zeros(num_envs, dtype=bool)
+        self._scores = np.zeros(num_envs, dtype=np.float64)
+
+    def _reset_game(self, game):
+        """
+        Начинает новый эпизод в игре.
+        """
+        game.start_game(self._next_seed)
+        self._next_seed += 1
+
+    def reset(self):
+        """
+        Перезапускает все игры.
+
+        :return:
+            ndarray: Наблюдения формы (num_envs, obs_size).
+        """
+        for game in self.games:
+            self._reset_game(game)
+        for index, game in enumerate(self.games):
+            self._observe(index, game)
+        return self._obs.copy()
+
+    def step(self, actions):
+        """
+        Выполняет один шаг во всех играх.
+
+        :param:
+            actions (ndarray): Маски INPUT_* формы (num_envs,) или флаги
+                (влево, вправо, огонь) формы (num_envs, 3).
+        :return:
+            tuple: (наблюдения, награды, флаги окончания, итоговые счета
+                закончившихся эпизодов (NaN для продолжающихся)).
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = (actions[:, 0] * INPUT_LEFT + actions[:, 1] * INPUT_RIGHT
+                       + actions[:, 2] * INPUT_FIRE)
+        masks = actions.astype(int).tolist()
+
+        self._scores[:] = np.nan
+        for index, game in enumerate(self.games):
+            score = game.stats.score
+            # Выстрел запрашивается только на первом тике шага.
+            game.step(1, masks[index])
+            game.step(self.frame_skip - 1, masks[index] & ~INPUT_FIRE)
+            self._rewards[index] = game.stats.score - score
+
+            done = not game.stats.game_active or (
+                self.max_episode_ticks and game.ticks >= self.max_episode_ticks)
+            self._dones[index] = done
+            if done:
+                self._scores[index] = game.stats.score
+                self.episodes += 1
+                self._reset_game(game)
+            self._observe(index, game)
+
+        return self._obs.copy(), self._rewards.copy(), self._dones.copy(), self._scores.copy()
+
+    def _observe(self, index, game):
+        """
+        Заполняет строку наблюдений для игры.
+        """
+        row = self._obs[index]
+        width, height = self._scale
+        fleet = game.aliens
+        bounds = fleet.bounds()
+
+        row[0] = game.ship.rect.centerx / width
+        if bounds is None:
+            row[1:4] = 0.0
+        else:
+            row[1] = bounds[0] / width
+            row[2] = (bounds[1] + fleet.alien_width) / width
+            row[3] = (bounds[2] + fleet.alien_height) / height
+        row[4] = game.ship.shield_active
+
+        alive = fleet.alive[:self.max_aliens]
+        aliens = row[5:5 + self.max_aliens]
+        aliens[:] = 0.0
+        aliens[:len(alive)] = alive
+
+        bullets = row[5 + self.max_aliens:]
+        bullets[:] = -1.0
+        for slot, bullet in zip(range(self.max_bullets), game.bullets.spritedict):
+            bullets[2 * slot] = bullet.rect.centerx / width
+            bullets[2 * slot + 1] = bullet.rect.y / height
+
+
+def main():
+    """
+    Замеряет пропускную способность среды со случайными действиями.
+    """
+    parser = argparse.ArgumentParser(description="Замер пропускной способности VecEnv")
+    parser.add_argument('--envs', type=int, default=16, help="количество игр")
+    parser.add_argument('--steps', type=int, default=2000, help="шагов среды")
+    parser.add_argument('--frame-skip', type=int, default=4, help="тиков на шаг")
+    args = parser.parse_args()
+
+    env = VecEnv(args.envs, frame_skip=args.frame_skip)
+    rng = np.random.default_rng(0)
+    env.reset()
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        env.step(rng.integers(0, 8, size=args.envs))
+    elapsed = time.perf_counter() - start
+
+    env_steps = args.steps * args.envs
+    print(f"Игр: {args.envs}, шагов среды: {env_steps}, эпизодов: {env.episodes}")
+    print(f"{env_steps / elapsed:,.0f} шагов среды/с на ядро "
+          f"({env_steps * args.frame_skip / elapsed:,.0f} тиков/с), "
+          f"размер наблюдения {env.obs_size}")
+
+
+if __name__ == '__main__':
+    main()